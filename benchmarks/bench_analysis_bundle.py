@@ -0,0 +1,109 @@
+"""
+Analysis Page Bundle Benchmark
+
+Times a cold load of the data behind Analysis page sections 4-11, first
+through the per-section db_utils calls the page used to make, then through
+get_analysis_bundle, and checks that every section gets the same data.
+All st.cache_data caches are cleared before each run.
+
+Usage:
+    python benchmarks/bench_analysis_bundle.py
+    python benchmarks/bench_analysis_bundle.py --db path/to/youtube_trends.db --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.logger import set_log_level
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from database import db_utils as db
+from database.result_cache import CACHE_SIZE_ENV_VAR
+
+# Bundle key -> the per-section call the page made before the bundle
+SECTION_CALLS = {
+    'correlation_matrix': lambda: db.get_correlation_data(None).corr(),
+    'publishing_heatmap': lambda: db.get_publishing_time_heatmap(None),
+    'views_engagement': lambda: db.get_views_engagement_scatter(None, sample_size=4000),
+    'engagement_by_category': lambda: db.get_engagement_by_category(None, top_n=10),
+    'top_channels': lambda: db.get_top_channels(None, top_n=20),
+    'days_to_trending': lambda: db.get_days_to_trending(None),
+    'title_length': lambda: db.get_title_length_analysis(None),
+    'tag_analysis': lambda: db.get_tag_analysis(None),
+}
+
+
+def load_sections():
+    """Load every section with its own call."""
+    return {key: call() for key, call in SECTION_CALLS.items()}
+
+
+def load_bundle():
+    """Load every section from the bundle."""
+    return db.get_analysis_bundle(None, sample_size=4000, top_categories=10, top_channels=20)
+
+
+def cold_secs(load, repeat):
+    """Return the median seconds of a load with empty caches, and its last result."""
+    timings = []
+    for _ in range(repeat):
+        st.cache_data.clear()
+        start = time.perf_counter()
+        result = load()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def same_section(key, left, right):
+    """Compare one section; row order and random samples are not compared."""
+    if key == 'views_engagement':
+        return list(left.columns) == list(right.columns) and len(left) == len(right)
+    if key == 'correlation_matrix':
+        return np.allclose(left, right, equal_nan=True)
+    if isinstance(left, dict):
+        return left.keys() == right.keys() and all(
+            left[name].equals(right[name]) if isinstance(left[name], pd.DataFrame)
+            else np.array_equal(left[name], right[name], equal_nan=True)
+            for name in left
+        )
+    left = left.sort_values(list(left.columns)).reset_index(drop=True)
+    right = right.sort_values(list(right.columns)).reset_index(drop=True)
+    return left.equals(right)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', type=Path, default=Path(db.get_db_path()),
+                        help="database to read (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5, help="cold loads of each kind (default: %(default)s)")
+    args = parser.parse_args()
+
+    # st.cache_data warns when used outside a running Streamlit app
+    set_log_level('error')
+    # Time the queries themselves, not the on-disk result cache
+    os.environ[CACHE_SIZE_ENV_VAR] = '0'
+    db.get_db_path = lambda: str(args.db)
+
+    sections_secs, sections = cold_secs(load_sections, args.repeat)
+    bundle_secs, bundle = cold_secs(load_bundle, args.repeat)
+
+    print("="*80)
+    print(f"Cold load of Analysis sections 4-11, median of {args.repeat} run(s)")
+    print("="*80)
+    print(f"   per-section calls: {sections_secs * 1000:8.1f} ms")
+    print(f"   analysis bundle:   {bundle_secs * 1000:8.1f} ms ({sections_secs / bundle_secs:.2f}x)")
+    print()
+    for key in SECTION_CALLS:
+        status = "matches" if same_section(key, sections[key], bundle[key]) else "DIFFERS"
+        print(f"   {key:24s} {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Query Backend Benchmark
+
+Runs every db_utils query function (the cases in check_query_plans.py) on
+the SQLite backend and on the DuckDB backend over a Parquet snapshot of the
+same database, and reports the median time of each side by side with
+whether the two results agree. The snapshot is exported into a scratch
+directory first. Caching is bypassed, so every run executes its queries.
+
+SQLite answers most dashboard queries from the agg_* summary tables; DuckDB
+has none and aggregates the videos snapshot directly.
+
+Usage:
+    python benchmarks/bench_backends.py
+    python benchmarks/bench_backends.py --db path/to/youtube_trends.db --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from streamlit.logger import set_log_level
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from database import db_utils as db
+from database.result_cache import CACHE_SIZE_ENV_VAR
+from database import parquet_snapshot as ps
+from database.backends import BACKEND_ENV_VAR
+from database.check_query_plans import QUERY_CASES
+
+# Functions that return a random sample, so results are not comparable
+SAMPLED_FUNCTIONS = {'get_views_engagement_scatter', 'get_likes_dislikes_data'}
+
+
+def run_case(backend, func_name, kwargs, repeat):
+    """Return the median seconds and last result of an uncached call."""
+    os.environ[BACKEND_ENV_VAR] = backend
+    func = getattr(db, func_name)
+    timings = []
+    for _ in range(repeat):
+        func.clear()
+        start = time.perf_counter()
+        result = func(**kwargs)
+        timings.append(time.perf_counter() - start)
+    func.clear()
+    return statistics.median(timings), result
+
+
+def normalize(result):
+    """Turn a result into a DataFrame with stable row order and dtypes."""
+    if isinstance(result, dict):
+        result = pd.DataFrame([result])
+    elif not isinstance(result, pd.DataFrame):
+        result = pd.DataFrame({'value': [result]})
+    df = result.copy()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(str)
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype('float64')
+        else:
+            df[col] = df[col].astype(str)
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def results_match(left, right):
+    """Compare two results, allowing float rounding differences."""
+    left, right = normalize(left), normalize(right)
+    if left.shape != right.shape or list(left.columns) != list(right.columns):
+        return False
+    if left.empty:
+        return True
+    for col in left.columns:
+        if pd.api.types.is_float_dtype(left[col]):
+            if not np.allclose(left[col], right[col], rtol=1e-9, equal_nan=True):
+                return False
+        elif not left[col].equals(right[col]):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', type=Path, default=Path(db.get_db_path()),
+                        help="database to read (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per function (default: %(default)s)")
+    args = parser.parse_args()
+
+    # st.cache_data warns when used outside a running Streamlit app
+    set_log_level('error')
+    # Time the queries themselves, not the on-disk result cache
+    os.environ[CACHE_SIZE_ENV_VAR] = '0'
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        snapshot = Path(work_dir) / 'parquet'
+        print("Exporting Parquet snapshot...")
+        with contextlib.redirect_stdout(io.StringIO()):
+            ps.export_snapshot(args.db, snapshot)
+        db.get_db_path = lambda: str(args.db)
+        db.get_snapshot_path = lambda: str(snapshot)
+
+        # The first DuckDB query also sets up the snapshot views
+        run_case('duckdb', 'get_all_countries', {}, 1)
+
+        print("\n" + "="*100)
+        print(f"Median of {args.repeat} run(s) per function")
+        print("="*100)
+        totals = {'sqlite': 0.0, 'duckdb': 0.0}
+        for func_name, kwargs in QUERY_CASES:
+            sqlite_secs, sqlite_result = run_case('sqlite', func_name, kwargs, args.repeat)
+            duckdb_secs, duckdb_result = run_case('duckdb', func_name, kwargs, args.repeat)
+            totals['sqlite'] += sqlite_secs
+            totals['duckdb'] += duckdb_secs
+
+            if func_name in SAMPLED_FUNCTIONS:
+                status = "sampled"
+            else:
+                status = "matches" if results_match(sqlite_result, duckdb_result) else "DIFFERS"
+            label = f"{func_name}({', '.join(f'{k}={v}' for k, v in kwargs.items())})"
+            print(f"   {label[:58]:58s} sqlite {sqlite_secs * 1000:8.1f} ms | "
+                  f"duckdb {duckdb_secs * 1000:8.1f} ms | {status}")
+
+        print("="*100)
+        print(f"   {'total':58s} sqlite {totals['sqlite'] * 1000:8.1f} ms | "
+              f"duckdb {totals['duckdb'] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Bulk Load Benchmark
+
+Compares the 'fast' videos loader in create_database.py, with in-process and
+multi-process CSV parsing, against the original DataFrame.to_sql path. Each
+run builds the videos table from cleaned_videos.csv into a scratch database,
+then builds the STEP 3 indexes.
+
+Usage:
+    python benchmarks/bench_bulk_load.py
+    python benchmarks/bench_bulk_load.py --data-dir path/to/cleaned_data --repeat 3 --workers 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from database import create_database as cdb
+
+
+def run_once(loader, db_path, workers=1):
+    """Load the videos table with one loader and return (rows, load secs, index secs)."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        cdb.create_tables(cursor)
+        categories_df, _ = cdb.read_reference_data()
+        categories_df.to_sql('categories', conn, if_exists='append', index=False)
+
+        saved_pragmas = cdb.begin_bulk_load(cursor) if loader == 'fast' else None
+
+        start = time.perf_counter()
+        if loader == 'fast':
+            rows = cdb.load_videos_fast(conn, workers)
+        else:
+            rows = cdb.load_videos(conn)
+        load_secs = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cdb.create_indexes(cursor)
+        conn.commit()
+        index_secs = time.perf_counter() - start
+
+        if saved_pragmas:
+            cdb.end_bulk_load(cursor, saved_pragmas)
+
+    conn.close()
+    return rows, load_secs, index_secs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data-dir', type=Path, default=cdb.CLEANED_DATA_DIR,
+                        help="directory holding the cleaned CSV files (default: %(default)s)")
+    parser.add_argument('--work-dir', type=Path, default=None,
+                        help="directory for scratch databases; use a real disk to include fsync cost")
+    parser.add_argument('--repeat', type=int, default=1, help="runs per loader (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="parser processes for the parallel run (default: %(default)s)")
+    args = parser.parse_args()
+
+    cdb.CLEANED_DATA_DIR = args.data_dir
+
+    variants = [('to_sql', 'to_sql', 1), ('fast', 'fast', 1)]
+    if args.workers > 1:
+        variants.append((f'fast x{args.workers}', 'fast', args.workers))
+    results = {}
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        for label, loader, workers in variants:
+            for run in range(args.repeat):
+                db_path = Path(work_dir) / f"bench_{loader}_{workers}_{run}.db"
+                rows, load_secs, index_secs = run_once(loader, db_path, workers)
+                results.setdefault(label, []).append((load_secs, index_secs))
+                print(f"{label:>8s} run {run + 1}: load {load_secs:7.2f}s | "
+                      f"indexes {index_secs:6.2f}s | {rows / load_secs:>10,.0f} rows/sec")
+                db_path.unlink()
+
+    print("\n" + "="*80)
+    print(f"Median over {args.repeat} run(s), {rows:,} rows")
+    print("="*80)
+    medians = {}
+    for loader, runs in results.items():
+        load = statistics.median(r[0] for r in runs)
+        index = statistics.median(r[1] for r in runs)
+        medians[loader] = load + index
+        print(f"   {loader:>8s}: load {load:7.2f}s | indexes {index:6.2f}s | "
+              f"total {load + index:7.2f}s | {rows / load:>10,.0f} rows/sec")
+    print()
+    for label in list(medians)[1:]:
+        print(f"   Speed-up of '{label}' over to_sql (total): {medians['to_sql'] / medians[label]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Concurrent Query Benchmark
+
+Times a cold load of the independent queries behind get_analysis_bundle,
+run one after another and then concurrently through db_utils.run_queries.
+Each query is also timed alone, so the concurrent wall time can be set
+against both the sum of the queries (the sequential floor) and the slowest
+one (the concurrent floor). All st.cache_data caches are cleared before
+each run.
+
+Worker threads only overlap where the query engine releases the GIL, and
+only help with more than one CPU core; the core count is printed with the
+results.
+
+Usage:
+    python benchmarks/bench_concurrent_queries.py
+    python benchmarks/bench_concurrent_queries.py --db path/to/youtube_trends.db --repeat 5
+    YT_TRENDS_BACKEND=duckdb python benchmarks/bench_concurrent_queries.py
+"""
+
+import argparse
+import functools
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import streamlit as st
+from streamlit.logger import set_log_level
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from database import db_utils as db
+from database.result_cache import CACHE_SIZE_ENV_VAR
+
+# The requests get_analysis_bundle runs for an unfiltered page
+BUNDLE_REQUESTS = {
+    'engagement by category': functools.partial(db.get_engagement_by_category, None, 10),
+    'correlation matrix': functools.partial(db.get_correlation_matrix, None),
+    'publishing heatmap': functools.partial(db.get_publishing_time_heatmap, None),
+    'scatter sample': functools.partial(db.get_views_engagement_scatter, None, 4000),
+    'stratified sample': functools.partial(db.get_views_engagement_scatter, None, 4000, stratified=True),
+    'top channels': functools.partial(db.get_top_channels, None, 20),
+    'title length': functools.partial(db.get_title_length_analysis, None),
+    'tag analysis': functools.partial(db.get_tag_analysis, None),
+}
+
+
+def cold_secs(load, repeat):
+    """Return the median seconds of a load with empty caches."""
+    timings = []
+    for _ in range(repeat):
+        st.cache_data.clear()
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run_sequential():
+    """Run every request on the calling thread."""
+    return {name: request() for name, request in BUNDLE_REQUESTS.items()}
+
+
+def run_concurrent():
+    """Run every request through run_queries."""
+    return dict(db.run_queries(BUNDLE_REQUESTS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', type=Path, default=Path(db.get_db_path()),
+                        help="database to read (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5, help="cold loads of each kind (default: %(default)s)")
+    args = parser.parse_args()
+
+    # st.cache_data warns when used outside a running Streamlit app
+    set_log_level('error')
+    # Time the queries themselves, not the on-disk result cache
+    os.environ[CACHE_SIZE_ENV_VAR] = '0'
+    db.get_db_path = lambda: str(args.db)
+
+    # Open the pooled connections and start the workers before timing
+    run_concurrent()
+
+    print("="*80)
+    print(f"Cold Analysis bundle queries on {db.get_backend().name}, {os.cpu_count()} CPU core(s), "
+          f"median of {args.repeat} run(s)")
+    print("="*80)
+    request_secs = {}
+    for name, request in BUNDLE_REQUESTS.items():
+        request_secs[name] = cold_secs(request, args.repeat)
+        print(f"   {name:20s}: {request_secs[name] * 1000:8.1f} ms")
+
+    sequential_secs = cold_secs(run_sequential, args.repeat)
+    concurrent_secs = cold_secs(run_concurrent, args.repeat)
+    print()
+    print(f"   sum of queries:     {sum(request_secs.values()) * 1000:8.1f} ms")
+    print(f"   slowest query:      {max(request_secs.values()) * 1000:8.1f} ms")
+    print(f"   sequential:         {sequential_secs * 1000:8.1f} ms")
+    print(f"   run_queries:        {concurrent_secs * 1000:8.1f} ms ({sequential_secs / concurrent_secs:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Connection Pool Benchmark
+
+Runs every db_utils query function (the cases in check_query_plans.py)
+uncached, first opening a fresh read-only connection per call the way
+db_utils used to, then through the pooled connections with READ_PRAGMAS.
+Prints the median time of each case side by side and the pool's reuse
+statistics.
+
+Usage:
+    python benchmarks/bench_connection_pool.py
+    python benchmarks/bench_connection_pool.py --db path/to/youtube_trends.db --repeat 5
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from streamlit.logger import set_log_level
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from database import db_utils as db
+from database.result_cache import CACHE_SIZE_ENV_VAR
+from database.check_query_plans import QUERY_CASES
+
+
+def fresh_connection():
+    """Open an unpooled read-only connection with default pragmas."""
+    return sqlite3.connect(Path(db.get_db_path()).resolve().as_uri() + '?mode=ro', uri=True)
+
+
+def time_case(func_name, kwargs, repeat):
+    """Return the median seconds of an uncached call."""
+    func = getattr(db, func_name)
+    timings = []
+    for _ in range(repeat):
+        func.clear()
+        start = time.perf_counter()
+        func(**kwargs)
+        timings.append(time.perf_counter() - start)
+    func.clear()
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', type=Path, default=Path(db.get_db_path()),
+                        help="database to read (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per function (default: %(default)s)")
+    args = parser.parse_args()
+
+    # st.cache_data warns when used outside a running Streamlit app
+    set_log_level('error')
+    # Time the queries themselves, not the on-disk result cache
+    os.environ[CACHE_SIZE_ENV_VAR] = '0'
+    db.get_db_path = lambda: str(args.db)
+    pooled_connection = db.get_connection
+
+    print("="*100)
+    print(f"Median of {args.repeat} run(s) per function")
+    print("="*100)
+    totals = {'fresh': 0.0, 'pooled': 0.0}
+    for func_name, kwargs in QUERY_CASES:
+        db.get_connection = fresh_connection
+        fresh_secs = time_case(func_name, kwargs, args.repeat)
+        db.get_connection = pooled_connection
+        pooled_secs = time_case(func_name, kwargs, args.repeat)
+        totals['fresh'] += fresh_secs
+        totals['pooled'] += pooled_secs
+
+        label = f"{func_name}({', '.join(f'{k}={v}' for k, v in kwargs.items())})"
+        print(f"   {label[:58]:58s} fresh {fresh_secs * 1000:8.1f} ms | "
+              f"pooled {pooled_secs * 1000:8.1f} ms | {fresh_secs / pooled_secs:5.2f}x")
+
+    print("="*100)
+    print(f"   {'total':58s} fresh {totals['fresh'] * 1000:8.1f} ms | "
+          f"pooled {totals['pooled'] * 1000:8.1f} ms | {totals['fresh'] / totals['pooled']:5.2f}x")
+
+    stats = db.get_connection_stats()
+    print("\nPool statistics")
+    print(f"   Connections opened: {stats['opened']:,} ({stats['mean_open_ms']:.2f} ms each)")
+    print(f"   Connections reused: {stats['reused']:,}")
+    print(f"   Connect time saved: {stats['latency_saved_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
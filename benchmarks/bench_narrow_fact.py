@@ -0,0 +1,186 @@
+"""
+Narrow Fact Table Benchmark
+
+Compares the current split schema (compact videos fact table plus the
+video_text side table) with the original layout that kept title, tags,
+thumbnail_link and description inline in videos. Both databases are built
+from cleaned_videos.csv in a scratch directory, then the same dashboard-style
+scans are timed against each with a cold and a warm page cache.
+
+Usage:
+    python benchmarks/bench_narrow_fact.py
+    python benchmarks/bench_narrow_fact.py --data-dir path/to/cleaned_data --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from database import create_database as cdb
+
+TEXT_COLUMNS = [col for col in cdb.VIDEO_TEXT_COLUMNS if col not in cdb.VIDEO_KEY_COLUMNS]
+
+# Aggregates that read every videos row. NOT INDEXED forces a table scan so
+# the row width, not a covering index, decides the cost.
+SCAN_QUERIES = {
+    'country stats': """
+        SELECT country, COUNT(*), AVG(views), AVG(engagement_rate), AVG(days_to_trending)
+        FROM videos NOT INDEXED
+        GROUP BY country
+    """,
+    'category engagement': """
+        SELECT category_id, AVG(engagement_rate), AVG(like_ratio)
+        FROM videos NOT INDEXED
+        GROUP BY category_id
+    """,
+    'publishing heatmap': """
+        SELECT publish_day_of_week, publish_hour, AVG(views)
+        FROM videos NOT INDEXED
+        GROUP BY publish_day_of_week, publish_hour
+    """,
+}
+
+# Top of the Database Tables page, which still needs the title
+VIDEOS_PAGE_QUERIES = {
+    'wide': """
+        SELECT video_id, title, channel_title, views
+        FROM videos
+        ORDER BY views DESC LIMIT 100
+    """,
+    'narrow': """
+        SELECT v.video_id, t.title, v.channel_title, v.views
+        FROM (SELECT * FROM videos ORDER BY views DESC LIMIT 100) v
+        LEFT JOIN video_text t
+            ON t.video_id = v.video_id
+            AND t.trending_date = v.trending_date
+            AND t.country = v.country
+        ORDER BY v.views DESC
+    """,
+}
+
+
+def build_narrow(db_path):
+    """Build the current videos + video_text schema with the fast loader."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        cdb.create_tables(cursor)
+        categories_df, _ = cdb.read_reference_data()
+        categories_df.to_sql('categories', conn, if_exists='append', index=False)
+        saved_pragmas = cdb.begin_bulk_load(cursor)
+        cdb.load_videos_fast(conn)
+        cdb.create_indexes(cursor)
+        conn.commit()
+        cdb.end_bulk_load(cursor, saved_pragmas)
+    conn.close()
+
+
+def build_wide(db_path, narrow_path):
+    """Rebuild the original single-table layout from a narrow database."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("ATTACH DATABASE ? AS narrow", (str(narrow_path),))
+    text_select = ", ".join(f"t.{col}" for col in TEXT_COLUMNS)
+    conn.execute(f"""
+        CREATE TABLE videos AS
+        SELECT v.*, {text_select}
+        FROM narrow.videos v
+        JOIN narrow.video_text t
+            ON t.video_id = v.video_id
+            AND t.trending_date = v.trending_date
+            AND t.country = v.country
+    """)
+    conn.commit()
+    conn.execute("DETACH DATABASE narrow")
+    with contextlib.redirect_stdout(io.StringIO()):
+        cdb.create_indexes(conn.cursor())
+    conn.commit()
+    conn.close()
+
+
+def table_bytes(db_path, table):
+    """Return the bytes a table occupies, or None without the dbstat module."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT SUM(pgsize) FROM dbstat WHERE name = ?", (table,)).fetchone()[0]
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+def drop_page_cache(db_path):
+    """Ask the OS to evict a file from its page cache (no-op where unsupported)."""
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    fd = os.open(db_path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return True
+
+
+def time_query(db_path, sql, repeat, cold):
+    """Return the median seconds to run a query on a fresh connection."""
+    timings = []
+    for _ in range(repeat):
+        if cold:
+            drop_page_cache(db_path)
+        conn = sqlite3.connect(Path(db_path).resolve().as_uri() + '?mode=ro', uri=True)
+        start = time.perf_counter()
+        conn.execute(sql).fetchall()
+        timings.append(time.perf_counter() - start)
+        conn.close()
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data-dir', type=Path, default=cdb.CLEANED_DATA_DIR,
+                        help="directory holding the cleaned CSV files (default: %(default)s)")
+    parser.add_argument('--work-dir', type=Path, default=None,
+                        help="directory for scratch databases; use a real disk for cold timings")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per query (default: %(default)s)")
+    args = parser.parse_args()
+
+    cdb.CLEANED_DATA_DIR = args.data_dir
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        paths = {'wide': Path(work_dir) / 'wide.db', 'narrow': Path(work_dir) / 'narrow.db'}
+        print("Building narrow schema...")
+        build_narrow(paths['narrow'])
+        print("Building wide schema...")
+        build_wide(paths['wide'], paths['narrow'])
+
+        print("\n" + "="*80)
+        print("Database size")
+        print("="*80)
+        for layout, path in paths.items():
+            videos = table_bytes(path, 'videos')
+            detail = f" | videos table {videos / 1024 / 1024:8.2f} MB" if videos else ""
+            print(f"   {layout:>6s}: file {path.stat().st_size / 1024 / 1024:8.2f} MB{detail}")
+
+        can_drop = drop_page_cache(paths['wide'])
+        for cold in ((True, False) if can_drop else (False,)):
+            print("\n" + "="*80)
+            print(f"{'Cold' if cold else 'Warm'} cache, median of {args.repeat} run(s)")
+            print("="*80)
+            queries = [(name, {layout: sql for layout in paths}) for name, sql in SCAN_QUERIES.items()]
+            queries.append(('videos page top 100', VIDEOS_PAGE_QUERIES))
+            for name, sql_by_layout in queries:
+                wide = time_query(paths['wide'], sql_by_layout['wide'], args.repeat, cold)
+                narrow = time_query(paths['narrow'], sql_by_layout['narrow'], args.repeat, cold)
+                print(f"   {name:>20s}: wide {wide * 1000:8.1f} ms | narrow {narrow * 1000:8.1f} ms | "
+                      f"{wide / narrow:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Parquet Read Benchmark
+
+Times get_correlation_data-style full-column reads from the SQLite database
+through pd.read_sql_query against the same columns read from the
+partitioned Parquet snapshot. The snapshot is exported from the database
+into a scratch directory first.
+
+Usage:
+    python benchmarks/bench_parquet_read.py
+    python benchmarks/bench_parquet_read.py --db path/to/youtube_trends.db --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from database import create_database as cdb
+from database import parquet_snapshot as ps
+
+# Columns read by db_utils.get_correlation_data
+CORRELATION_COLUMNS = [
+    'views', 'likes', 'dislikes', 'comment_count',
+    'engagement_rate', 'like_ratio', 'title_length', 'tag_count',
+]
+
+# (label, country filter)
+READ_CASES = [
+    ('all countries', None),
+    ('US only', ['US']),
+]
+
+
+def read_sqlite(db_path, columns, countries):
+    """Read columns of videos the way db_utils does."""
+    conn = sqlite3.connect(Path(db_path).resolve().as_uri() + '?mode=ro', uri=True)
+    where_clause = ""
+    if countries:
+        country_list = "','".join(countries)
+        where_clause = f"WHERE country IN ('{country_list}')"
+    df = pd.read_sql_query(f"SELECT {', '.join(columns)} FROM videos {where_clause}", conn)
+    conn.close()
+    return df
+
+
+def median_secs(func, repeat):
+    """Return the median wall time of func() and its last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', type=Path, default=cdb.DB_PATH,
+                        help="database to read (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per read (default: %(default)s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        snapshot = Path(work_dir) / 'videos'
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = ps.write_videos_dataset(args.db, snapshot)
+        snapshot_mb = sum(f.stat().st_size for f in snapshot.rglob('*.parquet')) / 1024 / 1024
+
+        print("="*80)
+        print(f"{rows:,} videos | database {args.db.stat().st_size / 1024 / 1024:.2f} MB | "
+              f"snapshot {snapshot_mb:.2f} MB")
+        print(f"Median of {args.repeat} run(s), {len(CORRELATION_COLUMNS)} correlation columns")
+        print("="*80)
+
+        for label, countries in READ_CASES:
+            sqlite_secs, sqlite_df = median_secs(
+                lambda: read_sqlite(args.db, CORRELATION_COLUMNS, countries), args.repeat)
+            parquet_secs, parquet_df = median_secs(
+                lambda: ps.read_videos_snapshot(CORRELATION_COLUMNS, countries, snapshot), args.repeat)
+
+            # Row order differs between the two stores; compare the aggregates
+            same = sqlite_df.corr().round(9).equals(parquet_df.astype('float64').corr().round(9))
+            print(f"   {label:>14s}: sqlite {sqlite_secs * 1000:8.1f} ms | parquet {parquet_secs * 1000:8.1f} ms | "
+                  f"{sqlite_secs / parquet_secs:5.1f}x | {len(parquet_df):,} rows | "
+                  f"correlation {'matches' if same else 'DIFFERS'}")
+
+
+if __name__ == "__main__":
+    main()
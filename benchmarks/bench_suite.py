@@ -0,0 +1,299 @@
+"""
+Benchmark Suite
+
+Measures create_database.py and every db_utils query function on synthetic
+datasets (see synthetic_data.py) of one or more sizes, and compares the
+results with a stored baseline, so the performance impact of a change can
+be read off one report.
+
+For each size the suite:
+
+    1. Generates cleaned_videos.csv, categories.csv and channel_stats.csv,
+       or reuses them from --data-root when they were generated before
+    2. Runs create_database() in a fresh process into a scratch directory,
+       recording its wall time and peak memory (resident set size of the
+       build process, and of the largest of its parser processes)
+    3. Runs every case in check_query_plans.QUERY_CASES cold (caches cleared)
+       and warm (served by the result cache), recording the median of each,
+       then runs it once more under tracemalloc for the peak memory the
+       call allocates
+
+Results are written to a JSON report. With a baseline (default:
+benchmarks/baseline.json) every measurement is compared with it, and the
+suite exits with status 1 when one is slower than --threshold times its
+baseline value. --save-baseline stores the report as the new baseline.
+
+Timings depend on the machine, so keep one baseline per machine and compare
+runs made on that same machine. Generating the 10m dataset writes ~15 GB of
+CSV and takes a while; it is reused on later runs with the same --data-root.
+
+Usage:
+    python benchmarks/bench_suite.py                              # 100k rows
+    python benchmarks/bench_suite.py --sizes 100k 1m 10m --data-root /data/synthetic
+    python benchmarks/bench_suite.py --sizes 1m --save-baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from streamlit.logger import set_log_level
+
+# st.cache_data warns when used outside a running Streamlit app; set before
+# db_utils is imported, which also happens in the spawned build process
+set_log_level('error')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from benchmarks.synthetic_data import generate_dataset, parse_size
+from database import create_database as cdb
+from database import db_utils as db
+from database.check_query_plans import QUERY_CASES
+from database.result_cache import CACHE_DIR_ENV_VAR, CACHE_SIZE_ENV_VAR
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+# A measurement regresses when it exceeds its baseline by this factor...
+DEFAULT_THRESHOLD = 1.25
+# ...and by more than this many milliseconds, so noise on fast calls is ignored
+MIN_REGRESSION_MS = 5.0
+
+
+def max_rss_mb(who):
+    """Peak resident set size of this process or of its waited-for children, in MB."""
+    if who == resource.RUSAGE_SELF:
+        # Linux keeps ru_maxrss across exec, so a spawned process would report
+        # its parent's peak; VmHWM starts over with the new program
+        try:
+            with open('/proc/self/status') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1]) / 1024
+        except FileNotFoundError:
+            pass
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def build_in_process(data_dir, db_dir, workers, results):
+    """Run create_database() on data_dir into db_dir; report time and peak memory."""
+    cdb.CLEANED_DATA_DIR = Path(data_dir)
+    cdb.DB_PATH = Path(db_dir) / 'youtube_trends.db'
+    cdb.STAGING_DB_PATH = Path(db_dir) / 'youtube_trends.staging.db'
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        cdb.create_database(workers=workers, prewarm=False)
+    results.put({
+        'seconds': time.perf_counter() - start,
+        'peak_mb': max_rss_mb(resource.RUSAGE_SELF),
+        'workers_peak_mb': max_rss_mb(resource.RUSAGE_CHILDREN),
+    })
+
+
+def time_build(data_dir, db_dir, workers):
+    """
+    Time a full create_database() build in a fresh process.
+
+    A new process starts with no memory high-water mark, so its peak RSS
+    belongs to the build alone. It is not a daemon, so the build can start
+    its own CSV parser processes.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    results = ctx.Queue()
+    process = ctx.Process(target=build_in_process, args=(str(data_dir), str(db_dir), workers, results))
+    process.start()
+    result = results.get()
+    process.join()
+    if process.exitcode != 0:
+        raise RuntimeError(f"create_database() failed with exit code {process.exitcode}")
+    return result
+
+
+def describe_case(func_name, kwargs):
+    """Label a query case the way the other benchmarks print it."""
+    return f"{func_name}({', '.join(f'{k}={v}' for k, v in kwargs.items())})"
+
+
+def time_query(func_name, kwargs, repeat):
+    """
+    Return cold and warm median milliseconds and peak allocated MB of one case.
+
+    Cold runs clear the function's memory and disk cache first, so they
+    run its queries (the database pages may still be in the OS cache).
+    Warm runs follow a cold run and are served by st.cache_data. The peak
+    is traced in a separate cold run, since tracemalloc slows calls down.
+    """
+    func = getattr(db, func_name)
+    cold, warm = [], []
+    for _ in range(repeat):
+        func.clear()
+        start = time.perf_counter()
+        func(**kwargs)
+        cold.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        func(**kwargs)
+        warm.append(time.perf_counter() - start)
+
+    func.clear()
+    tracemalloc.start()
+    try:
+        func(**kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    func.clear()
+
+    return {
+        'cold_ms': statistics.median(cold) * 1000,
+        'warm_ms': statistics.median(warm) * 1000,
+        'peak_mb': peak / (1024 * 1024),
+    }
+
+
+def run_size(label, rows, args, work_dir):
+    """Generate (or reuse) one dataset, then benchmark the build and the queries."""
+    data_dir = (args.data_root or Path(work_dir)) / f"synthetic_{label}_seed{args.seed}"
+    if (data_dir / 'cleaned_videos.csv').exists():
+        print(f"\nReusing {rows:,}-row dataset in {data_dir}")
+    else:
+        print(f"\nGenerating {rows:,}-row dataset in {data_dir}...")
+        start = time.perf_counter()
+        generate_dataset(data_dir, rows, args.seed)
+        print(f"   Generated in {time.perf_counter() - start:.1f}s")
+
+    db_dir = Path(work_dir) / f"db_{label}"
+    db_dir.mkdir()
+    print("Building database...")
+    build = time_build(data_dir, db_dir, args.workers)
+    print(f"   create_database: {build['seconds']:.1f}s, peak {build['peak_mb']:.0f} MB "
+          f"(parser processes {build['workers_peak_mb']:.0f} MB)")
+
+    db_path = db_dir / 'youtube_trends.db'
+    db.get_db_path = lambda: str(db_path)
+    os.environ[CACHE_DIR_ENV_VAR] = str(Path(work_dir) / f"cache_{label}")
+
+    print(f"Running {len(QUERY_CASES)} query cases ({args.repeat} cold + warm run(s) each)...")
+    queries = {}
+    for func_name, kwargs in QUERY_CASES:
+        case = describe_case(func_name, kwargs)
+        queries[case] = time_query(func_name, kwargs, args.repeat)
+        result = queries[case]
+        print(f"   {case[:60]:60s} cold {result['cold_ms']:8.1f} ms | "
+              f"warm {result['warm_ms']:7.2f} ms | peak {result['peak_mb']:7.1f} MB")
+
+    return {'rows': rows, 'create_database': build, 'queries': queries}
+
+
+def iter_measurements(report):
+    """Yield (size, name, metric, value) for every timing in a report."""
+    for size, result in report['sizes'].items():
+        yield size, 'create_database', 'wall_ms', result['create_database']['seconds'] * 1000
+        for case, timings in result['queries'].items():
+            for metric in ('cold_ms', 'warm_ms'):
+                yield size, case, metric, timings[metric]
+
+
+def compare_with_baseline(report, baseline, threshold):
+    """
+    Print how every timing compares with the baseline.
+
+    Returns:
+    list: (size, name, metric, baseline ms, current ms) of each regression
+    """
+    previous = {(size, name, metric): value for size, name, metric, value in iter_measurements(baseline)}
+    regressions = []
+
+    print("\n" + "="*100)
+    print(f"Compared with baseline from {baseline.get('created', 'unknown date')} "
+          f"(regression: > {threshold:g}x and > {MIN_REGRESSION_MS:g} ms slower)")
+    print("="*100)
+    for size, name, metric, value in iter_measurements(report):
+        base = previous.get((size, name, metric))
+        if base is None:
+            continue
+        ratio = value / base if base else float('inf')
+        regressed = ratio > threshold and value - base > MIN_REGRESSION_MS
+        if regressed:
+            regressions.append((size, name, metric, base, value))
+        if regressed or metric != 'warm_ms':
+            flag = "REGRESSED" if regressed else ""
+            print(f"   {size:5s} {name[:52]:52s} {metric:8s} {base:10.1f} -> {value:10.1f} ms "
+                  f"({ratio:5.2f}x) {flag}")
+
+    missing = {key[:2] for key in previous} - {(size, name) for size, name, _, _ in iter_measurements(report)}
+    sizes = set(report['sizes'])
+    for size, name in sorted(missing):
+        if size in sizes:
+            print(f"   {size:5s} {name[:52]:52s} no longer measured")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', default=['100k'],
+                        help="dataset sizes: row counts or 100k, 1m, 10m (default: %(default)s)")
+    parser.add_argument('--data-root', type=Path, default=None,
+                        help="directory to keep generated datasets in for reuse (default: a scratch directory)")
+    parser.add_argument('--work-dir', type=Path, default=None,
+                        help="directory for scratch databases; use a real disk to include fsync cost")
+    parser.add_argument('--seed', type=int, default=42, help="dataset random seed (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=3, help="cold and warm runs per query case (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="CSV parser processes for the build (default: %(default)s)")
+    parser.add_argument('--report', type=Path, default=None, help="write the JSON report to this file")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE,
+                        help="baseline report to compare with (default: %(default)s)")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown factor that counts as a regression (default: %(default)s)")
+    args = parser.parse_args()
+
+    # A small disk cache per size, so cold runs never read a previous size's results
+    os.environ[CACHE_SIZE_ENV_VAR] = '256'
+
+    report = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                    'cpus': os.cpu_count(), 'workers': args.workers},
+        'seed': args.seed,
+        'sizes': {},
+    }
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        for size in args.sizes:
+            rows = parse_size(size)
+            report['sizes'][size] = run_size(size, rows, args, work_dir)
+
+    if args.report:
+        args.report.write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.report}")
+
+    regressions = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_with_baseline(report, baseline, args.threshold)
+        print("="*100)
+        print(f"{len(regressions)} regression(s)")
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline saved to {args.baseline}")
+
+    if regressions and not args.save_baseline:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
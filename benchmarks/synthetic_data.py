@@ -0,0 +1,342 @@
+"""
+Synthetic Dataset Generator
+
+Writes cleaned_videos.csv, categories.csv and channel_stats.csv in the
+layout the notebook exports, at any number of rows, so create_database.py
+and the dashboard queries can be benchmarked beyond the ~107,000 rows of
+the Kaggle dataset. The data is random but shaped like the real thing:
+
+    - Channel popularity follows a Zipf law: a few channels own many
+      trending videos, most channels have one or two
+    - Each channel publishes in one category, and categories are skewed
+      towards Entertainment, Music and People & Blogs
+    - Views are log-normal per video, boosted by the channel's popularity,
+      and grow on each further day a video stays on trending
+    - Likes, dislikes and comments are log-normal fractions of views
+    - The lag from publishing to trending is mostly one to a few days, with
+      a long tail of old videos that trend months or years later
+    - A video trends for a geometric number of days, mostly in one of
+      US, CA and GB, sometimes in two or all three
+
+Derived columns (engagement_rate, days_to_trending, performance_class, ...)
+use the notebook's formulas. Rows are generated and appended in chunks, so
+memory use does not grow with the number of rows. The same seed and row
+count always produce the same files.
+
+Usage:
+    python benchmarks/synthetic_data.py --rows 1m --out-dir /tmp/synthetic_1m
+    python benchmarks/synthetic_data.py --rows 100000 --out-dir /tmp/synthetic --seed 7
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from database.create_database import DERIVED_VIDEO_COLUMNS, VIDEO_COLUMNS, VIDEO_TEXT_COLUMNS
+
+# Row counts selectable by name
+SIZES = {'100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# YouTube category IDs and names with the share of channels in each
+CATEGORIES = [
+    (24, 'Entertainment', 0.25), (10, 'Music', 0.15), (22, 'People & Blogs', 0.10),
+    (23, 'Comedy', 0.08), (25, 'News & Politics', 0.08), (26, 'Howto & Style', 0.07),
+    (17, 'Sports', 0.06), (1, 'Film & Animation', 0.05), (28, 'Science & Technology', 0.04),
+    (27, 'Education', 0.04), (20, 'Gaming', 0.03), (15, 'Pets & Animals', 0.02),
+    (2, 'Autos & Vehicles', 0.015), (19, 'Travel & Events', 0.01),
+    (29, 'Nonprofits & Activism', 0.005), (43, 'Shows', 0.003), (30, 'Movies', 0.001),
+    (44, 'Trailers', 0.001),
+]
+
+# Country a video first trends in, and the chance it also trends elsewhere
+COUNTRIES = ['US', 'CA', 'GB']
+COUNTRY_WEIGHTS = [0.4, 0.3, 0.3]
+EXTRA_COUNTRY_PROBABILITY = 0.15
+
+# Trending rows per channel on average, which sets the number of channels
+ROWS_PER_CHANNEL = 25
+# Zipf exponent of channel popularity
+CHANNEL_ZIPF = 0.7
+
+# Mean days a video stays on trending, and the cap
+MEAN_TRENDING_DAYS = 5
+MAX_TRENDING_DAYS = 30
+
+# Publish times are spread over this window
+PUBLISH_START = pd.Timestamp('2017-11-01', tz='UTC')
+PUBLISH_DAYS = 210
+
+# Share of videos that trend long after they were published
+OLD_VIDEO_PROBABILITY = 0.02
+
+# Pools of titles, tag lists and descriptions that rows pick from
+TEXT_POOL_SIZE = 20_000
+WORDS = (
+    "official video music trailer new live full episode highlights vs best top funny "
+    "challenge reaction review how to make first look interview news update season "
+    "game day night world cup week show late tonight behind the scenes vlog prank "
+    "recipe easy tutorial unboxing tour remix cover acoustic performance final part"
+).split()
+TAG_VOCABULARY_SIZE = 5_000
+
+# Videos generated per chunk (each produces several rows)
+CHUNK_VIDEOS = 20_000
+
+
+def parse_size(text):
+    """Parse a row count such as 100000, 100k, 1m or 10m."""
+    text = str(text).lower()
+    if text in SIZES:
+        return SIZES[text]
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+
+def build_text_pools(rng):
+    """Build the title, tags and description pools and a Zipf tag vocabulary."""
+    words = np.array(WORDS)
+    titles = [
+        ' '.join(rng.choice(words, size=rng.integers(3, 13))).title()
+        for _ in range(TEXT_POOL_SIZE)
+    ]
+
+    vocabulary = [f"{rng.choice(words)} {rng.choice(words)} {i}" for i in range(TAG_VOCABULARY_SIZE)]
+    tag_weights = 1.0 / np.arange(1, TAG_VOCABULARY_SIZE + 1)
+    tag_weights /= tag_weights.sum()
+    tags = []
+    for _ in range(TEXT_POOL_SIZE):
+        count = rng.integers(0, 31)
+        if count == 0:
+            tags.append('[none]')
+        else:
+            picked = rng.choice(TAG_VOCABULARY_SIZE, size=count, replace=False, p=tag_weights)
+            tags.append('|'.join(f'"{vocabulary[i]}"' for i in picked))
+
+    lengths = np.clip(rng.lognormal(np.log(600), 0.8, TEXT_POOL_SIZE), 0, 5000).astype(int)
+    descriptions = [' '.join(rng.choice(words, size=max(length // 6, 1)))[:length] for length in lengths]
+
+    return np.array(titles, dtype=object), np.array(tags, dtype=object), np.array(descriptions, dtype=object)
+
+
+def make_video_ids(first, count):
+    """Return count distinct 11-character video IDs, starting at video number first."""
+    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
+    ids = []
+    for number in range(first, first + count):
+        # Scramble consecutive numbers with an odd multiplier modulo 64^11
+        value = (number * 0x9E3779B97F4A7C15 + 0x632BE59BD9B4E019) % (64 ** 11)
+        chars = []
+        for _ in range(11):
+            value, digit = divmod(value, 64)
+            chars.append(alphabet[digit])
+        ids.append(''.join(chars))
+    return np.array(ids, dtype=object)
+
+
+def generate_chunk(rng, first_video, channels, pools):
+    """
+    Generate the trending rows of CHUNK_VIDEOS new videos.
+
+    Returns:
+    pd.DataFrame: Rows in the notebook's column layout, without
+        performance_class, which needs the dataset's view percentiles
+    """
+    channel_names, channel_categories, channel_boost, channel_weights = channels
+    titles, tags, descriptions = pools
+    n = CHUNK_VIDEOS
+
+    # Per video
+    channel = rng.choice(len(channel_names), size=n, p=channel_weights)
+    publish_seconds = rng.integers(0, PUBLISH_DAYS * 86400, n)
+    lag_days = np.ceil(rng.lognormal(np.log(2), 0.9, n)).clip(1, None)
+    old = rng.random(n) < OLD_VIDEO_PROBABILITY
+    lag_days[old] += rng.integers(30, 2000, old.sum())
+    trending_days = np.minimum(rng.geometric(1 / MEAN_TRENDING_DAYS, n), MAX_TRENDING_DAYS)
+    country_count = 1 + rng.binomial(len(COUNTRIES) - 1, EXTRA_COUNTRY_PROBABILITY, n)
+    first_country = rng.choice(len(COUNTRIES), size=n, p=COUNTRY_WEIGHTS)
+    base_views = rng.lognormal(np.log(250_000), 1.6, n) * channel_boost[channel]
+    growth = rng.uniform(0.05, 0.6, n)
+    like_rate = np.minimum(rng.lognormal(np.log(0.03), 0.6, n), 0.5)
+    dislike_rate = np.minimum(rng.lognormal(np.log(0.04), 0.8, n), 1.0)
+    comment_rate = np.minimum(rng.lognormal(np.log(0.004), 0.8, n), 0.2)
+    comments_disabled = rng.random(n) < 0.015
+    text = rng.integers(0, TEXT_POOL_SIZE, n)
+    video_ids = make_video_ids(first_video, n)
+
+    # One row per video, country and trending day
+    per_video = trending_days * country_count
+    video = np.repeat(np.arange(n), per_video)
+    within = np.arange(len(video)) - np.repeat(np.cumsum(per_video) - per_video, per_video)
+    day = within % trending_days[video]
+    country = (first_country[video] + within // trending_days[video]) % len(COUNTRIES)
+
+    # Dates are handled as day numbers from PUBLISH_START and formatted per
+    # video or through a lookup table, not per row
+    publish_time = PUBLISH_START + pd.to_timedelta(publish_seconds, unit='s')
+    publish_day = publish_seconds // 86400
+    trending_day = (publish_day + lag_days)[video].astype(np.int64) + day
+    day_names = pd.date_range(PUBLISH_START, periods=trending_day.max() + 1, freq='D').strftime('%Y-%m-%d')
+    thumbnails = np.array([f"https://i.ytimg.com/vi/{vid}/default.jpg" for vid in video_ids], dtype=object)
+
+    views = np.maximum(base_views[video] * (1 + growth[video]) ** day, 1).astype(np.int64)
+    likes = np.maximum(views * like_rate[video], 1).astype(np.int64)
+    dislikes = (likes * dislike_rate[video]).astype(np.int64)
+    comment_count = np.where(comments_disabled[video], 0, views * comment_rate[video]).astype(np.int64)
+
+    df = pd.DataFrame({
+        'video_id': video_ids[video],
+        'trending_date': day_names.to_numpy()[trending_day],
+        'title': titles[text[video]],
+        'channel_title': channel_names[channel[video]],
+        'category_id': channel_categories[channel[video]],
+        'publish_time': publish_time.strftime('%Y-%m-%d %H:%M:%S+00:00').to_numpy()[video],
+        'tags': tags[text[video]],
+        'views': views,
+        'likes': likes,
+        'dislikes': dislikes,
+        'comment_count': comment_count,
+        'thumbnail_link': thumbnails[video],
+        'comments_disabled': comments_disabled[video],
+        'ratings_disabled': False,
+        'video_error_or_removed': False,
+        'description': descriptions[text[video]],
+        'country': np.array(COUNTRIES)[country],
+    })
+
+    # Derived columns, as calculate_engagement_metrics() in the notebook
+    df['engagement_rate'] = (df['likes'] + df['dislikes'] + df['comment_count']) / df['views'] * 100
+    reactions = df['likes'] + df['dislikes']
+    df['like_ratio'] = np.where(reactions > 0, df['likes'] / reactions * 100, 0)
+    df['comment_rate'] = df['comment_count'] / df['views'] * 100
+    df['dislike_ratio'] = df['dislikes'] / df['views'] * 100
+    df['days_to_trending'] = trending_day - publish_seconds[video] / 86400
+    df['publish_hour'] = publish_time.hour.to_numpy()[video]
+    df['publish_day_of_week'] = publish_time.dayofweek.to_numpy()[video]
+    df['publish_month'] = publish_time.month.to_numpy()[video]
+    df['title_length'] = df['title'].str.len()
+    df['description_length'] = df['description'].str.len()
+    df['tag_count'] = df['tags'].str.count(r'\|') + 1
+    df.loc[df['tags'] == '[none]', 'tag_count'] = 0
+    return df
+
+
+def classify(df, thresholds):
+    """Add performance_class with the notebook's rules and the given percentiles."""
+    view_75, view_90, days_25, days_50 = thresholds
+    explosive = (df['views'] >= view_90) & (df['days_to_trending'] <= days_25)
+    high = (df['views'] >= view_75) | (df['days_to_trending'] <= days_50)
+    df['performance_class'] = np.select([explosive, high], ['Explosive', 'High-Performing'], 'Standard Trending')
+    return df
+
+
+def generate_dataset(out_dir, rows, seed=42):
+    """
+    Write a synthetic cleaned_videos.csv, categories.csv and channel_stats.csv.
+
+    performance_class thresholds are the percentiles of the first chunk,
+    which has tens of thousands of rows drawn from the same distributions
+    as the rest, instead of the exact percentiles of the whole file.
+
+    Parameters:
+    out_dir (Path): Directory to write the three files to (created if missing)
+    rows (int): Rows in cleaned_videos.csv
+    seed (int): Random seed
+
+    Returns:
+    dict: Row counts of the three files
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    category_ids = np.array([cid for cid, _, _ in CATEGORIES])
+    category_weights = np.array([weight for _, _, weight in CATEGORIES])
+    category_weights /= category_weights.sum()
+    pd.DataFrame(
+        [(cid, name) for cid, name, _ in CATEGORIES], columns=['category_id', 'category_name']
+    ).to_csv(out_dir / 'categories.csv', index=False)
+    category_names = dict((cid, name) for cid, name, _ in CATEGORIES)
+
+    n_channels = max(rows // ROWS_PER_CHANNEL, 10)
+    channel_weights = 1.0 / np.arange(1, n_channels + 1) ** CHANNEL_ZIPF
+    channel_weights /= channel_weights.sum()
+    channels = (
+        np.array([f"Channel {i:07d}" for i in range(n_channels)], dtype=object),
+        rng.choice(category_ids, size=n_channels, p=category_weights),
+        rng.lognormal(0, 0.8, n_channels),
+        channel_weights,
+    )
+    pools = build_text_pools(rng)
+
+    columns = (
+        [col for col in VIDEO_COLUMNS if col not in DERIVED_VIDEO_COLUMNS]
+        + [col for col in VIDEO_TEXT_COLUMNS if col not in VIDEO_COLUMNS]
+        + ['category_name']
+    )
+    csv_path = out_dir / 'cleaned_videos.csv'
+    channel_totals = []
+    thresholds = None
+    written = 0
+    first_video = 0
+    while written < rows:
+        df = generate_chunk(rng, first_video, channels, pools).iloc[:rows - written]
+        first_video += CHUNK_VIDEOS
+        if thresholds is None:
+            thresholds = (
+                df['views'].quantile(0.75), df['views'].quantile(0.90),
+                df['days_to_trending'].quantile(0.25), df['days_to_trending'].quantile(0.50),
+            )
+        df = classify(df, thresholds)
+        df['category_name'] = df['category_id'].map(category_names)
+        df[columns].to_csv(csv_path, mode='w' if written == 0 else 'a', header=written == 0, index=False)
+        written += len(df)
+
+        channel_totals.append(df.groupby('channel_title').agg(
+            video_count=('video_id', 'size'),
+            total_views=('views', 'sum'),
+            engagement_sum=('engagement_rate', 'sum'),
+        ))
+
+    # Same aggregation as the notebook's channel_stats export
+    totals = pd.concat(channel_totals).groupby(level=0).sum()
+    channel_stats = pd.DataFrame({
+        'channel_title': totals.index,
+        'video_count': totals['video_count'].to_numpy(),
+        'total_views': totals['total_views'].to_numpy(),
+        'avg_views': (totals['total_views'] / totals['video_count']).to_numpy(),
+        'avg_engagement': (totals['engagement_sum'] / totals['video_count']).to_numpy(),
+    })
+    channel_stats.to_csv(out_dir / 'channel_stats.csv', index=False)
+
+    return {
+        'cleaned_videos.csv': written,
+        'categories.csv': len(CATEGORIES),
+        'channel_stats.csv': len(channel_stats),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', default='100k',
+                        help="rows in cleaned_videos.csv: a number or 100k, 1m, 10m (default: %(default)s)")
+    parser.add_argument('--out-dir', type=Path, required=True, help="directory to write the CSV files to")
+    parser.add_argument('--seed', type=int, default=42, help="random seed (default: %(default)s)")
+    args = parser.parse_args()
+
+    rows = parse_size(args.rows)
+    start = time.perf_counter()
+    counts = generate_dataset(args.out_dir, rows, args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"Wrote synthetic dataset to {args.out_dir} in {elapsed:.1f}s")
+    for name, count in counts.items():
+        print(f"   {name:22s} {count:>12,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""
+Query Backends for db_utils
+
+db_utils builds SQL and hands it to a backend that opens connections, runs
+queries into DataFrames and reports which tables exist. Two backends are
+available, picked by the YT_TRENDS_BACKEND environment variable:
+
+    sqlite  (default)  Row store: database/youtube_trends.db, read-only
+    duckdb             Embedded vectorized column store over the Parquet
+                       snapshot written by create_database.py --parquet
+
+The Parquet snapshot carries the base tables but not the agg_* summary
+tables, so on DuckDB the db_utils functions take their fallback branches and
+aggregate videos directly, which is what a columnar engine is good at.
+
+Usage:
+    YT_TRENDS_BACKEND=duckdb streamlit run src/app.py
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from database.diagnostics import record_statement
+
+BACKEND_ENV_VAR = 'YT_TRENDS_BACKEND'
+DEFAULT_BACKEND = 'sqlite'
+
+# Pragmas set once on every pooled SQLite connection
+READ_PRAGMAS = {
+    'query_only': 'ON',
+    'mmap_size': 256 * 1024 * 1024,   # read pages straight from the OS page cache
+    'cache_size': -64 * 1024,         # 64 MB page cache (negative means KiB)
+}
+
+# Idle connections kept per database file
+POOL_SIZE = 8
+
+# Rows per array yielded by iter_numeric
+NUMERIC_CHUNK_ROWS = 8192
+
+
+class PooledConnection(sqlite3.Connection):
+    """A SQLite connection whose close() hands it back to its pool."""
+
+    pool = None
+    inode = None
+
+    def close(self):
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+
+    def discard(self):
+        """Close the underlying connection for good."""
+        super().close()
+
+
+class ConnectionPool:
+    """
+    Long-lived read-only connections to one database file.
+
+    A thread checks a connection out for the duration of a db_utils call and
+    checks it back in on close(), so the connection and its page cache,
+    memory map and parsed schema outlive the call. Streamlit runs every
+    script rerun on a new thread, so connections are pooled per process
+    rather than stored per thread. A connection is only ever used by one
+    thread at a time.
+
+    Connections are reopened when the database file is replaced (the first
+    build renames the staging file into place), which is detected by inode.
+    """
+
+    def __init__(self, db_path, size=POOL_SIZE):
+        self.db_path = Path(db_path).resolve()
+        self.size = size
+        self._idle = []
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.discarded = 0
+        self.open_seconds = 0.0
+
+    def _current_inode(self):
+        return os.stat(self.db_path).st_ino
+
+    def _open(self):
+        """Open a new read-only connection and apply READ_PRAGMAS."""
+        start = time.perf_counter()
+        conn = sqlite3.connect(
+            self.db_path.as_uri() + '?mode=ro',
+            uri=True,
+            factory=PooledConnection,
+            check_same_thread=False,
+        )
+        for pragma, value in READ_PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        conn.inode = self._current_inode()
+        conn.pool = self
+        with self._lock:
+            self.opened += 1
+            self.open_seconds += time.perf_counter() - start
+        return conn
+
+    def acquire(self):
+        """Check out an idle connection, or open one if none is usable."""
+        inode = self._current_inode()
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+                if conn is not None and conn.inode == inode:
+                    self.reused += 1
+                    return conn
+            if conn is None:
+                return self._open()
+            self._discard(conn)
+
+    def release(self, conn):
+        """Check a connection back in, closing it if the pool is full or stale."""
+        conn.set_trace_callback(None)
+        with self._lock:
+            if len(self._idle) < self.size and conn.inode == self._current_inode():
+                self._idle.append(conn)
+                return
+        self._discard(conn)
+
+    def _discard(self, conn):
+        conn.discard()
+        with self._lock:
+            self.discarded += 1
+
+    def stats(self):
+        """
+        Return reuse counts for the pool.
+
+        latency_saved_ms estimates the connect and pragma time avoided by
+        reuse from the mean cost of the connections actually opened; it does
+        not include the warm page cache and schema a reused connection keeps.
+        """
+        with self._lock:
+            mean_open = self.open_seconds / self.opened if self.opened else 0.0
+            return {
+                'db_path': str(self.db_path),
+                'opened': self.opened,
+                'reused': self.reused,
+                'discarded': self.discarded,
+                'idle': len(self._idle),
+                'mean_open_ms': mean_open * 1000,
+                'latency_saved_ms': self.reused * mean_open * 1000,
+            }
+
+
+# One pool per database file for the life of the process
+_sqlite_pools = {}
+_sqlite_lock = threading.Lock()
+
+
+def get_sqlite_pool(db_path):
+    """Return the process-wide connection pool for a database file."""
+    key = str(Path(db_path).resolve())
+    with _sqlite_lock:
+        if key not in _sqlite_pools:
+            _sqlite_pools[key] = ConnectionPool(key)
+        return _sqlite_pools[key]
+
+
+class SQLiteBackend:
+    """Run queries on the SQLite database file."""
+
+    name = 'sqlite'
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+
+    def connect(self):
+        """
+        Check out a pooled read-only connection to the database.
+
+        Read-only mode means a query can never create an empty database file
+        or take a write lock that would stall the loader. Closing the
+        connection returns it to the pool.
+        """
+        return get_sqlite_pool(self.db_path).acquire()
+
+    def pool_stats(self):
+        """Return the connection pool statistics for this database."""
+        return get_sqlite_pool(self.db_path).stats()
+
+    def file_version(self):
+        """
+        Identify the current state of the database files.
+
+        Changes whenever a build replaces the file or an incremental update
+        commits, which lands in the -wal file before it is checkpointed.
+        """
+        version = []
+        for path in (self.db_path, Path(f"{self.db_path}-wal")):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            version.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        return tuple(version)
+
+    def has_tables(self, conn, tables):
+        """Check whether all of the given tables exist."""
+        placeholders = ", ".join("?" for _ in tables)
+        query = f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})"
+        return conn.execute(query, tables).fetchone()[0] == len(tables)
+
+    def read_sql(self, conn, query, params=None):
+        """
+        Run a query and return the result as a DataFrame.
+
+        Builds the frame straight from fetchall() rather than through
+        pd.read_sql_query, which converts the same rows to identical dtypes
+        but takes about twice as long on full-column reads.
+        """
+        start = time.perf_counter()
+        cursor = conn.execute(query, params or [])
+        columns = [col[0] for col in cursor.description]
+        rows = cursor.fetchall()
+        fetched = time.perf_counter()
+        df = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+        record_statement(self, conn, query, params, fetched - start, time.perf_counter() - fetched, len(rows))
+        return df
+
+    def read_numeric(self, conn, query, params=None):
+        """
+        Run a query with only numeric columns and return float64 columns.
+
+        Converting all rows as one float array skips per-column type
+        inference and halves the conversion cost of a full-table read.
+        NULLs become NaN.
+        """
+        start = time.perf_counter()
+        cursor = conn.execute(query, params or [])
+        columns = [col[0] for col in cursor.description]
+        rows = cursor.fetchall()
+        fetched = time.perf_counter()
+        values = np.array(rows, dtype=np.float64).reshape(-1, len(columns))
+        df = pd.DataFrame(values, columns=columns)
+        record_statement(self, conn, query, params, fetched - start, time.perf_counter() - fetched, len(rows))
+        return df
+
+    def iter_numeric(self, conn, query, params=None, chunk_rows=NUMERIC_CHUNK_ROWS):
+        """
+        Run a query with only numeric columns and yield its rows as float64
+        arrays of at most chunk_rows rows each, so memory use does not grow
+        with the result. NULLs become NaN.
+        """
+        db_seconds = convert_seconds = 0.0
+        total_rows = 0
+        start = time.perf_counter()
+        cursor = conn.execute(query, params or [])
+        width = len(cursor.description)
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            fetched = time.perf_counter()
+            db_seconds += fetched - start
+            if not rows:
+                break
+            total_rows += len(rows)
+            chunk = np.array(rows, dtype=np.float64).reshape(-1, width)
+            convert_seconds += time.perf_counter() - fetched
+            yield chunk
+            start = time.perf_counter()
+        record_statement(self, conn, query, params, db_seconds, convert_seconds, total_rows)
+
+    def explain(self, conn, query, params=None):
+        """Return the EXPLAIN QUERY PLAN detail lines of a statement."""
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params or []).fetchall()
+        return [row[-1] for row in rows]
+
+
+# One in-process DuckDB database per snapshot directory, reopened when the
+# directory is swapped by a new export
+_duckdb_databases = {}
+_duckdb_lock = threading.Lock()
+
+
+class DuckDBBackend:
+    """Run queries with DuckDB over the Parquet snapshot."""
+
+    name = 'duckdb'
+
+    def __init__(self, snapshot_dir):
+        self.snapshot_dir = Path(snapshot_dir)
+
+    def file_version(self):
+        """Identify the current snapshot; export_snapshot swaps in a new directory."""
+        stat = self.snapshot_dir.stat()
+        return (stat.st_ino, stat.st_mtime_ns)
+
+    def _open_database(self):
+        """Create an in-memory DuckDB database with a view per snapshot table."""
+        import duckdb
+        from database.parquet_snapshot import SNAPSHOT_TABLES
+
+        database = duckdb.connect(':memory:')
+        videos_glob = (self.snapshot_dir / 'videos' / '**' / '*.parquet').as_posix()
+        database.execute(f"""
+            CREATE VIEW videos AS
+            SELECT * FROM read_parquet(
+                '{videos_glob}',
+                hive_partitioning = true,
+                hive_types = {{'country': VARCHAR, 'trending_month': VARCHAR}}
+            )
+        """)
+        for table in SNAPSHOT_TABLES:
+            # Snapshots exported by older builds lack the newer tables
+            table_file = self.snapshot_dir / f'{table}.parquet'
+            if table_file.exists():
+                database.execute(f"CREATE VIEW {table} AS SELECT * FROM read_parquet('{table_file.as_posix()}')")
+
+        # SQLite's TOTAL(), used by the db_utils fallback queries
+        database.execute("CREATE MACRO total(x) AS COALESCE(SUM(x), 0)::DOUBLE")
+        return database
+
+    def connect(self):
+        """
+        Return a cursor on the shared DuckDB database for this snapshot.
+
+        Cursors are independent connections to the same in-process database,
+        so each query (and each thread) gets its own while the views and
+        Parquet metadata are set up only once per snapshot.
+        """
+        if not (self.snapshot_dir / 'videos').is_dir():
+            raise FileNotFoundError(
+                f"No Parquet snapshot at {self.snapshot_dir}; "
+                "run python database/create_database.py --parquet first"
+            )
+        key = str(self.snapshot_dir.resolve())
+        version = self.file_version()
+        with _duckdb_lock:
+            cached = _duckdb_databases.get(key)
+            if cached is None or cached[0] != version:
+                # Cursors still open on the old snapshot keep it alive
+                cached = (version, self._open_database())
+                _duckdb_databases[key] = cached
+            return cached[1].cursor()
+
+    def has_tables(self, conn, tables):
+        """Check whether all of the given tables (or views) exist."""
+        placeholders = ", ".join("?" for _ in tables)
+        query = f"SELECT COUNT(*) FROM information_schema.tables WHERE table_name IN ({placeholders})"
+        return conn.execute(query, list(tables)).fetchone()[0] == len(tables)
+
+    def read_sql(self, conn, query, params=None):
+        """
+        Run a query and return the result as a DataFrame.
+
+        DuckDB runs the query in execute(); df() converts the materialized
+        result, which is what the diagnostics count as conversion time.
+        """
+        start = time.perf_counter()
+        result = conn.execute(query, list(params or []))
+        executed = time.perf_counter()
+        df = result.df()
+        record_statement(self, conn, query, params, executed - start, time.perf_counter() - executed, len(df))
+        return df
+
+    def read_numeric(self, conn, query, params=None):
+        """Run a query with only numeric columns and return float64 columns."""
+        return self.read_sql(conn, query, params).astype('float64')
+
+    def iter_numeric(self, conn, query, params=None, chunk_rows=NUMERIC_CHUNK_ROWS):
+        """Run a numeric query and yield float64 arrays of at most chunk_rows rows."""
+        db_seconds = convert_seconds = 0.0
+        total_rows = 0
+        start = time.perf_counter()
+        reader = conn.execute(query, list(params or [])).fetch_record_batch(chunk_rows)
+        for batch in reader:
+            fetched = time.perf_counter()
+            db_seconds += fetched - start
+            total_rows += batch.num_rows
+            chunk = np.column_stack([
+                column.to_numpy(zero_copy_only=False).astype(np.float64) for column in batch.columns
+            ]).reshape(-1, batch.num_columns)
+            convert_seconds += time.perf_counter() - fetched
+            yield chunk
+            start = time.perf_counter()
+        db_seconds += time.perf_counter() - start
+        record_statement(self, conn, query, params, db_seconds, convert_seconds, total_rows)
+
+    def explain(self, conn, query, params=None):
+        """Return the lines of DuckDB's physical plan for a statement."""
+        rows = conn.execute(f"EXPLAIN {query}", list(params or [])).fetchall()
+        return [line for row in rows for line in str(row[-1]).splitlines()]
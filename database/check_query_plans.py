@@ -0,0 +1,197 @@
+"""
+Query Plan Regression Check
+
+Runs every db_utils query function against the database, captures the SQL
+it executes and its EXPLAIN QUERY PLAN, and fails if any statement reads the
+videos fact table with a full table scan instead of an index.
+
+Usage:
+    python database/check_query_plans.py                # check, print failures
+    python database/check_query_plans.py --verbose      # print every plan
+    python database/check_query_plans.py --db path/to/youtube_trends.db
+
+Exits with status 1 when a plan regresses. tests/test_query_plans.py runs
+the same QUERY_CASES under pytest against a freshly built synthetic
+database, so it can gate changes to db_utils.py or the indexes in
+create_database.py.
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+from streamlit.logger import set_log_level
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from database import db_utils as db
+from database.result_cache import CACHE_SIZE_ENV_VAR
+
+# Large tables that must never be read with a plain full scan
+FACT_TABLES = ('videos', 'video_tags')
+
+# Words that can follow a table name without being an alias
+SQL_KEYWORDS = {
+    'WHERE', 'JOIN', 'INNER', 'LEFT', 'CROSS', 'ON', 'GROUP', 'ORDER',
+    'LIMIT', 'UNION', 'USING', 'INDEXED', 'NOT', 'AND', 'OR', 'AS', 'HAVING',
+}
+
+# (function name, keyword arguments) covering each filter shape the pages use
+QUERY_CASES = [
+    ('get_all_countries', {}),
+    ('get_all_categories', {}),
+    ('get_country_stats', {}),
+    ('get_country_stats', {'countries': ['US']}),
+    ('get_category_stats', {}),
+    ('get_category_stats', {'countries': ['US'], 'categories': ['Music']}),
+    ('get_correlation_data', {}),
+    ('get_correlation_data', {'countries': ['US', 'GB']}),
+    ('get_correlation_matrix', {}),
+    ('get_correlation_matrix', {'countries': ['US', 'GB']}),
+    ('get_publishing_time_heatmap', {}),
+    ('get_publishing_time_heatmap', {'countries': ['CA']}),
+    ('get_engagement_by_category', {}),
+    ('get_engagement_by_category', {'countries': ['US']}),
+    ('get_views_engagement_scatter', {}),
+    ('get_views_engagement_scatter', {'countries': ['GB']}),
+    ('get_views_engagement_scatter', {'countries': ['US'], 'stratified': True}),
+    ('get_likes_dislikes_data', {}),
+    ('get_likes_dislikes_data', {'countries': ['US']}),
+    ('get_top_channels', {}),
+    ('get_top_channels', {'countries': ['US', 'CA']}),
+    ('get_days_to_trending', {}),
+    ('get_days_to_trending', {'countries': ['CA']}),
+    ('get_histogram', {'column': 'days_to_trending', 'value_range': (0, 30)}),
+    ('get_histogram', {'column': 'views', 'countries': ['US', 'GB']}),
+    ('get_trending_lifespan', {}),
+    ('get_trending_lifespan', {'countries': ['US']}),
+    ('get_title_length_analysis', {}),
+    ('get_title_length_analysis', {'countries': ['GB']}),
+    ('get_tag_analysis', {}),
+    ('get_tag_analysis', {'countries': ['US']}),
+    ('get_top_tags', {}),
+    ('get_top_tags', {'countries': ['US'], 'sort_by': 'engagement'}),
+    ('get_tag_cooccurrence', {'tag': 'music'}),
+    ('get_tag_cooccurrence', {'tag': 'music', 'countries': ['GB']}),
+    ('get_overall_stats', {}),
+    ('get_overall_stats', {'countries': ['US']}),
+    ('get_overall_stats', {'countries': ['US', 'GB']}),
+    ('get_analysis_bundle', {}),
+    ('get_analysis_bundle', {'countries': ['US']}),
+    ('get_categories_table', {}),
+    ('get_channel_stats_table', {}),
+    ('get_channel_stats_count', {}),
+    ('get_videos_table', {}),
+    ('get_videos_table', {'country_filter': 'US'}),
+    ('get_videos_page', {}),
+    ('get_videos_page', {'sort_by': 'trending_date', 'descending': False, 'country': 'US'}),
+    ('get_videos_page', {'sort_by': 'engagement_rate', 'category_id': 10,
+                         'after': (5.0, 'zzzzzzzzzzz', '9999-12-31', 'ZZ')}),
+    ('get_videos_page', {'channel': 'TED', 'after': (10**9, 'zzzzzzzzzzz', '9999-12-31', 'ZZ')}),
+    ('get_videos_count', {}),
+    ('get_videos_count', {'country_filter': 'GB'}),
+    ('get_videos_count', {'country_filter': 'US', 'category_id': 10, 'channel': 'TED'}),
+]
+
+
+def capture_statements(func_name, kwargs):
+    """Call a db_utils function uncached and return the SQL statements it ran."""
+    statements = []
+    open_connection = db.get_connection
+
+    def traced_connection():
+        conn = open_connection()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    func = getattr(db, func_name)
+    func.clear()
+    db.get_connection = traced_connection
+    try:
+        func(**kwargs)
+    finally:
+        db.get_connection = open_connection
+        func.clear()
+
+    return [
+        sql for sql in statements
+        if sql.lstrip().upper().startswith(('SELECT', 'WITH')) and 'sqlite_master' not in sql
+    ]
+
+
+def explain(conn, sql):
+    """Return the EXPLAIN QUERY PLAN detail lines for a statement."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def fact_table_names(sql):
+    """Return the names a statement uses for fact tables, including aliases."""
+    names = set()
+    for table in FACT_TABLES:
+        for match in re.finditer(rf"\b{table}\b(?:\s+(?:AS\s+)?(\w+))?", sql, re.IGNORECASE):
+            names.add(table)
+            alias = match.group(1)
+            if alias and alias.upper() not in SQL_KEYWORDS:
+                names.add(alias)
+    return names
+
+
+def full_scans(sql, plan):
+    """Return plan lines that read a fact table with a full scan and no index."""
+    scans = {f"SCAN {name}" for name in fact_table_names(sql)}
+    return [line for line in plan if line in scans]
+
+
+def check_query_plans(verbose=False):
+    """
+    Check the plan of every statement issued by QUERY_CASES.
+
+    Returns:
+    list: (function name, kwargs, sql, plan) for every regressed statement
+    """
+    conn = sqlite3.connect(Path(db.get_db_path()).as_uri() + '?mode=ro', uri=True)
+    failures = []
+
+    for func_name, kwargs in QUERY_CASES:
+        for sql in capture_statements(func_name, kwargs):
+            plan = explain(conn, sql)
+            regressed = full_scans(sql, plan)
+            if regressed:
+                failures.append((func_name, kwargs, sql, plan))
+            if verbose or regressed:
+                status = "FULL SCAN" if regressed else "ok"
+                print(f"\n[{status}] {func_name}({kwargs})")
+                print("   " + " ".join(sql.split())[:160])
+                for line in plan:
+                    print(f"      {line}")
+
+    conn.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if a db_utils query plan regresses to a full table scan.")
+    parser.add_argument('--db', type=Path, help="database to check (default: the dashboard database)")
+    parser.add_argument('--verbose', action='store_true', help="print every captured plan")
+    args = parser.parse_args()
+
+    if args.db:
+        db.get_db_path = lambda: str(args.db)
+
+    # st.cache_data warns when used outside a running Streamlit app
+    set_log_level('error')
+    # Run the queries themselves, not the on-disk result cache
+    os.environ[CACHE_SIZE_ENV_VAR] = '0'
+
+    failures = check_query_plans(verbose=args.verbose)
+    print("\n" + "="*80)
+    if failures:
+        print(f"{len(failures)} statement(s) regressed to a full scan of {', '.join(FACT_TABLES)}")
+        sys.exit(1)
+    print(f"All query plans use indexes ({len(QUERY_CASES)} cases checked)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,48 +7,319 @@ It creates tables optimized for Streamlit dashboard queries.
 Tables:
     - categories: Video category reference data
     - channel_stats: Aggregated channel performance metrics
-    - videos: Main fact table with all video data
+    - videos: Main fact table with the numeric and key columns
+    - video_text: Title, tags, thumbnail and description of each videos row
+    - tags: Dictionary of distinct, normalized tags
+    - video_tags: Junction of (video_id, country) to tag_id
+    - unique_videos: One row per (video_id, country) with its trending span
+    - agg_*: Per-country summary tables behind the dashboard aggregates
+    - build_info: Data version stamped on every build, which keys the
+      dashboard's result cache
+
+Usage:
+    python database/create_database.py                # full rebuild
+    python database/create_database.py --incremental  # upsert new/changed rows only
+    python database/create_database.py --parquet      # also export a Parquet snapshot
+    python database/create_database.py --no-prewarm   # skip filling the result cache
 """
 
+import argparse
+import hashlib
+import io
+import itertools
 import sqlite3
+import sys
+import time
+import uuid
 import pandas as pd
 import os
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Define paths
 BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
 CLEANED_DATA_DIR = BASE_DIR / 'cleaned_data'
 DB_PATH = BASE_DIR / 'database' / 'youtube_trends.db'
+STAGING_DB_PATH = BASE_DIR / 'database' / 'youtube_trends.staging.db'
+
+CHUNK_SIZE = 10000
+# Size of the byte ranges handed to each CSV parser process
+PARSE_BLOCK_BYTES = 8 * 1024 * 1024
+LOADERS = ('fast', 'to_sql')
+
+# Pragmas for the fast loader. They are only safe because the full build
+# writes to a private staging file that is discarded if anything fails.
+BULK_LOAD_PRAGMAS = [
+    ('journal_mode', 'OFF'),
+    ('synchronous', 'OFF'),
+    ('locking_mode', 'EXCLUSIVE'),
+]
+
+VIDEO_KEY_COLUMNS = ['video_id', 'trending_date', 'country']
+# Columns of the videos table, in schema order. The large text fields live
+# in video_text so scans of videos only read the compact numeric rows.
+VIDEO_COLUMNS = [
+    'video_id', 'trending_date', 'channel_title', 'category_id',
+    'publish_time', 'views', 'likes', 'dislikes', 'comment_count',
+    'comments_disabled', 'ratings_disabled', 'video_error_or_removed',
+    'country', 'engagement_rate', 'like_ratio', 'comment_rate',
+    'dislike_ratio', 'days_to_trending', 'publish_hour',
+    'publish_day_of_week', 'publish_month', 'title_length',
+    'description_length', 'tag_count', 'performance_class', 'sample_key',
+]
+# Columns of the video_text table, in schema order
+VIDEO_TEXT_COLUMNS = VIDEO_KEY_COLUMNS + ['title', 'tags', 'thumbnail_link', 'description']
+# Columns computed at ingest rather than read from the CSV
+DERIVED_VIDEO_COLUMNS = ['sample_key']
+
+# sample_key is a hash of the primary key in [0, SAMPLE_KEY_RANGE). It is
+# uniformly distributed, so any key range holds a random sample of rows,
+# and stable, so rebuilds and upserts never change an existing row's key.
+SAMPLE_KEY_RANGE = 2 ** 32
+
+# Indexes for the dashboard's common query patterns
+VIDEO_INDEXES = [
+    ("idx_videos_country", "videos(country)"),
+    ("idx_videos_category", "videos(category_id)"),
+    ("idx_videos_channel", "videos(channel_title)"),
+    ("idx_videos_performance", "videos(performance_class)"),
+    ("idx_videos_views", "videos(views)"),
+    ("idx_videos_trending_date", "videos(trending_date)"),
+    ("idx_videos_publish_time", "videos(publish_time)"),
+    ("idx_videos_publish_hour", "videos(publish_hour)"),
+    ("idx_videos_publish_day", "videos(publish_day_of_week)"),
+    # Composite/covering indexes for the db_utils queries that still read
+    # videos. Checked by database/check_query_plans.py.
+    # get_correlation_data, get_views_engagement_scatter and
+    # get_likes_dislikes_data read only these columns; get_videos_table
+    # seeks (country, views) for its ORDER BY views DESC LIMIT n
+    ("idx_videos_country_metrics",
+     "videos(country, views, likes, dislikes, comment_count, engagement_rate, "
+     "like_ratio, title_length, tag_count, performance_class)"),
+    # get_engagement_by_category: per-category counts, and order statistics
+    # read by LIMIT/OFFSET in engagement_rate order with the country checked
+    # inside the index
+    ("idx_videos_category_rate", "videos(category_id, engagement_rate, country)"),
+    # get_days_to_trending: BETWEEN range on days, optional country filter
+    ("idx_videos_days_country", "videos(days_to_trending, country)"),
+    # get_views_engagement_scatter and get_likes_dislikes_data: each
+    # (country, performance_class) stratum is a sample_key range, seeked
+    # from a random start key; the second index serves samples of every
+    # country
+    ("idx_videos_sample_country", "videos(country, performance_class, sample_key)"),
+    ("idx_videos_sample_class", "videos(performance_class, sample_key)"),
+    # get_videos_page: keyset pages in engagement_rate order (views and
+    # trending_date pages walk idx_videos_views and idx_videos_trending_date)
+    ("idx_videos_engagement", "videos(engagement_rate)"),
+    # get_tag_cooccurrence: every video carrying a tag, per country
+    ("idx_video_tags_tag", "video_tags(tag_id, country, video_id)"),
+]
+
+# Indexes earlier versions created, dropped when an incremental run finds them
+RETIRED_INDEXES = ['idx_videos_category_engagement', 'idx_videos_sample']
+
+# Fills unique_videos from videos. channel_title and category_id are
+# looked up from each video's latest snapshot. {source} is NOT INDEXED for a
+# full build, which reads the table sequentially and sorts, beating a walk
+# of the primary key index that fetches rows out of order; an incremental
+# run restricts it to the videos the upsert touched (see UNIQUE_VIDEOS_SOURCES).
+UNIQUE_VIDEOS_SQL = """
+    INSERT INTO unique_videos (
+        video_id, country, channel_title, category_id, first_trending_date,
+        last_trending_date, snapshot_count, peak_views
+    )
+    SELECT
+        g.video_id,
+        g.country,
+        v.channel_title,
+        v.category_id,
+        g.first_trending_date,
+        g.last_trending_date,
+        g.snapshot_count,
+        g.peak_views
+    FROM (
+        SELECT
+            video_id,
+            country,
+            MIN(trending_date) as first_trending_date,
+            MAX(trending_date) as last_trending_date,
+            COUNT(*) as snapshot_count,
+            MAX(views) as peak_views
+        FROM videos {source}
+        GROUP BY video_id, country
+    ) g
+    JOIN videos v
+        ON v.video_id = g.video_id
+        AND v.trending_date = g.last_trending_date
+        AND v.country = g.country
+"""
+UNIQUE_VIDEOS_SOURCES = {
+    'full': "NOT INDEXED",
+    'touched': "WHERE (video_id, country) IN (SELECT video_id, country FROM touched_videos)",
+}
+
+# Summary tables rebuilt from videos after every load. Averages are stored
+# as TOTAL()/COUNT() pairs so any set of countries can be re-aggregated
+# exactly; distinct counts are not additive across countries, so the
+# all-countries figures get their own single-row table. Distinct video
+# counts come from unique_videos (one row per video and country) and
+# distinct channel counts from agg_channel_views (one row per channel and
+# country), which is therefore built first; the all-countries sums are
+# re-added from agg_country_stats.
+#
+# Every table but agg_overall_stats is keyed by country. Each {where} is
+# empty for a full build; an incremental run fills it with a country filter
+# and rebuilds only the rows of the countries it touched.
+SUMMARY_TABLES = {
+    'agg_channel_views': """
+        SELECT
+            country,
+            channel_title,
+            SUM(views) as total_views
+        FROM videos {where}
+        GROUP BY country, channel_title
+    """,
+    'agg_country_stats': """
+        SELECT
+            u.country,
+            u.video_count,
+            c.channel_count,
+            v.views_sum,
+            v.views_n,
+            v.engagement_sum,
+            v.engagement_n,
+            v.days_sum,
+            v.days_n
+        FROM (
+            SELECT country, COUNT(*) as video_count
+            FROM unique_videos {where}
+            GROUP BY country
+        ) u
+        JOIN (
+            SELECT country, COUNT(channel_title) as channel_count
+            FROM agg_channel_views {where}
+            GROUP BY country
+        ) c ON c.country = u.country
+        JOIN (
+            SELECT
+                country,
+                TOTAL(views) as views_sum,
+                COUNT(views) as views_n,
+                TOTAL(engagement_rate) as engagement_sum,
+                COUNT(engagement_rate) as engagement_n,
+                TOTAL(days_to_trending) as days_sum,
+                COUNT(days_to_trending) as days_n
+            FROM videos {where}
+            GROUP BY country
+        ) v ON v.country = u.country
+    """,
+    'agg_overall_stats': """
+        SELECT
+            (SELECT COUNT(DISTINCT video_id) FROM unique_videos) as total_videos,
+            (SELECT COUNT(DISTINCT channel_title) FROM agg_channel_views) as unique_channels,
+            (SELECT COUNT(DISTINCT country) FROM unique_videos) as countries,
+            TOTAL(views_sum) as views_sum,
+            SUM(views_n) as views_n,
+            TOTAL(engagement_sum) as engagement_sum,
+            SUM(engagement_n) as engagement_n,
+            TOTAL(days_sum) as days_sum,
+            SUM(days_n) as days_n
+        FROM agg_country_stats
+    """,
+    'agg_category_stats': """
+        SELECT
+            country,
+            category_id,
+            COUNT(video_id) as video_count,
+            TOTAL(views) as views_sum,
+            COUNT(views) as views_n,
+            TOTAL(engagement_rate) as engagement_sum,
+            COUNT(engagement_rate) as engagement_n,
+            TOTAL(like_ratio) as like_ratio_sum,
+            COUNT(like_ratio) as like_ratio_n
+        FROM videos {where}
+        GROUP BY country, category_id
+    """,
+    'agg_publishing_time': """
+        SELECT
+            country,
+            publish_day_of_week,
+            publish_hour,
+            TOTAL(views) as views_sum,
+            COUNT(views) as views_n
+        FROM videos {where}
+        GROUP BY country, publish_day_of_week, publish_hour
+    """,
+    # Buckets must match db_utils.get_title_length_analysis()
+    'agg_title_length': """
+        SELECT
+            country,
+            CASE
+                WHEN title_length < 30 THEN 'Short (<30)'
+                WHEN title_length < 60 THEN 'Medium (30-60)'
+                ELSE 'Long (60+)'
+            END as title_category,
+            TOTAL(views) as views_sum,
+            COUNT(views) as views_n,
+            COUNT(*) as video_count
+        FROM videos {where}
+        GROUP BY country, title_category
+    """,
+    'agg_tag_count': """
+        SELECT
+            country,
+            tag_count,
+            TOTAL(views) as views_sum,
+            COUNT(views) as views_n,
+            TOTAL(engagement_rate) as engagement_sum,
+            COUNT(engagement_rate) as engagement_n,
+            COUNT(*) as video_count
+        FROM videos {where}
+        GROUP BY country, tag_count
+    """,
+    # Video metrics are summed per (video_id, country) first, so the join
+    # with video_tags touches each video once instead of once per trending
+    # day. video_count counts distinct videos; the sums cover every day.
+    'agg_tag_stats': """
+        WITH per_video AS (
+            SELECT
+                video_id,
+                country,
+                TOTAL(views) as views_sum,
+                COUNT(views) as views_n,
+                TOTAL(engagement_rate) as engagement_sum,
+                COUNT(engagement_rate) as engagement_n
+            FROM videos {where}
+            GROUP BY video_id, country
+        )
+        SELECT
+            vt.country,
+            vt.tag_id,
+            COUNT(*) as video_count,
+            TOTAL(pv.views_sum) as views_sum,
+            TOTAL(pv.views_n) as views_n,
+            TOTAL(pv.engagement_sum) as engagement_sum,
+            TOTAL(pv.engagement_n) as engagement_n
+        FROM video_tags vt
+        JOIN per_video pv ON pv.video_id = vt.video_id AND pv.country = vt.country
+        GROUP BY vt.country, vt.tag_id
+    """,
+}
+
+
+# Columns of the idx_<table>_country index on each summary table, when
+# more than the country. get_top_tags filters on country and video_count.
+SUMMARY_INDEX_COLUMNS = {
+    'agg_tag_stats': 'country, video_count',
+}
+
+
+def create_tables(cursor):
+    """Create the reference, videos, video_text and tag tables if missing."""
 
-def create_database():
-    """Create SQLite database and tables from CSV files."""
-    
-    print("="*80)
-    print("YOUTUBE TRENDS DATABASE SETUP")
-    print("="*80)
-    
-    # Remove existing database if it exists
-    if DB_PATH.exists():
-        print(f"\nRemoving existing database: {DB_PATH}")
-        os.remove(DB_PATH)
-    
-    # Create database directory if it doesn't exist
-    DB_PATH.parent.mkdir(exist_ok=True)
-    
-    # Connect to database
-    print(f"\nCreating new database: {DB_PATH}")
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # Enable foreign keys
-    cursor.execute("PRAGMA foreign_keys = ON")
-    
-    print("\n" + "="*80)
-    print("STEP 1: Creating Tables")
-    print("="*80)
-    
-  
     # TABLE 1: Categories (Dimension Table)
     print("\nCreating 'categories' table...")
     cursor.execute("""
@@ -57,8 +328,8 @@ def create_database():
             category_name TEXT NOT NULL UNIQUE
         )
     """)
-    
-    
+
+
     # TABLE 2: Channel Stats (Aggregated Dimension)
     print("Creating 'channel_stats' table...")
     cursor.execute("""
@@ -70,7 +341,7 @@ def create_database():
             avg_engagement REAL NOT NULL
         )
     """)
-    
+
 
     # TABLE 3: Videos (Main Fact Table)
     print("Creating 'videos' table...")
@@ -78,20 +349,16 @@ def create_database():
         CREATE TABLE IF NOT EXISTS videos (
             video_id TEXT NOT NULL,
             trending_date TEXT NOT NULL,
-            title TEXT,
             channel_title TEXT,
             category_id INTEGER,
             publish_time TEXT,
-            tags TEXT,
             views INTEGER,
             likes INTEGER,
             dislikes INTEGER,
             comment_count INTEGER,
-            thumbnail_link TEXT,
             comments_disabled INTEGER,
             ratings_disabled INTEGER,
             video_error_or_removed INTEGER,
-            description TEXT,
             country TEXT,
             engagement_rate REAL,
             like_ratio REAL,
@@ -105,121 +372,686 @@ def create_database():
             description_length INTEGER,
             tag_count INTEGER,
             performance_class TEXT,
+            sample_key INTEGER NOT NULL,
             PRIMARY KEY (video_id, trending_date, country),
             FOREIGN KEY (category_id) REFERENCES categories(category_id)
         )
     """)
-    
-    conn.commit()
-    
-    print("\n" + "="*80)
-    print("STEP 2: Loading Data from CSV Files")
-    print("="*80)
-    
 
-    print("\nLoading categories...")
+
+    # TABLE 4: Video Text (Side Table, one row per videos row)
+    print("Creating 'video_text' table...")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS video_text (
+            video_id TEXT NOT NULL,
+            trending_date TEXT NOT NULL,
+            country TEXT NOT NULL,
+            title TEXT,
+            tags TEXT,
+            thumbnail_link TEXT,
+            description TEXT,
+            PRIMARY KEY (video_id, trending_date, country),
+            FOREIGN KEY (video_id, trending_date, country)
+                REFERENCES videos(video_id, trending_date, country)
+        )
+    """)
+
+
+    # TABLE 5: Tags (Dimension Table)
+    print("Creating 'tags' table...")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tags (
+            tag_id INTEGER PRIMARY KEY,
+            tag TEXT NOT NULL UNIQUE
+        )
+    """)
+
+
+    # TABLE 6: Video Tags (Junction Table, one row per video, country and tag)
+    print("Creating 'video_tags' table...")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS video_tags (
+            video_id TEXT NOT NULL,
+            country TEXT NOT NULL,
+            tag_id INTEGER NOT NULL,
+            PRIMARY KEY (video_id, country, tag_id),
+            FOREIGN KEY (tag_id) REFERENCES tags(tag_id)
+        ) WITHOUT ROWID
+    """)
+
+
+    # TABLE 7: Unique Videos (Dimension Table, one row per video and country)
+    print("Creating 'unique_videos' table...")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS unique_videos (
+            video_id TEXT NOT NULL,
+            country TEXT NOT NULL,
+            channel_title TEXT,
+            category_id INTEGER,
+            first_trending_date TEXT NOT NULL,
+            last_trending_date TEXT NOT NULL,
+            snapshot_count INTEGER NOT NULL,
+            peak_views INTEGER,
+            PRIMARY KEY (video_id, country),
+            FOREIGN KEY (category_id) REFERENCES categories(category_id)
+        ) WITHOUT ROWID
+    """)
+
+
+    # TABLE 8: Build Info (Key/Value Metadata)
+    print("Creating 'build_info' table...")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS build_info (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+    """)
+
+
+def read_reference_data():
+    """Read categories.csv and channel_stats.csv, de-duplicated on their keys."""
     categories_df = pd.read_csv(CLEANED_DATA_DIR / 'categories.csv')
     # Remove duplicates (same category may appear for different countries)
     categories_df = categories_df.drop_duplicates(subset=['category_id'], keep='last')
-    categories_df.to_sql('categories', conn, if_exists='append', index=False)
-    print(f"   Loaded {len(categories_df)} unique categories")
-    
- 
-    print("\nLoading channel statistics...")
+
     channel_stats_df = pd.read_csv(CLEANED_DATA_DIR / 'channel_stats.csv')
     channel_stats_df = channel_stats_df.drop_duplicates(subset=['channel_title'])
-    channel_stats_df.to_sql('channel_stats', conn, if_exists='append', index=False)
-    print(f"   Loaded {len(channel_stats_df):,} unique channels")
-    
-    print("\nLoading video data (this may take a minute)...")
-    chunk_size = 10000
-    total_rows = 0
+
+    return categories_df, channel_stats_df
+
+
+def check_csv_columns(columns):
+    """Log how the CSV header compares with the videos and video_text columns."""
+    expected = (set(VIDEO_COLUMNS) | set(VIDEO_TEXT_COLUMNS)) - set(DERIVED_VIDEO_COLUMNS)
+    print(f"\n   CSV columns found: {len(columns)}")
+    print(f"   Expected columns: {len(expected)}")
+    extra_cols = set(columns) - expected
+    if extra_cols:
+        print(f"   Warning: Dropping extra columns: {', '.join(extra_cols)}")
+
+
+def iter_video_chunks(chunk_size=CHUNK_SIZE):
+    """Yield chunks of cleaned_videos.csv restricted to the videos and video_text columns."""
     first_chunk = True
-    
+
     for chunk in pd.read_csv(CLEANED_DATA_DIR / 'cleaned_videos.csv', chunksize=chunk_size):
         # Validate and log column info on first chunk
         if first_chunk:
-            print(f"\n   CSV columns found: {len(chunk.columns)}")
-            print(f"   Expected columns: 29")
-            extra_cols = set(chunk.columns) - {'video_id', 'trending_date', 'title', 'channel_title', 'category_id',
-                                                'publish_time', 'tags', 'views', 'likes', 'dislikes', 'comment_count',
-                                                'thumbnail_link', 'comments_disabled', 'ratings_disabled',
-                                                'video_error_or_removed', 'description', 'country',
-                                                'engagement_rate', 'like_ratio', 'comment_rate', 'dislike_ratio',
-                                                'days_to_trending', 'publish_hour', 'publish_day_of_week',
-                                                'publish_month', 'title_length', 'description_length',
-                                                'tag_count', 'performance_class'}
-            if extra_cols:
-                print(f"   Warning: Dropping extra columns: {', '.join(extra_cols)}")
+            check_csv_columns(chunk.columns)
             first_chunk = False
-        
+
         # Drop columns not in database schema
         chunk = chunk.drop(columns=['category_name', 'title_length_category'], errors='ignore')
-        chunk.to_sql('videos', conn, if_exists='append', index=False)
+        yield add_sample_keys(chunk)
+
+
+def add_sample_keys(chunk):
+    """Add the sample_key column, a hash of each row's primary key."""
+    keys = zip(*(chunk[col].astype(str).tolist() for col in VIDEO_KEY_COLUMNS))
+    chunk['sample_key'] = [
+        int.from_bytes(hashlib.blake2b('|'.join(key).encode(), digest_size=4).digest(), 'big')
+        for key in keys
+    ]
+    return chunk
+
+
+def split_csv_records(csv_path, target_bytes=PARSE_BLOCK_BYTES):
+    """
+    Split a CSV file into byte ranges that each hold whole records.
+
+    Fields such as descriptions may contain quoted newlines, so a range may
+    only end at a newline preceded by an even number of quote characters
+    (escaped quotes are doubled and never change the parity). Counting
+    quotes is a cheap sequential pass compared with parsing.
+
+    Returns:
+    tuple: (header line bytes, list of (start, end) byte offsets)
+    """
+    read_size = 1024 * 1024
+    ranges = []
+
+    with open(csv_path, 'rb') as f:
+        header = f.readline()
+        start = block_start = f.tell()
+        next_cut = start + target_bytes
+        in_quotes = 0
+
+        while True:
+            block = f.read(read_size)
+            if not block:
+                break
+
+            i = max(next_cut - block_start, 0)
+            if i < len(block):
+                # Quote parity at offset i of this block
+                parity = in_quotes ^ (block.count(b'"', 0, i) & 1)
+                while True:
+                    j = block.find(b'\n', i)
+                    if j == -1:
+                        break
+                    parity ^= block.count(b'"', i, j) & 1
+                    i = j + 1
+                    if parity:
+                        # Newline inside a quoted field
+                        continue
+                    ranges.append((start, block_start + i))
+                    start = block_start + i
+                    next_cut = start + target_bytes
+                    if next_cut - block_start >= len(block):
+                        break
+                    parity ^= block.count(b'"', i, next_cut - block_start) & 1
+                    i = next_cut - block_start
+
+            in_quotes ^= block.count(b'"') & 1
+            block_start += len(block)
+
+    if start < block_start:
+        ranges.append((start, block_start))
+    return header, ranges
+
+
+def parse_csv_range(csv_path, header, start, end):
+    """Parse one byte range of the videos CSV into row tuples (runs in a worker process)."""
+    with open(csv_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    chunk = pd.read_csv(io.BytesIO(header + data))
+    return chunk_to_video_rows(add_sample_keys(chunk))
+
+
+def iter_video_rows(workers=1):
+    """
+    Yield (videos rows, video_text rows, tag rows) batches from cleaned_videos.csv in file order.
+
+    With more than one worker the file is split into record-aligned byte
+    ranges that a process pool parses and type-converts ahead of the
+    consumer. At most two ranges per worker are in flight, so memory stays
+    bounded, and the caller's writes overlap with parsing of the next ranges.
+    """
+    if workers <= 1:
+        for chunk in iter_video_chunks():
+            yield chunk_to_video_rows(chunk)
+        return
+
+    csv_path = CLEANED_DATA_DIR / 'cleaned_videos.csv'
+    header, ranges = split_csv_records(csv_path)
+    check_csv_columns(pd.read_csv(io.BytesIO(header), nrows=0).columns)
+
+    ranges = iter(ranges)
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque(
+            pool.submit(parse_csv_range, csv_path, header, start, end)
+            for start, end in itertools.islice(ranges, workers * 2)
+        )
+        while pending:
+            rows = pending.popleft().result()
+            next_range = next(ranges, None)
+            if next_range:
+                pending.append(pool.submit(parse_csv_range, csv_path, header, *next_range))
+            yield rows
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def chunk_to_rows(chunk, columns=VIDEO_COLUMNS):
+    """
+    Convert a DataFrame chunk to DB-API parameter tuples.
+
+    Column-wise tolist() yields plain Python scalars without a per-cell
+    object conversion. Missing values come through as NaN, which SQLite
+    stores as NULL when bound.
+    """
+    return list(zip(*(chunk[col].tolist() for col in columns)))
+
+
+def parse_tags(tags):
+    """
+    Split a pipe-delimited tags string into distinct, normalized tags.
+
+    Tags are quoted ("tag one"|"tag two") and '[none]' marks a video
+    without tags. Tags are lower-cased so case variants share one entry.
+    """
+    if not isinstance(tags, str) or tags == '[none]':
+        return []
+    parsed = (tag.strip().strip('"').strip().lower() for tag in tags.split('|'))
+    return list(dict.fromkeys(tag for tag in parsed if tag))
+
+
+def chunk_to_tag_rows(chunk):
+    """Return (video_id, country, [tags]) for every row of a chunk."""
+    return [
+        (video_id, country, parse_tags(tags))
+        for video_id, country, tags in zip(
+            chunk['video_id'].tolist(), chunk['country'].tolist(), chunk['tags'].tolist()
+        )
+    ]
+
+
+def chunk_to_video_rows(chunk):
+    """Split a cleaned_videos.csv chunk into videos, video_text and tag row tuples."""
+    return (
+        chunk_to_rows(chunk, VIDEO_COLUMNS),
+        chunk_to_rows(chunk, VIDEO_TEXT_COLUMNS),
+        chunk_to_tag_rows(chunk),
+    )
+
+
+def read_tag_ids(cursor):
+    """Return the existing tags table as a {tag: tag_id} dict."""
+    cursor.execute("SELECT tag, tag_id FROM tags")
+    return dict(cursor.fetchall())
+
+
+def write_video_tags(cursor, tag_rows, tag_ids):
+    """
+    Insert the tags of a batch into tags and video_tags.
+
+    tag_ids maps every tag already in the tags table to its id and is
+    extended in place, so new tags are inserted once without a lookup
+    query per row. video_tags holds the union of a video's tags over all
+    of its trending days.
+    """
+    new_tags = []
+    links = []
+    for video_id, country, tags in tag_rows:
+        for tag in tags:
+            tag_id = tag_ids.get(tag)
+            if tag_id is None:
+                tag_id = tag_ids[tag] = len(tag_ids) + 1
+                new_tags.append((tag_id, tag))
+            links.append((video_id, country, tag_id))
+
+    cursor.executemany("INSERT INTO tags (tag_id, tag) VALUES (?, ?)", new_tags)
+    cursor.executemany(
+        "INSERT OR IGNORE INTO video_tags (video_id, country, tag_id) VALUES (?, ?, ?)", links
+    )
+
+
+def report_load_rate(total_rows, elapsed):
+    """Print the final row count and throughput of a video load."""
+    rate = total_rows / elapsed if elapsed > 0 else 0
+    print(f"\n   Loaded {total_rows:,} total videos in {elapsed:.1f}s ({rate:,.0f} rows/sec)")
+
+
+def load_videos(conn):
+    """Append every row of cleaned_videos.csv to empty video and tag tables via DataFrame.to_sql."""
+    cursor = conn.cursor()
+    tag_ids = {}
+    total_rows = 0
+    start = time.perf_counter()
+
+    for chunk in iter_video_chunks():
+        chunk[VIDEO_COLUMNS].to_sql('videos', conn, if_exists='append', index=False)
+        chunk[VIDEO_TEXT_COLUMNS].to_sql('video_text', conn, if_exists='append', index=False)
+        write_video_tags(cursor, chunk_to_tag_rows(chunk), tag_ids)
+        conn.commit()
         total_rows += len(chunk)
         print(f"   Loaded {total_rows:,} videos...", end='\r')
-    
-    print(f"\n   Loaded {total_rows:,} total videos")
-    
-    print("\n" + "="*80)
-    print("STEP 3: Creating Indexes for Query Performance")
-    print("="*80)
-    
-    # Create indexes for common query patterns
-    indexes = [
-        ("idx_videos_country", "videos(country)"),
-        ("idx_videos_category", "videos(category_id)"),
-        ("idx_videos_channel", "videos(channel_title)"),
-        ("idx_videos_performance", "videos(performance_class)"),
-        ("idx_videos_views", "videos(views)"),
-        ("idx_videos_trending_date", "videos(trending_date)"),
-        ("idx_videos_publish_time", "videos(publish_time)"),
-        ("idx_videos_publish_hour", "videos(publish_hour)"),
-        ("idx_videos_publish_day", "videos(publish_day_of_week)"),
-    ]
-    
-    for idx_name, idx_def in indexes:
+
+    report_load_rate(total_rows, time.perf_counter() - start)
+    return total_rows
+
+
+def begin_bulk_load(cursor):
+    """
+    Switch the connection to relaxed journaling for a bulk load.
+
+    Returns:
+    list: The previous (pragma, value) settings for end_bulk_load()
+    """
+    previous = []
+    for name, value in BULK_LOAD_PRAGMAS:
+        cursor.execute(f"PRAGMA {name}")
+        previous.append((name, cursor.fetchone()[0]))
+        cursor.execute(f"PRAGMA {name} = {value}")
+    return previous
+
+
+def end_bulk_load(cursor, previous):
+    """Restore the settings saved by begin_bulk_load()."""
+    for name, value in reversed(previous):
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def load_videos_fast(conn, workers=1):
+    """
+    Bulk load cleaned_videos.csv into empty, unindexed video and tag tables.
+
+    All chunks go through one prepared INSERT statement per table inside a
+    single transaction, so SQLite parses each statement once and syncs once.
+    Expects begin_bulk_load() to have been called on the connection.
+
+    Parameters:
+    workers (int): CSV parser processes; the calling thread is the only writer
+    """
+    cursor = conn.cursor()
+    insert_sql = f"""
+        INSERT INTO videos ({', '.join(VIDEO_COLUMNS)})
+        VALUES ({', '.join('?' for _ in VIDEO_COLUMNS)})
+    """
+    insert_text_sql = f"""
+        INSERT INTO video_text ({', '.join(VIDEO_TEXT_COLUMNS)})
+        VALUES ({', '.join('?' for _ in VIDEO_TEXT_COLUMNS)})
+    """
+    tag_ids = {}
+    total_rows = 0
+    start = time.perf_counter()
+
+    cursor.execute("BEGIN")
+    for rows, text_rows, tag_rows in iter_video_rows(workers):
+        cursor.executemany(insert_sql, rows)
+        cursor.executemany(insert_text_sql, text_rows)
+        write_video_tags(cursor, tag_rows, tag_ids)
+        total_rows += len(rows)
+        print(f"   Loaded {total_rows:,} videos...", end='\r')
+    cursor.execute("COMMIT")
+
+    report_load_rate(total_rows, time.perf_counter() - start)
+    return total_rows
+
+
+def build_upsert_sql(table, columns, key_columns):
+    """
+    Build an INSERT ... ON CONFLICT DO UPDATE statement for a table.
+
+    The update only fires when at least one non-key column differs
+    (NULL-safe), so unchanged rows are not rewritten and their index
+    entries are left untouched.
+    """
+    value_columns = [col for col in columns if col not in key_columns]
+    placeholders = ", ".join("?" for _ in columns)
+    assignments = ",\n            ".join(f"{col} = excluded.{col}" for col in value_columns)
+    changed = "\n            OR ".join(f"{table}.{col} IS NOT excluded.{col}" for col in value_columns)
+
+    return f"""
+        INSERT INTO {table} ({', '.join(columns)})
+        VALUES ({placeholders})
+        ON CONFLICT({', '.join(key_columns)}) DO UPDATE SET
+            {assignments}
+        WHERE {changed}
+    """
+
+
+def upsert_reference_tables(conn, categories_df, channel_stats_df):
+    """Insert or refresh categories and channel_stats rows from their CSVs."""
+    cursor = conn.cursor()
+
+    cursor.executemany(
+        build_upsert_sql('categories', list(categories_df.columns), ['category_id']),
+        chunk_to_rows(categories_df, list(categories_df.columns))
+    )
+    print(f"   Upserted {len(categories_df)} unique categories")
+
+    cursor.executemany(
+        build_upsert_sql('channel_stats', list(channel_stats_df.columns), ['channel_title']),
+        chunk_to_rows(channel_stats_df, list(channel_stats_df.columns))
+    )
+    print(f"   Upserted {len(channel_stats_df):,} unique channels")
+
+
+def upsert_videos(conn, workers=1):
+    """
+    Upsert cleaned_videos.csv into the existing video and tag tables.
+
+    Rows are matched on the (video_id, trending_date, country) primary key.
+    New keys are inserted, changed rows are updated in place and unchanged
+    rows are skipped. New tags are added to each video's tag set; tags are
+    never removed. Indexes stay in place and are maintained per row.
+    Nothing is committed here; the caller commits once validation passes.
+
+    Parameters:
+    workers (int): CSV parser processes; the calling thread is the only writer
+
+    Returns:
+    tuple: (rows read, rows inserted, rows updated)
+    """
+    cursor = conn.cursor()
+    upsert_sql = build_upsert_sql('videos', VIDEO_COLUMNS, VIDEO_KEY_COLUMNS)
+    upsert_text_sql = build_upsert_sql('video_text', VIDEO_TEXT_COLUMNS, VIDEO_KEY_COLUMNS)
+
+    cursor.execute("SELECT COUNT(*) FROM videos")
+    count_before = cursor.fetchone()[0]
+    tag_ids = read_tag_ids(cursor)
+    tags_before = len(tag_ids)
+    video_changes = text_changes = 0
+    total_rows = 0
+
+    for rows, text_rows, tag_rows in iter_video_rows(workers):
+        # rowcount leaves out the rows written by track_touched_videos() triggers
+        cursor.executemany(upsert_sql, rows)
+        video_changes += cursor.rowcount
+
+        cursor.executemany(upsert_text_sql, text_rows)
+        text_changes += cursor.rowcount
+
+        write_video_tags(cursor, tag_rows, tag_ids)
+        total_rows += len(rows)
+        print(f"   Checked {total_rows:,} videos...", end='\r')
+
+    cursor.execute("SELECT COUNT(*) FROM videos")
+    inserted = cursor.fetchone()[0] - count_before
+    updated = video_changes - inserted
+
+    print(f"\n   Checked {total_rows:,} total videos")
+    print(f"   Inserted {inserted:,} new rows, updated {updated:,} changed rows, "
+          f"skipped {total_rows - inserted - updated:,} unchanged rows")
+    print(f"   Refreshed text of {text_changes - inserted:,} existing rows")
+    print(f"   Added {len(tag_ids) - tags_before:,} new tags")
+    return total_rows, inserted, updated
+
+
+def create_indexes(cursor):
+    """Create indexes for the dashboard's common query patterns."""
+    for idx_name in RETIRED_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {idx_name}")
+    for idx_name, idx_def in VIDEO_INDEXES:
         print(f"Creating index: {idx_name}")
         cursor.execute(f"CREATE INDEX IF NOT EXISTS {idx_name} ON {idx_def}")
-    
-    conn.commit()
-    
-    print("\n" + "="*80)
-    print("STEP 4: Database Statistics & Validation")
-    print("="*80)
-    
+
+
+def build_unique_videos(cursor):
+    """Rebuild unique_videos from the whole videos table."""
+    start = time.perf_counter()
+    cursor.execute("DELETE FROM unique_videos")
+    cursor.execute(UNIQUE_VIDEOS_SQL.format(source=UNIQUE_VIDEOS_SOURCES['full']))
+    cursor.execute("SELECT COUNT(*) FROM unique_videos")
+    print(f"   {'unique_videos':20s}: {cursor.fetchone()[0]:,} rows ({time.perf_counter() - start:.2f}s)")
+
+
+def build_summary_tables(cursor):
+    """(Re)build every SUMMARY_TABLES table from the current videos table."""
+    for table, select_sql in SUMMARY_TABLES.items():
+        start = time.perf_counter()
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(f"CREATE TABLE {table} AS {select_sql.format(where='')}")
+        if table != 'agg_overall_stats':
+            index_columns = SUMMARY_INDEX_COLUMNS.get(table, 'country')
+            cursor.execute(f"CREATE INDEX idx_{table}_country ON {table}({index_columns})")
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        print(f"   {table:20s}: {cursor.fetchone()[0]:,} rows ({time.perf_counter() - start:.2f}s)")
+
+
+def track_touched_videos(cursor):
+    """
+    Record every (video_id, country) an incremental upsert inserts or changes.
+
+    Temporary triggers on videos, video_text and video_tags fill the temporary
+    touched_videos table, which refresh_touched_videos() reads afterwards.
+    Updates skipped as unchanged by the upsert do not fire them. A trigger
+    takes over the conflict handling of the statement that fires it, so the
+    triggers skip known keys with NOT EXISTS rather than INSERT OR IGNORE.
+    """
+    cursor.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS touched_videos (
+            video_id TEXT,
+            country TEXT,
+            PRIMARY KEY (video_id, country)
+        ) WITHOUT ROWID
+    """)
+    for name, event in [('touched_videos_insert', 'INSERT ON videos'),
+                        ('touched_videos_update', 'UPDATE ON videos'),
+                        ('touched_video_text_update', 'UPDATE ON video_text'),
+                        ('touched_video_tags_insert', 'INSERT ON video_tags')]:
+        cursor.execute(f"""
+            CREATE TEMP TRIGGER IF NOT EXISTS {name} AFTER {event}
+            BEGIN
+                INSERT INTO touched_videos (video_id, country)
+                SELECT NEW.video_id, NEW.country
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM touched_videos
+                    WHERE video_id = NEW.video_id AND country = NEW.country
+                );
+            END
+        """)
+
+
+def refresh_touched_videos(cursor):
+    """
+    Bring unique_videos and the summary tables up to date after an upsert.
+
+    Only the unique_videos rows of touched videos are rebuilt, and only the
+    summary rows of the countries they trend in; agg_overall_stats is
+    re-added from agg_country_stats. Everything else is left as it is.
+
+    Returns:
+    int: Number of touched (video_id, country) keys
+    """
+    cursor.execute("SELECT COUNT(*) FROM touched_videos")
+    touched = cursor.fetchone()[0]
+    if not touched:
+        print("   No videos changed, summary tables are up to date")
+        return 0
+
+    cursor.execute("SELECT DISTINCT country FROM touched_videos")
+    countries = [row[0] for row in cursor.fetchall()]
+
+    start = time.perf_counter()
+    cursor.execute("""
+        DELETE FROM unique_videos
+        WHERE (video_id, country) IN (SELECT video_id, country FROM touched_videos)
+    """)
+    cursor.execute(UNIQUE_VIDEOS_SQL.format(source=UNIQUE_VIDEOS_SOURCES['touched']))
+    print(f"   {'unique_videos':20s}: {cursor.rowcount:,} rows refreshed ({time.perf_counter() - start:.2f}s)")
+
+    where = f"WHERE country IN ({', '.join('?' * len(countries))})"
+    for table, select_sql in SUMMARY_TABLES.items():
+        start = time.perf_counter()
+        if table == 'agg_overall_stats':
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(f"INSERT INTO {table} {select_sql}")
+        else:
+            cursor.execute(f"DELETE FROM {table} {where}", countries)
+            params = countries * select_sql.count('{where}')
+            cursor.execute(f"INSERT INTO {table} {select_sql.format(where=where)}", params)
+        print(f"   {table:20s}: {cursor.rowcount:,} rows refreshed ({time.perf_counter() - start:.2f}s)")
+    print(f"   Refreshed {len(countries)} touched countries: {', '.join(sorted(countries))}")
+    return touched
+
+
+def find_outdated_schema(db_path):
+    """
+    List the tables and columns of the current schema a database lacks.
+
+    An incremental run writes into the existing tables, so a database built
+    by an older version (before video_text or sample_key, say) has to be
+    rebuilt in full instead.
+
+    Returns:
+    list: Missing tables and table.column names; empty if the schema is current
+    """
+    conn = sqlite3.connect(Path(db_path).resolve().as_uri() + '?mode=ro', uri=True)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        tables = {row[0] for row in cursor.fetchall()}
+        required = ['categories', 'channel_stats', 'videos', 'video_text', 'tags',
+                    'video_tags', 'unique_videos', 'build_info', *SUMMARY_TABLES]
+        missing = [table for table in required if table not in tables]
+        for table, columns in [('videos', VIDEO_COLUMNS), ('video_text', VIDEO_TEXT_COLUMNS)]:
+            if table in tables:
+                cursor.execute(f"PRAGMA table_info({table})")
+                existing = {row[1] for row in cursor.fetchall()}
+                missing += [f"{table}.{column}" for column in columns if column not in existing]
+        return missing
+    finally:
+        conn.close()
+
+
+def stamp_data_version(cursor):
+    """
+    Record a new data version and build time in build_info.
+
+    db_utils keys its result cache on the data version, so stamping a new
+    one invalidates every cached result, in memory and on disk, once the
+    update is visible. Full builds always stamp one; incremental updates
+    only when they changed a row.
+
+    Returns:
+    str: The new data version
+    """
+    built_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+    data_version = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    cursor.executemany(
+        "INSERT OR REPLACE INTO build_info (key, value) VALUES (?, ?)",
+        [('data_version', data_version), ('built_at', built_at)],
+    )
+    print(f"   {'build_info':20s}: data version {data_version}")
+    return data_version
+
+
+def print_database_statistics(cursor):
+    """Print table row counts and a few sample validation queries."""
+
     # Get table counts
     tables_info = []
-    
+
     cursor.execute("SELECT COUNT(*) FROM categories")
     cat_count = cursor.fetchone()[0]
     tables_info.append(("categories", cat_count))
-    
+
     cursor.execute("SELECT COUNT(*) FROM channel_stats")
     channel_count = cursor.fetchone()[0]
     tables_info.append(("channel_stats", channel_count))
-    
+
     cursor.execute("SELECT COUNT(*) FROM videos")
     video_count = cursor.fetchone()[0]
     tables_info.append(("videos", video_count))
-    
+
+    cursor.execute("SELECT COUNT(*) FROM video_text")
+    text_count = cursor.fetchone()[0]
+    tables_info.append(("video_text", text_count))
+
+    cursor.execute("SELECT COUNT(*) FROM tags")
+    tag_count = cursor.fetchone()[0]
+    tables_info.append(("tags", tag_count))
+
+    cursor.execute("SELECT COUNT(*) FROM video_tags")
+    video_tag_count = cursor.fetchone()[0]
+    tables_info.append(("video_tags", video_tag_count))
+
+    cursor.execute("SELECT COUNT(*) FROM unique_videos")
+    unique_video_count = cursor.fetchone()[0]
+    tables_info.append(("unique_videos", unique_video_count))
+
     print("\nTable Row Counts:")
     for table, count in tables_info:
         print(f"   {table:20s}: {count:,} rows")
-    
+
     # Sample queries to validate
     print("\nSample Validation Queries:")
-    
+
     print("\n   1. Videos by Country:")
     cursor.execute("""
-        SELECT country, COUNT(*) as count 
-        FROM videos 
-        GROUP BY country 
+        SELECT country, COUNT(*) as count
+        FROM videos
+        GROUP BY country
         ORDER BY count DESC
     """)
     for row in cursor.fetchall():
         print(f"      {row[0]}: {row[1]:,} videos")
-    
+
     print("\n   2. Top 5 Categories by Video Count:")
     cursor.execute("""
         SELECT c.category_name, COUNT(*) as count
@@ -231,7 +1063,7 @@ def create_database():
     """)
     for row in cursor.fetchall():
         print(f"      {row[0]}: {row[1]:,} videos")
-    
+
     print("\n   3. Performance Class Distribution:")
     cursor.execute("""
         SELECT performance_class, COUNT(*) as count
@@ -241,10 +1073,10 @@ def create_database():
     """)
     for row in cursor.fetchall():
         print(f"      {row[0]}: {row[1]:,} videos")
-    
+
     print("\n   4. Data Date Range:")
     cursor.execute("""
-        SELECT 
+        SELECT
             MIN(trending_date) as earliest,
             MAX(trending_date) as latest
         FROM videos
@@ -252,21 +1084,465 @@ def create_database():
     earliest, latest = cursor.fetchone()
     print(f"      Earliest: {earliest}")
     print(f"      Latest: {latest}")
-    
-    conn.commit()
-    conn.close()
-    
+
+
+def validate_database(cursor):
+    """
+    Check that a freshly built or updated database is fit to serve.
+
+    Raises:
+    RuntimeError: If a table is empty, a video references an unknown
+        category, videos and video_text rows do not match one to one, a
+        video_tags row references an unknown tag, an expected index is
+        missing or the integrity check fails.
+    """
+    problems = []
+    row_counts = {}
+
+    for table in ('categories', 'channel_stats', 'videos', 'video_text', 'unique_videos'):
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        row_counts[table] = cursor.fetchone()[0]
+        if row_counts[table] == 0:
+            problems.append(f"table '{table}' is empty")
+
+    cursor.execute("PRAGMA foreign_key_check(videos)")
+    orphans = len(cursor.fetchall())
+    if orphans:
+        problems.append(f"{orphans:,} videos reference unknown categories")
+
+    # Every video_text row points at a videos row, so equal counts mean 1:1
+    cursor.execute("PRAGMA foreign_key_check(video_text)")
+    orphans = len(cursor.fetchall())
+    if orphans:
+        problems.append(f"{orphans:,} video_text rows have no videos row")
+    elif row_counts['videos'] != row_counts['video_text']:
+        problems.append(f"{row_counts['videos'] - row_counts['video_text']:,} videos have no video_text row")
+
+    cursor.execute("PRAGMA foreign_key_check(video_tags)")
+    orphans = len(cursor.fetchall())
+    if orphans:
+        problems.append(f"{orphans:,} video_tags rows reference unknown tags")
+
+    problems += find_missing_objects(cursor)
+
+    cursor.execute("PRAGMA quick_check")
+    result = cursor.fetchone()[0]
+    if result != 'ok':
+        problems.append(f"quick_check failed: {result}")
+
+    if problems:
+        raise RuntimeError("Database validation failed: " + "; ".join(problems))
+
+    print("\n   Validation passed")
+
+
+def find_missing_objects(cursor):
+    """
+    List the expected indexes and summary tables a database lacks.
+
+    Returns:
+    list: Problem descriptions; empty when nothing is missing
+    """
+    problems = []
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    existing_indexes = {row[0] for row in cursor.fetchall()}
+    missing = [idx_name for idx_name, _ in VIDEO_INDEXES if idx_name not in existing_indexes]
+    if missing:
+        problems.append(f"missing indexes: {', '.join(missing)}")
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    existing_tables = {row[0] for row in cursor.fetchall()}
+    missing = [table for table in SUMMARY_TABLES if table not in existing_tables]
+    if missing:
+        problems.append(f"missing summary tables: {', '.join(missing)}")
+
+    return problems
+
+
+# Checks of the rows an incremental update touched: (problem, SQL counting
+# the offending rows). They mirror the foreign key and one-to-one checks of
+# validate_database(). touched_videos has no statistics, so CROSS JOIN keeps
+# it the outer loop, and +v.country keeps idx_videos_country from standing
+# in for the primary key: each check is a few seeks per touched video.
+TOUCHED_VIDEO_CHECKS = [
+    ("touched videos rows reference unknown categories", """
+        SELECT COUNT(*)
+        FROM touched_videos t
+        CROSS JOIN videos v ON v.video_id = t.video_id AND +v.country = t.country
+        WHERE v.category_id IS NOT NULL
+            AND NOT EXISTS (SELECT 1 FROM categories c WHERE c.category_id = v.category_id)
+    """),
+    ("touched videos rows have no video_text row", """
+        SELECT COUNT(*)
+        FROM touched_videos t
+        CROSS JOIN videos v ON v.video_id = t.video_id AND +v.country = t.country
+        WHERE NOT EXISTS (
+            SELECT 1 FROM video_text vt
+            WHERE vt.video_id = v.video_id AND vt.trending_date = v.trending_date AND vt.country = v.country
+        )
+    """),
+    ("touched video_text rows have no videos row", """
+        SELECT COUNT(*)
+        FROM touched_videos t
+        CROSS JOIN video_text vt ON vt.video_id = t.video_id AND vt.country = t.country
+        WHERE NOT EXISTS (
+            SELECT 1 FROM videos v
+            WHERE v.video_id = vt.video_id AND v.trending_date = vt.trending_date AND v.country = vt.country
+        )
+    """),
+    ("touched video_tags rows reference unknown tags", """
+        SELECT COUNT(*)
+        FROM touched_videos t
+        CROSS JOIN video_tags vt ON vt.video_id = t.video_id AND vt.country = t.country
+        WHERE NOT EXISTS (SELECT 1 FROM tags g WHERE g.tag_id = vt.tag_id)
+    """),
+    ("touched videos have no unique_videos row", """
+        SELECT COUNT(*)
+        FROM touched_videos t
+        WHERE NOT EXISTS (
+            SELECT 1 FROM unique_videos u WHERE u.video_id = t.video_id AND u.country = t.country
+        )
+    """),
+]
+
+
+def validate_touched_videos(cursor):
+    """
+    Check an incrementally updated database, looking only at what changed.
+
+    The untouched rows passed validate_database() when they were loaded,
+    so only the (video_id, country) keys in touched_videos are checked,
+    along with the expected indexes and summary tables. The whole-file
+    quick_check is left to full builds.
+
+    Raises:
+    RuntimeError: If a table is empty, a touched row fails one of the
+        TOUCHED_VIDEO_CHECKS or an expected index or table is missing.
+    """
+    problems = []
+
+    for table in ('categories', 'channel_stats', 'videos', 'video_text', 'unique_videos'):
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table})")
+        if not cursor.fetchone()[0]:
+            problems.append(f"table '{table}' is empty")
+
+    for problem, count_sql in TOUCHED_VIDEO_CHECKS:
+        cursor.execute(count_sql)
+        count = cursor.fetchone()[0]
+        if count:
+            problems.append(f"{count:,} {problem}")
+
+    problems += find_missing_objects(cursor)
+
+    if problems:
+        raise RuntimeError("Database validation failed: " + "; ".join(problems))
+
+    cursor.execute("SELECT COUNT(*) FROM touched_videos")
+    print(f"\n   Validation passed ({cursor.fetchone()[0]:,} touched videos checked)")
+
+
+def remove_database_files(path):
+    """Delete a database file together with its journal/WAL side files."""
+    for suffix in ('', '-journal', '-wal', '-shm'):
+        file_path = Path(f"{path}{suffix}")
+        if file_path.exists():
+            os.remove(file_path)
+
+
+def get_page_size(path):
+    """Return the page size of an existing database file."""
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("PRAGMA page_size").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def publish_database(staging_path):
+    """
+    Swap a validated staging database in as the live database.
+
+    The first build simply renames the staging file into place. When a live
+    database already exists, dashboard sessions may hold connections to it,
+    so the file is never deleted or renamed underneath them. Instead the
+    staging pages are copied into it with the SQLite backup API, which
+    commits as one write transaction: WAL readers keep seeing the old
+    snapshot until their current read finishes and every later read sees
+    the new build.
+    """
+    if not DB_PATH.exists():
+        # Leftover side files would be replayed against the new file
+        remove_database_files(DB_PATH)
+        conn = sqlite3.connect(staging_path)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.close()
+        os.replace(staging_path, DB_PATH)
+        print(f"   Moved {staging_path.name} to {DB_PATH.name}")
+        return
+
+    source = sqlite3.connect(staging_path)
+    target = sqlite3.connect(DB_PATH, timeout=60)
+    try:
+        target.execute("PRAGMA journal_mode = WAL")
+        source.backup(target)
+        # Fold the copied pages back into the main file. PASSIVE never
+        # waits on readers still on the old snapshot; whatever they pin is
+        # checkpointed automatically later.
+        target.execute("PRAGMA wal_checkpoint(PASSIVE)")
+    finally:
+        source.close()
+        target.close()
+
+    remove_database_files(staging_path)
+    print(f"   Swapped {staging_path.name} into {DB_PATH.name}")
+
+
+def create_database(incremental=False, loader='fast', workers=None, parquet=False, prewarm=True):
+    """
+    Create SQLite database and tables from CSV files.
+
+    A full build is written to a staging file, validated and only then
+    published over the live database, so a running dashboard never sees a
+    missing or half-loaded database. The live database is kept in WAL mode
+    so its readers and the loader do not block each other.
+
+    Parameters:
+    incremental (bool): Upsert new and changed rows into the existing
+        database instead of rebuilding it. The whole update is one
+        transaction that is only committed after validation. The CSV is
+        still read in full, but unique_videos and the summary tables are
+        only refreshed for the videos and countries that changed, only
+        those rows are validated, and the data version (and with it the
+        result cache) is kept when nothing changed. Falls
+        back to a full build when no database exists yet or it lacks
+        tables or columns of the current schema.
+    loader (str): How a full build loads the videos table. 'fast' uses
+        relaxed journaling and a single transaction; 'to_sql' is the
+        original DataFrame.to_sql path, kept for comparison.
+    workers (int): CSV parser processes for the fast loader and incremental
+        upserts. Defaults to the number of CPUs; 1 parses in-process.
+    parquet (bool): After publishing, also export the database to the
+        Parquet snapshot in database/parquet (videos partitioned by country
+        and trending month). Requires pyarrow.
+    prewarm (bool): Finally run every dashboard page query once, so the
+        result cache is warm for the first visitor (see prewarm_cache.py).
+    """
+
+    print("="*80)
+    print("YOUTUBE TRENDS DATABASE SETUP")
+    print("="*80)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if incremental and not DB_PATH.exists():
+        print(f"\nNo existing database at {DB_PATH}, running a full build instead")
+        incremental = False
+
+    if incremental:
+        missing = find_outdated_schema(DB_PATH)
+        if missing:
+            print(f"\nExisting database {DB_PATH} predates the current schema "
+                  f"(missing {', '.join(missing)}), running a full build instead")
+            incremental = False
+
+    # Create database directory if it doesn't exist
+    DB_PATH.parent.mkdir(exist_ok=True)
+
+    if incremental:
+        print(f"\nUpdating existing database: {DB_PATH}")
+        build_path = DB_PATH
+    else:
+        # Remove a staging file left behind by a failed build
+        remove_database_files(STAGING_DB_PATH)
+        print(f"\nCreating new database in staging file: {STAGING_DB_PATH}")
+        build_path = STAGING_DB_PATH
+
+    # Connect to database
+    conn = sqlite3.connect(build_path, timeout=60)
+    cursor = conn.cursor()
+
+    if incremental:
+        cursor.execute("PRAGMA journal_mode = WAL")
+    elif DB_PATH.exists():
+        # Copying into a WAL database requires matching page sizes
+        cursor.execute("PRAGMA page_size = " + str(get_page_size(DB_PATH)))
+
+    # Enable foreign keys
+    cursor.execute("PRAGMA foreign_keys = ON")
+
+    bulk_load = not incremental and loader == 'fast'
+    if bulk_load:
+        saved_pragmas = begin_bulk_load(cursor)
+
+    try:
+        print("\n" + "="*80)
+        print("STEP 1: Creating Tables")
+        print("="*80)
+
+        create_tables(cursor)
+
+        print("\n" + "="*80)
+        print("STEP 2: Loading Data from CSV Files")
+        print("="*80)
+
+        categories_df, channel_stats_df = read_reference_data()
+
+        if incremental:
+            print("\nRefreshing categories and channel statistics...")
+            changes_before = conn.total_changes
+            upsert_reference_tables(conn, categories_df, channel_stats_df)
+            reference_changes = conn.total_changes - changes_before
+
+            print("\nUpserting video data...")
+            track_touched_videos(cursor)
+            upsert_videos(conn, workers)
+        else:
+            conn.commit()
+
+            print("\nLoading categories...")
+            categories_df.to_sql('categories', conn, if_exists='append', index=False)
+            print(f"   Loaded {len(categories_df)} unique categories")
+
+            print("\nLoading channel statistics...")
+            channel_stats_df.to_sql('channel_stats', conn, if_exists='append', index=False)
+            print(f"   Loaded {len(channel_stats_df):,} unique channels")
+
+            print(f"\nLoading video data with the '{loader}' loader (this may take a minute)...")
+            if bulk_load:
+                load_videos_fast(conn, workers)
+            else:
+                load_videos(conn)
+
+        print("\n" + "="*80)
+        print("STEP 3: Creating Indexes for Query Performance")
+        print("="*80)
+
+        # Indexes already exist on an incremental run and were maintained by
+        # the upsert; IF NOT EXISTS makes this a no-op for them.
+        start = time.perf_counter()
+        create_indexes(cursor)
+        print(f"   Built {len(VIDEO_INDEXES)} indexes in {time.perf_counter() - start:.1f}s")
+
+        print("\n" + "="*80)
+        print("STEP 4: Building Summary Tables")
+        print("="*80 + "\n")
+
+        if incremental:
+            touched = refresh_touched_videos(cursor)
+        else:
+            build_unique_videos(cursor)
+            build_summary_tables(cursor)
+
+        if not incremental or touched or reference_changes:
+            stamp_data_version(cursor)
+        else:
+            # A new version would drop every cached result for nothing
+            print(f"   {'build_info':20s}: nothing changed, keeping the data version")
+
+        if bulk_load:
+            # Pragmas cannot change inside a transaction; the staging file is
+            # discarded on failure anyway, so committing early is safe here
+            conn.commit()
+            end_bulk_load(cursor, saved_pragmas)
+
+        print("\n" + "="*80)
+        print("STEP 5: Database Statistics & Validation")
+        print("="*80)
+
+        # Statistics and a full validation read the whole database; an
+        # incremental update only checks the rows it touched
+        if incremental:
+            validate_touched_videos(cursor)
+        else:
+            print_database_statistics(cursor)
+            validate_database(cursor)
+
+        conn.commit()
+    except Exception:
+        # An incremental update is rolled back as a whole; a failed full
+        # build leaves the live database untouched.
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    if not incremental:
+        print("\n" + "="*80)
+        print("STEP 6: Publishing Database")
+        print("="*80 + "\n")
+
+        publish_database(STAGING_DB_PATH)
+
+    if parquet:
+        print("\n" + "="*80)
+        print("STEP 7: Exporting Parquet Snapshot")
+        print("="*80 + "\n")
+
+        # pyarrow is only needed for the snapshot
+        from database.parquet_snapshot import export_snapshot
+        export_snapshot(DB_PATH)
+
+    if prewarm:
+        print("\n" + "="*80)
+        print("STEP 8: Prewarming Result Cache")
+        print("="*80 + "\n")
+
+        # The database is already published; a cold cache only costs the
+        # first visitor time, so a failure here does not fail the build
+        try:
+            # Silence st.cache_data's "No runtime found" warnings before
+            # db_utils is imported, so the per-query timings stay readable
+            from streamlit.logger import set_log_level
+            set_log_level('error')
+            from database.prewarm_cache import prewarm_cache
+            prewarm_cache(DB_PATH)
+        except Exception as e:
+            print(f"   WARNING: prewarming failed, the cache will fill on first use: {e}")
+
     print("\n" + "="*80)
-    print("DATABASE SETUP COMPLETE!")
+    print("DATABASE UPDATE COMPLETE!" if incremental else "DATABASE SETUP COMPLETE!")
     print("="*80)
     print(f"\nDatabase location: {DB_PATH}")
     print(f"Database size: {DB_PATH.stat().st_size / 1024 / 1024:.2f} MB")
     print("\nReady for Streamlit dashboard queries!")
     print("="*80)
 
+
+def parse_args():
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="Build the YouTube trends SQLite database.")
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help="upsert new and changed rows into the existing database instead of rebuilding it"
+    )
+    parser.add_argument(
+        '--loader', choices=LOADERS, default='fast',
+        help="video loader for full builds (default: %(default)s)"
+    )
+    parser.add_argument(
+        '--workers', type=int, default=None,
+        help="CSV parser processes (default: number of CPUs)"
+    )
+    parser.add_argument(
+        '--parquet', action='store_true',
+        help="also export the database to a Parquet snapshot (videos partitioned by country and month)"
+    )
+    parser.add_argument(
+        '--no-prewarm', dest='prewarm', action='store_false',
+        help="do not fill the dashboard's result cache after the build"
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        create_database()
+        create_database(
+            incremental=args.incremental, loader=args.loader,
+            workers=args.workers, parquet=args.parquet, prewarm=args.prewarm
+        )
     except Exception as e:
         print(f"\nERROR: {e}")
         import traceback
@@ -1,12 +1,33 @@
 """
 Database utility functions for YouTube Trends Streamlit Dashboard
-Handles SQLite connections and cached data queries
+Handles database connections and cached data queries
+
+Queries run on SQLite by default, or on DuckDB over the Parquet snapshot
+when YT_TRENDS_BACKEND=duckdb (see backends.py). Results are cached in
+memory and on disk until the next database build (see result_cache.py).
+Every call to a cached query function is timed and logged (see
+diagnostics.py).
 """
 
-import sqlite3
+import contextvars
+import functools
+import hashlib
+import inspect
+import os
+import random
+import threading
+import time
+import numpy as np
 import pandas as pd
 import streamlit as st
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from database.backends import BACKEND_ENV_VAR, DEFAULT_BACKEND, POOL_SIZE, DuckDBBackend, SQLiteBackend
+from database.create_database import SAMPLE_KEY_RANGE
+from database import diagnostics
+from database.result_cache import get_result_cache
 
 
 def get_db_path():
@@ -16,31 +37,642 @@ def get_db_path():
     return str(db_path)
 
 
-@st.cache_data(ttl=3600)
+def get_snapshot_path():
+    """Get Parquet snapshot directory relative to this file"""
+    current_dir = Path(__file__).parent
+    snapshot_path = current_dir.parent / 'database' / 'parquet'
+    return str(snapshot_path)
+
+
+def get_backend():
+    """
+    Get the query backend selected by the YT_TRENDS_BACKEND environment
+    variable: 'sqlite' (default) or 'duckdb'.
+    """
+    name = os.environ.get(BACKEND_ENV_VAR, DEFAULT_BACKEND).lower()
+    if name == 'sqlite':
+        return SQLiteBackend(get_db_path())
+    if name == 'duckdb':
+        return DuckDBBackend(get_snapshot_path())
+    raise ValueError(f"{BACKEND_ENV_VAR} must be 'sqlite' or 'duckdb', not '{name}'")
+
+
+def get_connection():
+    """
+    Open a read-only connection on the configured backend.
+
+    On SQLite the connection comes from a process-wide pool and close()
+    returns it there. The path is resolved on every call and the pool
+    reopens connections when the file is replaced, so a rebuild published
+    by create_database.py is picked up by the next query without
+    restarting the app.
+    """
+    return get_backend().connect()
+
+
+def has_tables(conn, *tables):
+    """
+    Check whether all of the given tables exist in the database.
+
+    Used to prefer the agg_* summary tables built by create_database.py and
+    fall back to scanning videos when a database predates them (or when
+    the DuckDB backend reads the Parquet snapshot, which has none).
+    """
+    return get_backend().has_tables(conn, tables)
+
+
+def get_connection_stats():
+    """
+    Get connection reuse statistics for the SQLite backend.
+
+    Returns:
+    dict: opened, reused, discarded and idle connection counts, the mean
+        time to open one and the estimated latency saved by reuse, or None
+        on a backend without a connection pool
+    """
+    backend = get_backend()
+    if not hasattr(backend, 'pool_stats'):
+        return None
+    return backend.pool_stats()
+
+
+def read_query(query, conn, params=None):
+    """Run a query on the configured backend and return a DataFrame."""
+    return get_backend().read_sql(conn, query, params)
+
+
+def read_numeric_query(query, conn, params=None):
+    """
+    Run a query whose columns are all numeric and return float64 columns.
+
+    Faster than read_query for full-table reads; integer columns come back
+    as floats.
+    """
+    return get_backend().read_numeric(conn, query, params)
+
+
+def iter_numeric_query(query, conn, params=None):
+    """
+    Run a query whose columns are all numeric and yield its rows as
+    float64 arrays of a bounded number of rows (NULLs become NaN).
+    """
+    return get_backend().iter_numeric(conn, query, params)
+
+
+class QueryFilters:
+    """
+    Build a WHERE clause whose values are bound as parameters.
+
+    The SQL text depends only on which filters are set and how many values
+    each has, never on the values themselves, so repeated queries reuse the
+    prepared statement in the connection's statement cache. Values are
+    de-duplicated and sorted, which also keeps the parameter order stable.
+
+    Example:
+        filters = QueryFilters()
+        filters.add_in('country', ['US', 'CA'])
+        filters.where()   # "WHERE country IN (?, ?)"
+        filters.params    # ['CA', 'US']
+    """
+
+    def __init__(self):
+        self.clauses = []
+        self.params = []
+
+    def add(self, clause, *params):
+        """Add a condition with its own '?' placeholders."""
+        self.clauses.append(clause)
+        self.params.extend(params)
+        return self
+
+    def add_in(self, column, values):
+        """Add 'column IN (...)' for the given values; no-op when empty."""
+        if values:
+            values = sorted(set(values))
+            placeholders = ", ".join("?" for _ in values)
+            self.add(f"{column} IN ({placeholders})", *values)
+        return self
+
+    def where(self, keyword="WHERE"):
+        """Return the combined conditions, prefixed by keyword, or ''."""
+        if not self.clauses:
+            return ""
+        return f"{keyword} " + " AND ".join(self.clauses)
+
+
+# List arguments that filter rows and whose order does not matter
+FILTER_ARGUMENTS = ('countries', 'categories')
+
+
+def normalize_filters(func):
+    """
+    Sort the list filter arguments before they reach the cache.
+
+    The result cache keys on the exact arguments, so ['US', 'CA'] and
+    ['CA', 'US'] would be cached and queried separately. Place this above
+    @cached_query so every order of the same filter shares one entry.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        for name in FILTER_ARGUMENTS:
+            values = bound.arguments.get(name)
+            if values:
+                bound.arguments[name] = sorted(set(values))
+        return func(*bound.args, **bound.kwargs)
+
+    wrapper.clear = func.clear
+    return wrapper
+
+
+def unindexed(column):
+    """
+    Reference a column so SQLite will not pick an index for it (unary +).
+
+    Used where a filter column has its own index but the query should keep
+    the index that matches its ORDER BY. DuckDB has no indexes and rejects
+    unary + on text, so the column is returned unchanged there.
+    """
+    return column if get_backend().name == 'duckdb' else f"+{column}"
+
+
+# performance_class values, in the order stratified samples list them.
+# The cleaning step gives every video one of them.
+PERFORMANCE_CLASSES = ['Explosive', 'High-Performing', 'Standard Trending']
+
+
+def sample_videos(conn, columns, countries, performance_classes, sample_size):
+    """
+    Read a random sample of the videos rows of some countries and classes.
+
+    Every row carries a fixed pseudo-random sample_key (see
+    create_database.py), so the sample_size matching rows whose keys follow
+    a random start key, wrapping around to the bottom of the key range when
+    the top runs out, are a random sample. On SQLite each (country,
+    performance_class) stratum is one key range of idx_videos_sample_country
+    (idx_videos_sample_class when all countries are sampled):
+
+        1. One statement seeks every stratum at the start key and reads up
+           to sample_size keys of each from the index alone; a second one
+           continues from the bottom of the strata that ran out
+        2. The sample_size-th nearest of those keys bounds the sample, and
+           the rows up to it are read by range, in one statement or two
+           when the bound wraps around
+
+    Nothing is sorted and only the sampled rows are read from the table,
+    however many rows match. DuckDB has no indexes and takes the nearest
+    keys with one top-N query.
+
+    Parameters:
+    conn: Open connection from get_connection()
+    columns (list): videos columns to return
+    countries (list): Countries to sample; all when None or empty
+    performance_classes (list): Classes to sample; all of
+        PERFORMANCE_CLASSES when None or empty
+    sample_size (int): Number of rows to return (fewer if fewer match)
+
+    Returns:
+    DataFrame: The sampled rows, in key order from the start key
+    """
+    start_key = random.randrange(SAMPLE_KEY_RANGE)
+    sample_size = int(sample_size)
+    if sample_size <= 0:
+        return pd.DataFrame(columns=columns)
+    classes = performance_classes or PERFORMANCE_CLASSES
+    filters = QueryFilters().add_in('country', countries).add_in('performance_class', classes)
+
+    if get_backend().name == 'duckdb':
+        query = f"""
+            SELECT {', '.join(columns)}
+            FROM videos
+            {filters.where()}
+            ORDER BY sample_key < ?, sample_key
+            LIMIT ?
+        """
+        return read_query(query, conn, params=[*filters.params, start_key, sample_size])
+
+    strata = [
+        QueryFilters().add_in('country', [country] if country else None).add("performance_class = ?", performance_class)
+        for country in sorted(set(countries or [None]), key=str)
+        for performance_class in sorted(set(classes))
+    ]
+    keys = []
+    # Only strata with fewer than sample_size keys above the start key wrap around
+    for key_range in ("sample_key >= ?", "sample_key < ?"):
+        if not strata:
+            break
+        keys_query = "\nUNION ALL\n".join(f"""
+            SELECT * FROM (
+                SELECT {i} as stratum, sample_key FROM videos
+                WHERE {key_range} {stratum.where("AND")}
+                ORDER BY sample_key
+                LIMIT ?
+            )""" for i, stratum in enumerate(strata))
+        params = [value for stratum in strata for value in (start_key, *stratum.params, sample_size)]
+        found = read_numeric_query(keys_query, conn, params=params)
+        keys.append(found['sample_key'].to_numpy(dtype=np.int64))
+        counts = found['stratum'].value_counts()
+        strata = [stratum for i, stratum in enumerate(strata) if counts.get(i, 0) < sample_size]
+    distances = (np.concatenate(keys) - start_key) % SAMPLE_KEY_RANGE
+    if len(distances) >= sample_size:
+        bound = int(np.partition(distances, sample_size - 1)[sample_size - 1])
+    else:
+        bound = SAMPLE_KEY_RANGE - 1
+
+    end_key = start_key + bound
+    key_ranges = [(start_key, min(end_key, SAMPLE_KEY_RANGE - 1))]
+    if end_key >= SAMPLE_KEY_RANGE:
+        key_ranges.append((0, end_key - SAMPLE_KEY_RANGE))
+    query = f"""
+        SELECT {', '.join(columns)}, sample_key
+        FROM videos
+        WHERE sample_key BETWEEN ? AND ? {filters.where("AND")}
+    """
+    df = pd.concat([
+        read_query(query, conn, params=[low, high, *filters.params])
+        for low, high in key_ranges
+    ], ignore_index=True)
+
+    # Rows sharing the bounding key can push the count past sample_size
+    df['distance'] = (df['sample_key'].astype(np.int64) - start_key) % SAMPLE_KEY_RANGE
+    df = df.sort_values('distance', kind='stable').head(sample_size)
+    return df[columns].reset_index(drop=True)
+
+
+def bin_index(value):
+    """
+    SQL for the 0-based histogram bin of value, with '?' placeholders for
+    the lower edge, bin width and number of bins, in that order. Values at
+    the upper edge fall in the last bin, as in numpy.histogram.
+
+    SQLite's CAST truncates, which is the floor for the non-negative
+    offsets used here; DuckDB's CAST rounds, so it floors first, and it
+    spells the two-argument MIN() as LEAST().
+    """
+    if get_backend().name == 'duckdb':
+        return f"LEAST(CAST(FLOOR(({value} - ?) / ?) AS INTEGER), ? - 1)"
+    return f"MIN(CAST(({value} - ?) / ? AS INTEGER), ? - 1)"
+
+
+def histogram(conn, column, filters, bins, value_range=None):
+    """
+    Bin a videos column in the database and summarize it.
+
+    Only the per-bin counts leave the database. The median is exact: the
+    bin counts locate the bin holding the middle rows, and only that bin's
+    rows are sorted to find them.
+
+    Parameters:
+    conn: Open connection from get_connection()
+    column (str): Numeric videos column; trusted SQL, not user input
+    filters (QueryFilters): Row filters; the range condition is added to them
+    bins (int): Number of equal-width bins
+    value_range (tuple): (lower, upper) values to include, inclusive;
+        the column's minimum and maximum when None
+
+    Returns:
+    dict: 'edges' (bins + 1 floats), 'counts' (bins ints), 'count', 'mean',
+        'median', 'min' and 'max' of the values in range; empty arrays and
+        NaN statistics when no rows match
+    """
+    bins = int(bins)
+    if value_range is None:
+        filters.add(f"{column} IS NOT NULL")
+    else:
+        filters.add(f"{column} BETWEEN ? AND ?", *value_range)
+    where_clause = filters.where()
+
+    stats_query = f"""
+        SELECT COUNT({column}) as count, TOTAL({column}) as total, MIN({column}) as min, MAX({column}) as max
+        FROM videos
+        {where_clause}
+    """
+    stats = read_numeric_query(stats_query, conn, params=filters.params).iloc[0]
+    count = int(stats['count'])
+    if not count:
+        return {
+            'edges': np.array([]), 'counts': np.array([], dtype=np.int64), 'count': 0,
+            'mean': np.nan, 'median': np.nan, 'min': np.nan, 'max': np.nan,
+        }
+
+    lower, upper = value_range if value_range is not None else (stats['min'], stats['max'])
+    if upper == lower:
+        # A single value: widen the range by half a unit each way, as numpy.histogram does
+        lower, upper = lower - 0.5, upper + 0.5
+    width = (upper - lower) / bins
+    edges = lower + width * np.arange(bins + 1)
+    edges[-1] = upper
+    bin_params = [lower, width, bins]
+
+    counts_query = f"""
+        SELECT {bin_index(column)} as bin, COUNT(*) as count
+        FROM videos
+        {where_clause}
+        GROUP BY bin
+    """
+    binned = read_numeric_query(counts_query, conn, params=[*bin_params, *filters.params])
+    counts = np.zeros(bins, dtype=np.int64)
+    counts[binned['bin'].to_numpy(dtype=np.int64)] = binned['count'].to_numpy(dtype=np.int64)
+
+    # Middle order statistics (one, or two to average), each read from the
+    # bin that holds it. The range condition is widened by a bin on each side
+    # against rounding at the edges. SQLite seeks an index on the column only
+    # when the filters do not offer it a better one (see unindexed).
+    median_query = f"""
+        SELECT {column}
+        FROM videos
+        WHERE {column} BETWEEN ? AND ? AND {bin_index(column)} = ? {filters.where("AND")}
+        ORDER BY {column}
+        LIMIT 1 OFFSET ?
+    """
+    cumulative = np.cumsum(counts)
+    middle = []
+    for rank in sorted({(count - 1) // 2, count // 2}):
+        index = int(np.searchsorted(cumulative, rank, side='right'))
+        before = int(cumulative[index - 1]) if index else 0
+        params = [edges[max(index - 1, 0)], edges[min(index + 2, bins)],
+                  *bin_params, index, *filters.params, rank - before]
+        middle.append(read_numeric_query(median_query, conn, params=params).iat[0, 0])
+
+    return {
+        'edges': edges,
+        'counts': counts,
+        'count': count,
+        'mean': float(stats['total'] / count),
+        'median': float(np.mean(middle)),
+        'min': float(stats['min']),
+        'max': float(stats['max']),
+    }
+
+
+# ============================================================================
+# RESULT CACHE
+# ============================================================================
+
+# Calls kept in memory per cached function; the disk cache holds the rest
+MEMORY_CACHE_ENTRIES = 256
+
+# ((backend, file version), data version) last read from the database
+_data_version = (None, None)
+_data_version_lock = threading.Lock()
+
+# In-memory layer of every cached_query function
+_memory_caches = []
+
+
+def get_data_version():
+    """
+    Get the data version create_database.py stamped into the database.
+
+    build_info is only re-read when the database files change, so a call
+    costs a stat(). Databases built before build_info are versioned by the
+    state of their files instead. When the version changes, every cached
+    result of the old version is dropped from memory and from disk.
+    """
+    global _data_version
+    backend = get_backend()
+    file_version = (backend.name, backend.file_version())
+    seen_file_version, data_version = _data_version
+    if file_version == seen_file_version:
+        return data_version
+
+    conn = get_connection()
+    data_version = None
+    if has_tables(conn, 'build_info'):
+        df = read_query("SELECT value FROM build_info WHERE key = ?", conn, params=['data_version'])
+        if not df.empty:
+            data_version = str(df.iloc[0, 0])
+    conn.close()
+    if data_version is None:
+        data_version = 'files-' + hashlib.blake2b(repr(file_version).encode(), digest_size=8).hexdigest()
+
+    with _data_version_lock:
+        previous = _data_version[1]
+        _data_version = (file_version, data_version)
+    if data_version != previous:
+        for memory in _memory_caches:
+            memory.clear()
+        diagnostics.clear_plans()
+        disk_cache = get_result_cache()
+        if disk_cache is not None:
+            disk_cache.purge_versions(keep=data_version)
+    return data_version
+
+
+def cached_query(func):
+    """
+    Cache a query function's results in memory and on disk.
+
+    Results are keyed on the function, its arguments (defaults applied) and
+    the data version, and stay valid until create_database.py stamps a new
+    version; nothing expires on a timer. Repeat calls in this process are
+    served by st.cache_data. Misses there fall through to the disk cache,
+    which survives restarts and is shared by every replica that uses the
+    same cache directory. Place below @normalize_filters.
+
+    Every call is recorded by diagnostics.py with the layer that answered
+    it: 'memory', 'disk', or 'miss' when the function body ran.
+    """
+    name = func.__name__
+    signature = inspect.signature(func)
+    # An edited function must not be served results of its old code
+    source_digest = hashlib.blake2b(inspect.getsource(func).encode(), digest_size=8).hexdigest()
+
+    def compute(*args, **kwargs):
+        record = diagnostics.current_call()
+        result = func(*args, **kwargs)
+        if record is not None:
+            record.cache = 'miss'
+            record.result_bytes = diagnostics.result_nbytes(result)
+        return result
+
+    @functools.wraps(func)
+    def load(*args, **kwargs):
+        record = diagnostics.current_call()
+        if record is not None:
+            record.cache = 'disk'
+        disk_cache = get_result_cache()
+        if disk_cache is None:
+            return compute(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (name, source_digest, get_backend().name, tuple(bound.arguments.items()))
+        return disk_cache.get_or_compute(get_data_version(), name, key, lambda: compute(*args, **kwargs))
+
+    memory = st.cache_data(max_entries=MEMORY_CACHE_ENTRIES)(load)
+    _memory_caches.append(memory)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        record, token = diagnostics.start_call(name, bound.arguments, get_backend().name)
+        try:
+            # Drops the memory layer first if the database was rebuilt
+            get_data_version()
+            return memory(*args, **kwargs)
+        finally:
+            diagnostics.finish_call(record, token, time.perf_counter() - start)
+
+    def clear():
+        memory.clear()
+        disk_cache = get_result_cache()
+        if disk_cache is not None:
+            disk_cache.clear(name)
+
+    wrapper.clear = clear
+    return wrapper
+
+
+def get_result_cache_stats():
+    """
+    Get statistics of the on-disk result cache.
+
+    Returns:
+    dict: Entry count, bytes used and cap, and hit, miss, write and
+        eviction counts for this process, or None when the disk cache is
+        turned off (YT_TRENDS_CACHE_MB=0)
+    """
+    disk_cache = get_result_cache()
+    if disk_cache is None:
+        return None
+    return disk_cache.stats()
+
+
+# ============================================================================
+# CONCURRENT QUERIES
+# ============================================================================
+
+# Worker threads shared by every session; one per pooled connection, so
+# concurrent queries never open connections the pool would have to close
+QUERY_WORKERS = POOL_SIZE
+
+_query_executor = None
+_query_executor_lock = threading.Lock()
+_query_worker = threading.local()
+
+
+def get_query_executor():
+    """Get the process-wide thread pool that runs concurrent queries."""
+    global _query_executor
+    with _query_executor_lock:
+        if _query_executor is None:
+            _query_executor = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix='yt-query')
+        return _query_executor
+
+
+def _run_in_worker(request, ctx, context):
+    """
+    Run one request on a worker thread with the caller's script context,
+    and inside a copy of its contextvars so diagnostics attribute the
+    request's statements to the caller's call.
+    """
+    thread = threading.current_thread()
+    add_script_run_ctx(thread, ctx)
+    _query_worker.active = True
+    try:
+        return context.run(request)
+    finally:
+        _query_worker.active = False
+        add_script_run_ctx(thread, None)
+
+
+def submit_queries(requests):
+    """
+    Start independent query requests on the shared worker threads.
+
+    Each request is a zero-argument callable, usually a cached db_utils
+    function with its arguments bound by functools.partial. Every worker
+    checks out its own connection, so on SQLite the requests run as
+    concurrent readers of the database file; the sqlite3 module and DuckDB
+    both release the GIL while a query executes. Workers inherit the
+    calling script's context, so st.cache_data hits and fills the same
+    cache as a call from the page.
+
+    A request that is itself running on a worker thread (a bundle that
+    fans out its own queries) runs its requests inline instead, so workers
+    never wait on each other and the pool cannot deadlock.
+
+    Parameters:
+    requests (dict): Request name -> zero-argument callable
+
+    Returns:
+    dict: Request name -> concurrent.futures.Future of its result
+    """
+    if getattr(_query_worker, 'active', False):
+        futures = {}
+        for name, request in requests.items():
+            futures[name] = Future()
+            try:
+                futures[name].set_result(request())
+            except Exception as exc:
+                futures[name].set_exception(exc)
+        return futures
+
+    executor = get_query_executor()
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return {
+        name: executor.submit(_run_in_worker, request, ctx, contextvars.copy_context())
+        for name, request in requests.items()
+    }
+
+
+def run_queries(requests):
+    """
+    Run independent query requests concurrently.
+
+    Results are yielded as each request finishes rather than in the order
+    given, so the total wait is set by the slowest request instead of the
+    sum of all of them. An exception raised by a request is re-raised when
+    its result is reached.
+
+    Example:
+        results = dict(run_queries({
+            'heatmap': functools.partial(get_publishing_time_heatmap, countries),
+            'channels': functools.partial(get_top_channels, countries, top_n=20),
+        }))
+
+    Parameters:
+    requests (dict): Request name -> zero-argument callable
+
+    Yields:
+    tuple: (request name, result)
+    """
+    futures = submit_queries(requests)
+    names = {future: name for name, future in futures.items()}
+    for future in as_completed(names):
+        yield names[future], future.result()
+
+
+@cached_query
 def get_all_countries():
     """Get list of all countries in database"""
-    conn = sqlite3.connect(get_db_path())
+    conn = get_connection()
     query = "SELECT DISTINCT country FROM videos ORDER BY country"
-    countries = pd.read_sql_query(query, conn)['country'].tolist()
+    countries = read_query(query, conn)['country'].tolist()
     conn.close()
     return countries
 
 
-@st.cache_data(ttl=3600)
+@cached_query
 def get_all_categories():
     """Get all categories from database"""
-    conn = sqlite3.connect(get_db_path())
+    conn = get_connection()
     query = """
         SELECT category_id, category_name 
         FROM categories 
         ORDER BY category_name
     """
-    categories = pd.read_sql_query(query, conn)
+    categories = read_query(query, conn)
     conn.close()
     return categories
 
 
-@st.cache_data(ttl=3600)
+@normalize_filters
+@cached_query
 def get_country_stats(countries=None):
     """
     Get aggregated statistics by country
@@ -51,32 +683,44 @@ def get_country_stats(countries=None):
     Returns:
     DataFrame: Country-level statistics
     """
-    conn = sqlite3.connect(get_db_path())
-    
-    where_clause = ""
-    if countries:
-        country_list = "','".join(countries)
-        where_clause = f"WHERE country IN ('{country_list}')"
-    
-    query = f"""
-        SELECT 
-            country,
-            COUNT(DISTINCT video_id) as video_count,
-            AVG(views) as avg_views,
-            AVG(engagement_rate) as avg_engagement,
-            AVG(days_to_trending) as avg_days_to_trending
-        FROM videos
-        {where_clause}
-        GROUP BY country
-        ORDER BY video_count DESC
-    """
-    
-    df = pd.read_sql_query(query, conn)
+    conn = get_connection()
+    
+    filters = QueryFilters().add_in('country', countries)
+    where_clause = filters.where()
+    
+    if has_tables(conn, 'agg_country_stats'):
+        query = f"""
+            SELECT
+                country,
+                video_count,
+                views_sum / views_n as avg_views,
+                engagement_sum / engagement_n as avg_engagement,
+                days_sum / days_n as avg_days_to_trending
+            FROM agg_country_stats
+            {where_clause}
+            ORDER BY video_count DESC
+        """
+    else:
+        query = f"""
+            SELECT 
+                country,
+                COUNT(DISTINCT video_id) as video_count,
+                AVG(views) as avg_views,
+                AVG(engagement_rate) as avg_engagement,
+                AVG(days_to_trending) as avg_days_to_trending
+            FROM videos
+            {where_clause}
+            GROUP BY country
+            ORDER BY video_count DESC
+        """
+    
+    df = read_query(query, conn, params=filters.params)
     conn.close()
     return df
 
 
-@st.cache_data(ttl=3600)
+@normalize_filters
+@cached_query
 def get_category_stats(countries=None, categories=None):
     """
     Get aggregated statistics by category
@@ -88,38 +732,58 @@ def get_category_stats(countries=None, categories=None):
     Returns:
     DataFrame: Category-level statistics
     """
-    conn = sqlite3.connect(get_db_path())
-    
-    where_clauses = []
-    if countries:
-        country_list = "','".join(countries)
-        where_clauses.append(f"v.country IN ('{country_list}')")
-    if categories:
-        category_list = "','".join([cat.replace("'", "''") for cat in categories])
-        where_clauses.append(f"c.category_name IN ('{category_list}')")
-    
-    where_clause = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
-    
-    query = f"""
-        SELECT 
-            c.category_name,
-            COUNT(v.video_id) as video_count,
-            AVG(v.views) as avg_views,
-            CAST(AVG(v.engagement_rate) as REAL) as avg_engagement,
-            AVG(v.like_ratio) as avg_like_ratio
-        FROM videos v
-        JOIN categories c ON v.category_id = c.category_id
-        {where_clause}
-        GROUP BY c.category_name
-        ORDER BY avg_views DESC
-    """
-    
-    df = pd.read_sql_query(query, conn)
+    conn = get_connection()
+    use_summary = has_tables(conn, 'agg_category_stats')
+    table_alias = "a" if use_summary else "v"
+    
+    filters = QueryFilters()
+    filters.add_in(f"{table_alias}.country", countries)
+    filters.add_in("c.category_name", categories)
+    where_clause = filters.where()
+    
+    if use_summary:
+        query = f"""
+            SELECT
+                c.category_name,
+                SUM(a.video_count) as video_count,
+                SUM(a.views_sum) / SUM(a.views_n) as avg_views,
+                SUM(a.engagement_sum) / SUM(a.engagement_n) as avg_engagement,
+                SUM(a.like_ratio_sum) / SUM(a.like_ratio_n) as avg_like_ratio
+            FROM agg_category_stats a
+            JOIN categories c ON a.category_id = c.category_id
+            {where_clause}
+            GROUP BY c.category_name
+            ORDER BY avg_views DESC
+        """
+    else:
+        query = f"""
+            SELECT 
+                c.category_name,
+                COUNT(v.video_id) as video_count,
+                AVG(v.views) as avg_views,
+                CAST(AVG(v.engagement_rate) as DOUBLE) as avg_engagement,
+                AVG(v.like_ratio) as avg_like_ratio
+            FROM videos v
+            JOIN categories c ON v.category_id = c.category_id
+            {where_clause}
+            GROUP BY c.category_name
+            ORDER BY avg_views DESC
+        """
+    
+    df = read_query(query, conn, params=filters.params)
     conn.close()
     return df
 
 
-@st.cache_data(ttl=3600)
+# Columns of the correlation matrix, as returned by get_correlation_data
+CORRELATION_COLUMNS = [
+    'views', 'likes', 'dislikes', 'comment_count',
+    'engagement_rate', 'like_ratio', 'title_length', 'tag_count',
+]
+
+
+@normalize_filters
+@cached_query
 def get_correlation_data(countries=None):
     """
     Get data for correlation matrix
@@ -130,12 +794,10 @@ def get_correlation_data(countries=None):
     Returns:
     DataFrame: Correlation matrix data
     """
-    conn = sqlite3.connect(get_db_path())
+    conn = get_connection()
     
-    where_clause = ""
-    if countries:
-        country_list = "','".join(countries)
-        where_clause = f"WHERE country IN ('{country_list}')"
+    filters = QueryFilters().add_in('country', countries)
+    where_clause = filters.where()
     
     query = f"""
         SELECT 
@@ -145,134 +807,389 @@ def get_correlation_data(countries=None):
         {where_clause}
     """
     
-    df = pd.read_sql_query(query, conn)
+    df = read_query(query, conn, params=filters.params)
     conn.close()
     return df
 
 
-@st.cache_data(ttl=3600)
-def get_publishing_time_heatmap(countries=None):
+def pairwise_correlation(chunks, width):
     """
-    Get average views by day of week and hour
+    Pearson correlation of numeric columns streamed as row chunks.
+
+    For every pair of columns, accumulates the count, sums, sums of squares
+    and sum of cross-products over the rows where both values are present,
+    as 8x8 matrix products per chunk, so memory does not grow with the
+    number of rows. Values are shifted by the first chunk's column means,
+    which keeps the sums centred and free of cancellation. Like
+    DataFrame.corr(), each pair uses its own complete rows.
+
+    Parameters:
+    chunks (iterable): 2-D float64 arrays with width columns, NaN for NULL
+    width (int): Number of columns
+
+    Returns:
+    ndarray: width x width correlation matrix, NaN where undefined
+    """
+    n = np.zeros((width, width))
+    sums = np.zeros((width, width))      # sums[i, j]: column i where j is present
+    squares = np.zeros((width, width))   # squares[i, j]: likewise for column i squared
+    products = np.zeros((width, width))
+    shift = None
+
+    for chunk in chunks:
+        present = ~np.isnan(chunk)
+        if shift is None:
+            counts = present.sum(axis=0)
+            shift = np.divide(np.where(present, chunk, 0.0).sum(axis=0), counts,
+                              out=np.zeros(width), where=counts > 0)
+        mask = present.astype(np.float64)
+        values = np.where(present, chunk - shift, 0.0)
+        n += mask.T @ mask
+        sums += values.T @ mask
+        squares += (values * values).T @ mask
+        products += values.T @ values
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = products - sums * sums.T / n
+        variance = squares - sums * sums / n
+        return covariance / np.sqrt(variance * variance.T)
+
+
+@normalize_filters
+@cached_query
+def get_correlation_matrix(countries=None):
+    """
+    Get the correlation matrix of CORRELATION_COLUMNS
+    
+    Streams the columns through pairwise_correlation instead of loading
+    every row, so only the 8x8 result is cached and memory stays flat as
+    the videos table grows. Matches get_correlation_data(countries).corr().
     
     Parameters:
     countries (list): Filter by countries
     
     Returns:
-    DataFrame: Publishing time heatmap data
+    DataFrame: Correlation matrix indexed and labelled by CORRELATION_COLUMNS
     """
-    conn = sqlite3.connect(get_db_path())
-    
-    where_clause = ""
-    if countries:
-        country_list = "','".join(countries)
-        where_clause = f"WHERE country IN ('{country_list}')"
+    conn = get_connection()
     
+    filters = QueryFilters().add_in('country', countries)
     query = f"""
-        SELECT 
-            publish_day_of_week,
-            publish_hour,
-            AVG(views) as avg_views
+        SELECT {', '.join(CORRELATION_COLUMNS)}
         FROM videos
-        {where_clause}
-        GROUP BY publish_day_of_week, publish_hour
-        ORDER BY publish_day_of_week, publish_hour
+        {filters.where()}
     """
     
-    df = pd.read_sql_query(query, conn)
+    matrix = pairwise_correlation(iter_numeric_query(query, conn, params=filters.params), len(CORRELATION_COLUMNS))
     conn.close()
-    return df
+    return pd.DataFrame(matrix, index=CORRELATION_COLUMNS, columns=CORRELATION_COLUMNS)
 
 
-@st.cache_data(ttl=3600)
-def get_engagement_by_category(countries=None, top_n=10):
+@normalize_filters
+@cached_query
+def get_publishing_time_heatmap(countries=None):
     """
-    Get engagement distribution data for box plot
+    Get average views by day of week and hour
     
     Parameters:
     countries (list): Filter by countries
-    top_n (int): Number of top categories to include
     
     Returns:
-    DataFrame: Engagement data by category
+    DataFrame: Publishing time heatmap data
+    """
+    conn = get_connection()
+    
+    filters = QueryFilters().add_in('country', countries)
+    where_clause = filters.where()
+    
+    if has_tables(conn, 'agg_publishing_time'):
+        query = f"""
+            SELECT
+                publish_day_of_week,
+                publish_hour,
+                SUM(views_sum) / SUM(views_n) as avg_views
+            FROM agg_publishing_time
+            {where_clause}
+            GROUP BY publish_day_of_week, publish_hour
+            ORDER BY publish_day_of_week, publish_hour
+        """
+    else:
+        query = f"""
+            SELECT 
+                publish_day_of_week,
+                publish_hour,
+                AVG(views) as avg_views
+            FROM videos
+            {where_clause}
+            GROUP BY publish_day_of_week, publish_hour
+            ORDER BY publish_day_of_week, publish_hour
+        """
+    
+    df = read_query(query, conn, params=filters.params)
+    conn.close()
+    return df
+
+
+# Outliers drawn per box; the rest are counted but not sent to the chart
+MAX_BOX_OUTLIERS = 200
+
+# Quartiles drawn by a box plot
+BOX_QUANTILES = (0.25, 0.5, 0.75)
+
+
+def hazen_position(n, q):
+    """
+    0-based position of quantile q among n sorted values with numpy's
+    'hazen' method, which is Plotly's default 'linear' quartile method.
+
+    Returns:
+    tuple: (rank of the lower of the two values to interpolate, fraction)
+    """
+    position = min(max(n * q - 0.5, 0.0), n - 1.0)
+    rank = int(np.floor(position))
+    return rank, position - rank
+
+
+def box_plot_stats(conn, filters, n, max_outliers=MAX_BOX_OUTLIERS):
+    """
+    Box plot statistics of engagement_rate over one group, as Plotly
+    computes them, read from the database a few rows at a time.
+
+    Quartiles use Plotly's default 'linear' method (see hazen_position);
+    each is interpolated between two neighbouring order statistics read
+    with ORDER BY engagement_rate LIMIT 2 OFFSET. Each whisker ends at the
+    furthest value within 1.5 IQR of the box, so a go.Box drawn from these
+    statistics matches px.box on the raw values. Outliers beyond the
+    whiskers are counted in the database and thinned there to max_outliers
+    evenly spaced order statistics, which always keep the smallest and the
+    largest.
+
+    Parameters:
+    conn: Open connection from get_connection()
+    filters (QueryFilters): Rows of the group; written so SQLite walks
+        idx_videos_category_rate in engagement_rate order
+    n (int): Number of non-NULL engagement_rate values in the group
+    max_outliers (int): Most outliers to keep, at least 2
+
+    Returns:
+    tuple: (dict of q1, median, q3, lowerfence, upperfence, outlier_count;
+        ndarray of kept outliers, ascending)
+    """
+    if not n:
+        stats = dict.fromkeys(['q1', 'median', 'q3', 'lowerfence', 'upperfence'], np.nan)
+        return {**stats, 'outlier_count': 0}, np.array([])
+
+    filters.add("engagement_rate IS NOT NULL")
+    where_clause = filters.where()
+
+    positions = [hazen_position(n, q) for q in BOX_QUANTILES]
+    quartiles_query = "\nUNION ALL\n".join(f"""
+        SELECT * FROM (
+            SELECT {i} as quartile, engagement_rate FROM videos
+            {where_clause}
+            ORDER BY engagement_rate
+            LIMIT 2 OFFSET ?
+        )""" for i in range(len(positions)))
+    params = [value for rank, _ in positions for value in (*filters.params, rank)]
+    pairs = read_numeric_query(quartiles_query, conn, params=params)
+    quartiles = []
+    for i, (_, fraction) in enumerate(positions):
+        # One value when the position is the last rank
+        pair = np.sort(pairs.loc[pairs['quartile'] == i, 'engagement_rate'].to_numpy())
+        quartiles.append(pair[0] + fraction * (pair[-1] - pair[0]))
+    q1, median, q3 = quartiles
+
+    # The data values nearest to Plotly's fences, so values on a fence
+    # land on the same side
+    fences_query = f"""
+        SELECT * FROM (
+            SELECT 0 as side, engagement_rate FROM videos
+            {where_clause} AND engagement_rate >= ?
+            ORDER BY engagement_rate
+            LIMIT 1
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT 1 as side, engagement_rate FROM videos
+            {where_clause} AND engagement_rate <= ?
+            ORDER BY engagement_rate DESC
+            LIMIT 1
+        )
+    """
+    params = [*filters.params, 2.5 * q1 - 1.5 * q3, *filters.params, 2.5 * q3 - 1.5 * q1]
+    fences = read_numeric_query(fences_query, conn, params=params).set_index('side')['engagement_rate']
+    lowerfence = min(q1, fences.get(0.0, q1))
+    upperfence = max(q3, fences.get(1.0, q3))
+
+    # Rank the outliers of both tails and keep the ranks r where r * (m - 1)
+    # passes a multiple of (total - 1): m ranks, evenly spaced from first to last
+    outliers_query = f"""
+        SELECT engagement_rate, total FROM (
+            SELECT
+                engagement_rate,
+                ROW_NUMBER() OVER (ORDER BY engagement_rate) - 1 as outlier_rank,
+                COUNT(*) OVER () as total
+            FROM (
+                SELECT engagement_rate FROM videos {where_clause} AND engagement_rate < ?
+                UNION ALL
+                SELECT engagement_rate FROM videos {where_clause} AND engagement_rate > ?
+            ) tails
+        )
+        WHERE total <= ? OR (outlier_rank * ?) % (total - 1) < ?
+        ORDER BY engagement_rate
     """
-    conn = sqlite3.connect(get_db_path())
+    max_outliers = int(max_outliers)
+    params = [*filters.params, lowerfence, *filters.params, upperfence,
+              max_outliers, max_outliers - 1, max_outliers - 1]
+    outliers = read_numeric_query(outliers_query, conn, params=params)
+
+    stats = {
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': lowerfence,
+        'upperfence': upperfence,
+        'outlier_count': int(outliers['total'].iat[0]) if len(outliers) else 0,
+    }
+    return stats, outliers['engagement_rate'].to_numpy()
+
+
+def engagement_box_stats(conn, countries=None, top_n=10, max_outliers=MAX_BOX_OUTLIERS):
+    """
+    Summarize engagement_rate of the top_n categories with the most rows
+    
+    Every statistic is computed in the database: the category counts in
+    one pass over idx_videos_category_rate, then a few ordered reads per
+    category (see box_plot_stats), so no more than the kept outliers and a
+    handful of order statistics per category are fetched.
     
-    where_clause = ""
-    if countries:
-        country_list = "','".join(countries)
-        where_clause = f"WHERE v.country IN ('{country_list}')"
+    Parameters:
+    conn: Open connection from get_connection()
+    countries (list): Filter by countries
+    top_n (int): Number of top categories to include
+    max_outliers (int): Most outliers kept per category
     
-    # First get top N categories
-    top_categories_query = f"""
-        SELECT c.category_name, COUNT(*) as count
+    Returns:
+    dict: 'boxes' DataFrame with one row per category, most rows first
+        (category_name, count, q1, median, q3, lowerfence, upperfence,
+        outlier_count); 'outliers' DataFrame of the kept outliers
+        (category_name, engagement_rate); 'p95' float, the 95th percentile
+        of engagement_rate over all of those categories
+    """
+    # Unindexed country keeps SQLite on idx_videos_category_rate, which
+    # holds the country, instead of idx_videos_country and a sort
+    filters = QueryFilters().add_in(unindexed('country'), countries)
+    counts_query = f"""
+        SELECT v.category_id, c.category_name, COUNT(*) as count, COUNT(v.engagement_rate) as n
         FROM videos v
         JOIN categories c ON v.category_id = c.category_id
-        {where_clause}
-        GROUP BY c.category_name
-        ORDER BY count DESC
-        LIMIT {top_n}
+        {filters.where()}
+        GROUP BY v.category_id, c.category_name
+        ORDER BY count DESC, c.category_name
+        LIMIT ?
     """
+    counts = read_query(counts_query, conn, params=[*filters.params, int(top_n)])
+
+    boxes = []
+    outliers = []
+    for category in counts.itertuples(index=False):
+        category_filters = (QueryFilters()
+                            .add("category_id = ?", int(category.category_id))
+                            .add_in(unindexed('country'), countries))
+        stats, kept = box_plot_stats(conn, category_filters, int(category.n), max_outliers)
+        boxes.append({'category_name': category.category_name, 'count': int(category.count), **stats})
+        outliers.append(pd.DataFrame({'category_name': category.category_name, 'engagement_rate': kept}))
+
+    # 95th percentile with pandas' default linear method, read from the top
+    # of the range so SQLite's sorter only keeps the rows above it
+    total = int(counts['n'].sum())
+    p95 = np.nan
+    if total:
+        position = (total - 1) * 0.95
+        lower = int(np.floor(position))
+        upper = min(lower + 1, total - 1)
+        filters = (QueryFilters()
+                   .add_in('category_id', [int(category_id) for category_id in counts['category_id']])
+                   .add("engagement_rate IS NOT NULL")
+                   .add_in(unindexed('country'), countries))
+        p95_query = f"""
+            SELECT engagement_rate FROM videos
+            {filters.where()}
+            ORDER BY engagement_rate DESC
+            LIMIT 2 OFFSET ?
+        """
+        top = read_numeric_query(p95_query, conn, params=[*filters.params, total - 1 - upper])['engagement_rate']
+        upper_value = top.iat[0]
+        lower_value = upper_value if upper == lower else top.iat[1]
+        p95 = float(lower_value + (position - lower) * (upper_value - lower_value))
+
+    box_columns = ['category_name', 'count', 'q1', 'median', 'q3', 'lowerfence', 'upperfence', 'outlier_count']
+    outlier_columns = ['category_name', 'engagement_rate']
+    return {
+        'boxes': pd.DataFrame(boxes, columns=box_columns),
+        'outliers': pd.concat(outliers, ignore_index=True) if outliers else pd.DataFrame(columns=outlier_columns),
+        'p95': p95,
+    }
+
+
+@normalize_filters
+@cached_query
+def get_engagement_by_category(countries=None, top_n=10, max_outliers=MAX_BOX_OUTLIERS):
+    """
+    Get engagement box plot statistics by category
     
-    top_cats = pd.read_sql_query(top_categories_query, conn)['category_name'].tolist()
-    
-    # Get engagement data for top categories
-    cat_list = "','".join([cat.replace("'", "''") for cat in top_cats])
+    Quartiles, whiskers and a capped outlier sample are computed in the
+    database rather than in the browser or in pandas, so neither the chart
+    payload nor this process's memory grows with the rows the categories
+    hold (see engagement_box_stats).
     
-    additional_where = f"c.category_name IN ('{cat_list}')"
-    if where_clause:
-        where_clause += f" AND {additional_where}"
-    else:
-        where_clause = f"WHERE {additional_where}"
+    Parameters:
+    countries (list): Filter by countries
+    top_n (int): Number of top categories to include
+    max_outliers (int): Most outliers kept per category
     
-    query = f"""
-        SELECT 
-            c.category_name,
-            v.engagement_rate
-        FROM videos v
-        JOIN categories c ON v.category_id = c.category_id
-        {where_clause}
+    Returns:
+    dict: Box plot statistics, outliers and the 95th percentile
     """
-    
-    df = pd.read_sql_query(query, conn)
+    conn = get_connection()
+    result = engagement_box_stats(conn, countries, top_n, max_outliers)
     conn.close()
-    return df
+    return result
 
 
-@st.cache_data(ttl=3600)
-def get_views_engagement_scatter(countries=None, sample_size=4000):
+@normalize_filters
+@cached_query
+def get_views_engagement_scatter(countries=None, sample_size=4000, stratified=False):
     """
     Get sample data for views vs engagement scatter plot
     
     Parameters:
     countries (list): Filter by countries
     sample_size (int): Number of random samples
+    stratified (bool): Sample an equal share of each performance class, so
+        the rare Explosive videos are not drowned out by the others
     
     Returns:
     DataFrame: Sample data with performance classification
     """
-    conn = sqlite3.connect(get_db_path())
-    
-    where_clause = ""
-    if countries:
-        country_list = "','".join(countries)
-        where_clause = f"WHERE country IN ('{country_list}')"
-    
-    query = f"""
-        SELECT 
-            views, engagement_rate, performance_class
-        FROM videos
-        {where_clause}
-        ORDER BY RANDOM()
-        LIMIT {sample_size}
-    """
+    conn = get_connection()
+    columns = ['views', 'engagement_rate', 'performance_class']
+    
+    if stratified:
+        per_class, extra = divmod(int(sample_size), len(PERFORMANCE_CLASSES))
+        df = pd.concat([
+            sample_videos(conn, columns, countries, [performance_class], per_class + (i < extra))
+            for i, performance_class in enumerate(PERFORMANCE_CLASSES)
+        ], ignore_index=True)
+    else:
+        df = sample_videos(conn, columns, countries, None, sample_size)
     
-    df = pd.read_sql_query(query, conn)
     conn.close()
     return df
 
 
-@st.cache_data(ttl=3600)
+@normalize_filters
+@cached_query
 def get_likes_dislikes_data(countries=None, sample_size=3000):
     """
     Get sample data for likes vs dislikes scatter
@@ -284,27 +1201,16 @@ def get_likes_dislikes_data(countries=None, sample_size=3000):
     Returns:
     DataFrame: Likes and dislikes data
     """
-    conn = sqlite3.connect(get_db_path())
+    conn = get_connection()
     
-    where_clause = ""
-    if countries:
-        country_list = "','".join(countries)
-        where_clause = f"WHERE country IN ('{country_list}')"
-    
-    query = f"""
-        SELECT likes, dislikes
-        FROM videos
-        {where_clause}
-        ORDER BY RANDOM()
-        LIMIT {sample_size}
-    """
+    df = sample_videos(conn, ['likes', 'dislikes'], countries, None, sample_size)
     
-    df = pd.read_sql_query(query, conn)
     conn.close()
     return df
 
 
-@st.cache_data(ttl=3600)
+@normalize_filters
+@cached_query
 def get_top_channels(countries=None, top_n=20):
     """
     Get top channels by total views
@@ -316,59 +1222,136 @@ def get_top_channels(countries=None, top_n=20):
     Returns:
     DataFrame: Top channels with total views
     """
-    conn = sqlite3.connect(get_db_path())
+    conn = get_connection()
+    
+    filters = QueryFilters().add_in('country', countries)
+    where_clause = filters.where()
+    
+    if has_tables(conn, 'agg_channel_views'):
+        query = f"""
+            SELECT
+                channel_title,
+                SUM(total_views) as total_views
+            FROM agg_channel_views
+            {where_clause}
+            GROUP BY channel_title
+            ORDER BY total_views DESC
+            LIMIT ?
+        """
+    else:
+        query = f"""
+            SELECT 
+                channel_title,
+                SUM(views) as total_views
+            FROM videos
+            {where_clause}
+            GROUP BY channel_title
+            ORDER BY total_views DESC
+            LIMIT ?
+        """
+    
+    df = read_query(query, conn, params=[*filters.params, int(top_n)])
+    conn.close()
+    return df
+
+
+# Numeric videos columns get_histogram accepts
+HISTOGRAM_COLUMNS = (
+    'views', 'likes', 'dislikes', 'comment_count', 'engagement_rate', 'like_ratio',
+    'comment_rate', 'dislike_ratio', 'days_to_trending', 'publish_hour',
+    'title_length', 'description_length', 'tag_count',
+)
+
+
+@normalize_filters
+@cached_query
+def get_histogram(column, countries=None, bins=50, value_range=None):
+    """
+    Get a histogram of a numeric videos column, binned in the database
     
-    where_clause = ""
-    if countries:
-        country_list = "','".join(countries)
-        where_clause = f"WHERE country IN ('{country_list}')"
+    Parameters:
+    column (str): One of HISTOGRAM_COLUMNS
+    countries (list): Filter by countries
+    bins (int): Number of equal-width bins
+    value_range (tuple): (lower, upper) values to include, inclusive;
+        the column's full range when None
     
-    query = f"""
-        SELECT 
-            channel_title,
-            SUM(views) as total_views
-        FROM videos
-        {where_clause}
-        GROUP BY channel_title
-        ORDER BY total_views DESC
-        LIMIT {top_n}
+    Returns:
+    dict: Bin edges and counts, with the count, exact mean and median,
+        minimum and maximum of the values in range (see histogram)
     """
+    if column not in HISTOGRAM_COLUMNS:
+        raise ValueError(f"column must be one of {', '.join(HISTOGRAM_COLUMNS)}")
     
-    df = pd.read_sql_query(query, conn)
+    conn = get_connection()
+    filters = QueryFilters().add_in('country', countries)
+    result = histogram(conn, column, filters, bins, value_range)
     conn.close()
-    return df
+    return result
 
 
-@st.cache_data(ttl=3600)
-def get_days_to_trending(countries=None):
+# days_to_trending values shown by the Analysis page
+DAYS_TO_TRENDING_RANGE = (0, 30)
+
+
+@normalize_filters
+@cached_query
+def get_days_to_trending(countries=None, bins=50):
     """
     Get days to trending distribution
     
+    Parameters:
+    countries (list): Filter by countries
+    bins (int): Number of histogram bins over DAYS_TO_TRENDING_RANGE
+    
+    Returns:
+    dict: Histogram of days_to_trending (see histogram)
+    """
+    conn = get_connection()
+    # Unindexed country, so every query seeks the covering idx_videos_days_country
+    # by its days range instead of reading the country's rows and sorting them
+    filters = QueryFilters().add_in(unindexed('country'), countries)
+    result = histogram(conn, 'days_to_trending', filters, bins, DAYS_TO_TRENDING_RANGE)
+    conn.close()
+    return result
+
+
+@normalize_filters
+@cached_query
+def get_trending_lifespan(countries=None):
+    """
+    Get how many days videos stay on the trending list
+    
     Parameters:
     countries (list): Filter by countries
     
     Returns:
-    DataFrame: Days to trending data
+    DataFrame: days_trending, video_count and avg_peak_views per number of
+        trending days, counting each video once per country
     """
-    conn = sqlite3.connect(get_db_path())
+    conn = get_connection()
     
-    where_clause = "WHERE days_to_trending BETWEEN 0 AND 30"
-    if countries:
-        country_list = "','".join(countries)
-        where_clause += f" AND country IN ('{country_list}')"
+    filters = QueryFilters().add_in('country', countries)
+    where_clause = filters.where()
     
     query = f"""
-        SELECT days_to_trending
-        FROM videos
+        SELECT
+            snapshot_count as days_trending,
+            COUNT(*) as video_count,
+            AVG(peak_views) as avg_peak_views
+        FROM unique_videos
         {where_clause}
+        GROUP BY snapshot_count
+        ORDER BY snapshot_count
     """
     
-    df = pd.read_sql_query(query, conn)
+    df = read_query(query, conn, params=filters.params)
     conn.close()
     return df
 
 
-@st.cache_data(ttl=3600)
+@normalize_filters
+@cached_query
 def get_title_length_analysis(countries=None):
     """
     Get title length impact on views
@@ -379,28 +1362,37 @@ def get_title_length_analysis(countries=None):
     Returns:
     DataFrame: Title length statistics
     """
-    conn = sqlite3.connect(get_db_path())
-    
-    where_clause = ""
-    if countries:
-        country_list = "','".join(countries)
-        where_clause = f"WHERE country IN ('{country_list}')"
-    
-    query = f"""
-        SELECT 
-            CASE 
-                WHEN title_length < 30 THEN 'Short (<30)'
-                WHEN title_length < 60 THEN 'Medium (30-60)'
-                ELSE 'Long (60+)'
-            END as title_category,
-            AVG(views) as avg_views,
-            COUNT(*) as video_count
-        FROM videos
-        {where_clause}
-        GROUP BY title_category
-    """
-    
-    df = pd.read_sql_query(query, conn)
+    conn = get_connection()
+    
+    filters = QueryFilters().add_in('country', countries)
+    where_clause = filters.where()
+    
+    if has_tables(conn, 'agg_title_length'):
+        query = f"""
+            SELECT
+                title_category,
+                SUM(views_sum) / SUM(views_n) as avg_views,
+                SUM(video_count) as video_count
+            FROM agg_title_length
+            {where_clause}
+            GROUP BY title_category
+        """
+    else:
+        query = f"""
+            SELECT 
+                CASE 
+                    WHEN title_length < 30 THEN 'Short (<30)'
+                    WHEN title_length < 60 THEN 'Medium (30-60)'
+                    ELSE 'Long (60+)'
+                END as title_category,
+                AVG(views) as avg_views,
+                COUNT(*) as video_count
+            FROM videos
+            {where_clause}
+            GROUP BY title_category
+        """
+    
+    df = read_query(query, conn, params=filters.params)
     conn.close()
     
     # Ensure correct order
@@ -411,7 +1403,8 @@ def get_title_length_analysis(countries=None):
     return df
 
 
-@st.cache_data(ttl=3600)
+@normalize_filters
+@cached_query
 def get_tag_analysis(countries=None):
     """
     Get tag count impact on performance
@@ -422,82 +1415,319 @@ def get_tag_analysis(countries=None):
     Returns:
     DataFrame: Tag count analysis
     """
-    conn = sqlite3.connect(get_db_path())
+    conn = get_connection()
+    
+    filters = QueryFilters().add("tag_count <= 50")
+    filters.add_in('country', countries)
+    where_clause = filters.where()
+    
+    if has_tables(conn, 'agg_tag_count'):
+        query = f"""
+            SELECT
+                tag_count,
+                SUM(views_sum) / SUM(views_n) as avg_views,
+                SUM(engagement_sum) / SUM(engagement_n) as avg_engagement,
+                SUM(video_count) as video_count
+            FROM agg_tag_count
+            {where_clause}
+            GROUP BY tag_count
+            HAVING SUM(video_count) >= 10
+            ORDER BY tag_count
+        """
+    else:
+        query = f"""
+            SELECT 
+                tag_count,
+                AVG(views) as avg_views,
+                AVG(engagement_rate) as avg_engagement,
+                COUNT(*) as video_count
+            FROM videos
+            {where_clause}
+            GROUP BY tag_count
+            HAVING COUNT(*) >= 10
+            ORDER BY tag_count
+        """
+    
+    df = read_query(query, conn, params=filters.params)
+    conn.close()
+    return df
+
+
+# Sort options for get_top_tags
+TAG_SORT_COLUMNS = {
+    'views': 'avg_views',
+    'engagement': 'avg_engagement',
+}
+
+
+@normalize_filters
+@cached_query
+def get_top_tags(countries=None, sort_by='views', limit=20, min_videos=10):
+    """
+    Get the best performing tags in each country
+    
+    Parameters:
+    countries (list): Filter by countries
+    sort_by (str): 'views' or 'engagement', ranked by the per-tag average
+    limit (int): Tags returned per country
+    min_videos (int): Ignore tags on fewer videos than this
+    
+    Returns:
+    DataFrame: country, rank, tag, video_count, avg_views, avg_engagement
+    """
+    if sort_by not in TAG_SORT_COLUMNS:
+        raise ValueError(f"sort_by must be one of {', '.join(TAG_SORT_COLUMNS)}")
+    
+    conn = get_connection()
+    
+    filters = QueryFilters().add("video_count >= ?", int(min_videos))
+    filters.add_in('country', countries)
+    where_clause = filters.where()
     
-    where_clause = "WHERE tag_count <= 50"
-    if countries:
-        country_list = "','".join(countries)
-        where_clause += f" AND country IN ('{country_list}')"
+    if has_tables(conn, 'agg_tag_stats'):
+        tag_stats = "agg_tag_stats"
+    else:
+        tag_stats = """(
+            SELECT
+                vt.country,
+                vt.tag_id,
+                COUNT(*) as video_count,
+                TOTAL(pv.views_sum) as views_sum,
+                TOTAL(pv.views_n) as views_n,
+                TOTAL(pv.engagement_sum) as engagement_sum,
+                TOTAL(pv.engagement_n) as engagement_n
+            FROM video_tags vt
+            JOIN (
+                SELECT
+                    video_id,
+                    country,
+                    TOTAL(views) as views_sum,
+                    COUNT(views) as views_n,
+                    TOTAL(engagement_rate) as engagement_sum,
+                    COUNT(engagement_rate) as engagement_n
+                FROM videos
+                GROUP BY video_id, country
+            ) pv ON pv.video_id = vt.video_id AND pv.country = vt.country
+            GROUP BY vt.country, vt.tag_id
+        )"""
     
     query = f"""
-        SELECT 
-            tag_count,
-            AVG(views) as avg_views,
-            AVG(engagement_rate) as avg_engagement,
-            COUNT(*) as video_count
-        FROM videos
-        {where_clause}
-        GROUP BY tag_count
-        HAVING COUNT(*) >= 10
-        ORDER BY tag_count
+        WITH tag_averages AS (
+            SELECT
+                country,
+                tag_id,
+                video_count,
+                views_sum / views_n as avg_views,
+                engagement_sum / engagement_n as avg_engagement
+            FROM {tag_stats}
+            {where_clause}
+        ),
+        ranked AS (
+            SELECT
+                *,
+                ROW_NUMBER() OVER (
+                    PARTITION BY country
+                    ORDER BY {TAG_SORT_COLUMNS[sort_by]} DESC
+                ) as rank
+            FROM tag_averages
+        )
+        SELECT
+            r.country,
+            r.rank,
+            t.tag,
+            r.video_count,
+            r.avg_views,
+            r.avg_engagement
+        FROM ranked r
+        JOIN tags t ON t.tag_id = r.tag_id
+        WHERE r.rank <= {int(limit)}
+        ORDER BY r.country, r.rank
     """
     
-    df = pd.read_sql_query(query, conn)
+    df = read_query(query, conn, params=filters.params)
     conn.close()
     return df
 
 
-@st.cache_data(ttl=3600)
-def get_overall_stats(countries=None):
+@normalize_filters
+@cached_query
+def get_tag_cooccurrence(tag, countries=None, limit=20):
     """
-    Get overall statistics for dashboard overview
+    Get the tags that most often appear on the same videos as a tag
     
     Parameters:
+    tag (str): Tag to look up (case-insensitive)
     countries (list): Filter by countries
+    limit (int): Number of co-occurring tags to return
     
     Returns:
-    dict: Overall statistics
+    DataFrame: tag, video_count (videos carrying both tags), share
+        (fraction of the looked-up tag's videos)
     """
-    conn = sqlite3.connect(get_db_path())
+    conn = get_connection()
     
-    where_clause = ""
-    if countries:
-        country_list = "','".join(countries)
-        where_clause = f"WHERE country IN ('{country_list}')"
+    filters = QueryFilters().add("a.tag_id = (SELECT tag_id FROM tags WHERE tag = ?)", tag.strip().lower())
+    filters.add_in('a.country', countries)
+    where_clause = filters.where()
     
+    # Both sides are index lookups: idx_video_tags_tag finds the videos
+    # carrying the tag and the primary key lists each video's other tags
     query = f"""
-        SELECT 
-            COUNT(DISTINCT video_id) as total_videos,
-            COUNT(DISTINCT channel_title) as unique_channels,
-            COUNT(DISTINCT country) as countries,
-            AVG(views) as avg_views,
-            AVG(engagement_rate) as avg_engagement,
-            AVG(days_to_trending) as avg_days_trending
-        FROM videos
-        {where_clause}
+        WITH tagged AS (
+            SELECT a.video_id, a.country, a.tag_id
+            FROM video_tags a
+            {where_clause}
+        )
+        SELECT
+            t.tag,
+            COUNT(*) as video_count,
+            CAST(COUNT(*) AS DOUBLE) / (SELECT COUNT(*) FROM tagged) as share
+        FROM tagged tv
+        JOIN video_tags b
+            ON b.video_id = tv.video_id
+            AND b.country = tv.country
+            AND b.tag_id != tv.tag_id
+        JOIN tags t ON t.tag_id = b.tag_id
+        GROUP BY b.tag_id, t.tag
+        ORDER BY video_count DESC, t.tag
+        LIMIT ?
+    """
+    
+    df = read_query(query, conn, params=[*filters.params, int(limit)])
+    conn.close()
+    return df
+
+
+@normalize_filters
+@cached_query
+def get_overall_stats(countries=None):
     """
+    Get overall statistics for dashboard overview
+    
+    Parameters:
+    countries (list): Filter by countries
     
-    df = pd.read_sql_query(query, conn)
+    Returns:
+    dict: Overall statistics
+    """
+    conn = get_connection()
+    
+    filters = QueryFilters().add_in('country', countries)
+    where_clause = filters.where()
+    
+    # Distinct counts do not add up across countries, so for a country
+    # filter they come from unique_videos (one row per video and country)
+    # and agg_channel_views (one row per channel and country), while the
+    # averages are re-aggregated from agg_country_stats
+    if not countries and has_tables(conn, 'agg_overall_stats'):
+        query = """
+            SELECT
+                total_videos,
+                unique_channels,
+                countries,
+                views_sum / views_n as avg_views,
+                engagement_sum / engagement_n as avg_engagement,
+                days_sum / days_n as avg_days_trending
+            FROM agg_overall_stats
+        """
+        params = []
+    elif countries and has_tables(conn, 'agg_country_stats', 'agg_channel_views', 'unique_videos'):
+        query = f"""
+            SELECT
+                (SELECT COUNT(DISTINCT video_id) FROM unique_videos {where_clause}) as total_videos,
+                (SELECT COUNT(DISTINCT channel_title) FROM agg_channel_views {where_clause}) as unique_channels,
+                COUNT(*) as countries,
+                SUM(views_sum) / SUM(views_n) as avg_views,
+                SUM(engagement_sum) / SUM(engagement_n) as avg_engagement,
+                SUM(days_sum) / SUM(days_n) as avg_days_trending
+            FROM agg_country_stats
+            {where_clause}
+        """
+        # The filter appears three times, once per SELECT
+        params = filters.params * 3
+    else:
+        query = f"""
+            SELECT 
+                COUNT(DISTINCT video_id) as total_videos,
+                COUNT(DISTINCT channel_title) as unique_channels,
+                COUNT(DISTINCT country) as countries,
+                AVG(views) as avg_views,
+                AVG(engagement_rate) as avg_engagement,
+                AVG(days_to_trending) as avg_days_trending
+            FROM videos
+            {where_clause}
+        """
+        params = filters.params
+    
+    df = read_query(query, conn, params=params)
     conn.close()
     
     return df.iloc[0].to_dict()
 
 
+# ============================================================================
+# ANALYSIS PAGE BUNDLE
+# ============================================================================
+
+@normalize_filters
+@cached_query
+def get_analysis_bundle(countries=None, sample_size=4000, top_categories=10, top_channels=20):
+    """
+    Get the data behind every shared-filter section of the Analysis page
+    
+    The sections do not share a scan of videos; each reads the narrowest
+    source that answers it. Only the correlation matrix streams every
+    matching row, from the covering idx_videos_country_metrics
+    (get_correlation_matrix). The engagement box plot counts categories on
+    idx_videos_category_rate and reads its statistics with ordered seeks on
+    it (get_engagement_by_category), the days to trending histogram seeks
+    idx_videos_days_country (get_days_to_trending), the scatter plots walk
+    the indexed sample, and the other sections come from their agg_*
+    summary table. Those queries are independent and run concurrently
+    through run_queries, so a cold bundle waits for the slowest of them
+    rather than their sum.
+    
+    Parameters:
+    countries (list): Filter by countries
+    sample_size (int): Rows in each views vs engagement sample
+    top_categories (int): Categories in the engagement box plot
+    top_channels (int): Channels in the top channels chart
+    
+    Returns:
+    dict: DataFrames keyed by section: correlation_matrix, publishing_heatmap,
+        views_engagement, views_engagement_stratified, top_channels,
+        title_length, tag_analysis; and the dicts engagement_by_category
+        and days_to_trending, as their own functions return them
+    """
+    return dict(run_queries({
+        'engagement_by_category': functools.partial(get_engagement_by_category, countries, top_categories),
+        'correlation_matrix': functools.partial(get_correlation_matrix, countries),
+        'publishing_heatmap': functools.partial(get_publishing_time_heatmap, countries),
+        'views_engagement': functools.partial(get_views_engagement_scatter, countries, sample_size),
+        'views_engagement_stratified': functools.partial(
+            get_views_engagement_scatter, countries, sample_size, stratified=True),
+        'top_channels': functools.partial(get_top_channels, countries, top_channels),
+        'title_length': functools.partial(get_title_length_analysis, countries),
+        'tag_analysis': functools.partial(get_tag_analysis, countries),
+        'days_to_trending': functools.partial(get_days_to_trending, countries),
+    }))
+
+
 # ============================================================================
 # DATABASE TABLE DISPLAY FUNCTIONS
 # ============================================================================
 
-@st.cache_data(ttl=3600)
+@cached_query
 def get_categories_table():
     """Get all categories from the database, ordered by category_id."""
-    conn = sqlite3.connect(get_db_path())
+    conn = get_connection()
     query = "SELECT * FROM categories ORDER BY category_id"
-    df = pd.read_sql_query(query, conn)
+    df = read_query(query, conn)
     conn.close()
     return df
 
 
-@st.cache_data(ttl=3600)
+@cached_query
 def get_channel_stats_table(limit=50):
     """Get channel stats table, ordered by total views descending.
     
@@ -507,24 +1737,52 @@ def get_channel_stats_table(limit=50):
     Returns:
         pd.DataFrame: Channel statistics
     """
-    conn = sqlite3.connect(get_db_path())
-    query = f"SELECT * FROM channel_stats ORDER BY total_views DESC LIMIT {limit}"
-    df = pd.read_sql_query(query, conn)
+    conn = get_connection()
+    query = "SELECT * FROM channel_stats ORDER BY total_views DESC LIMIT ?"
+    df = read_query(query, conn, params=[int(limit)])
     conn.close()
     return df
 
 
-@st.cache_data(ttl=3600)
+@cached_query
 def get_channel_stats_count():
     """Get total count of channels in channel_stats table."""
-    conn = sqlite3.connect(get_db_path())
+    conn = get_connection()
     query = "SELECT COUNT(*) as count FROM channel_stats"
-    count = pd.read_sql_query(query, conn)['count'].iloc[0]
+    count = read_query(query, conn)['count'].iloc[0]
     conn.close()
     return count
 
 
-@st.cache_data(ttl=3600)
+# Columns shown for each video on the Database Tables page
+VIDEOS_TABLE_COLUMNS = [
+    'v.video_id', 't.title', 'v.channel_title', 'v.category_id', 'v.country',
+    'v.views', 'v.likes', 'v.dislikes', 'v.comment_count', 'v.engagement_rate',
+    'v.trending_date', 'v.publish_time', 'v.days_to_trending',
+]
+
+
+def format_videos_table(videos_df):
+    """Format numbers, percentages and dates of a videos table for display."""
+    if not videos_df.empty:
+        # Format numbers with commas
+        for col in ['views', 'likes', 'dislikes', 'comment_count']:
+            if col in videos_df.columns:
+                videos_df[col] = videos_df[col].apply(lambda x: f"{int(x):,}" if pd.notna(x) else "")
+        
+        # Format engagement_rate as percentage
+        if 'engagement_rate' in videos_df.columns:
+            videos_df['engagement_rate'] = videos_df['engagement_rate'].apply(lambda x: f"{x:.2f}%" if pd.notna(x) else "")
+        
+        # Format dates
+        for col in ['trending_date', 'publish_time']:
+            if col in videos_df.columns:
+                videos_df[col] = pd.to_datetime(videos_df[col]).dt.strftime('%Y-%m-%d')
+    
+    return videos_df
+
+
+@cached_query
 def get_videos_table(country_filter=None, limit=100):
     """Get videos table with optional country filter.
     
@@ -535,69 +1793,158 @@ def get_videos_table(country_filter=None, limit=100):
     Returns:
         pd.DataFrame: Video data with formatted columns
     """
-    conn = sqlite3.connect(get_db_path())
-    
-    query = """
-        SELECT 
-            video_id,
-            title,
-            channel_title,
-            category_id,
-            country,
-            views,
-            likes,
-            dislikes,
-            comment_count,
-            engagement_rate,
-            trending_date,
-            publish_time,
-            days_to_trending
-        FROM videos
-    """
+    conn = get_connection()
     
+    filters = QueryFilters()
     if country_filter and country_filter != "All":
-        query += f" WHERE country = '{country_filter}'"
+        filters.add("country = ?", country_filter)
     
-    query += f" ORDER BY views DESC LIMIT {limit}"
+    # Pick the page from the narrow videos table first, then join the text
+    # side table for just those rows
+    query = f"""
+        SELECT {', '.join(VIDEOS_TABLE_COLUMNS)}
+        FROM (
+            SELECT *
+            FROM videos
+            {filters.where()}
+            ORDER BY views DESC LIMIT ?
+        ) v
+        LEFT JOIN video_text t
+            ON t.video_id = v.video_id
+            AND t.trending_date = v.trending_date
+            AND t.country = v.country
+        ORDER BY v.views DESC
+    """
     
-    videos_df = pd.read_sql_query(query, conn)
+    videos_df = read_query(query, conn, params=[*filters.params, int(limit)])
     conn.close()
     
-    # Format the dataframe for better display
-    if not videos_df.empty:
-        # Format numbers with commas
-        for col in ['views', 'likes', 'dislikes', 'comment_count']:
-            if col in videos_df.columns:
-                videos_df[col] = videos_df[col].apply(lambda x: f"{int(x):,}" if pd.notna(x) else "")
+    return format_videos_table(videos_df)
+
+
+# Sort keys of the videos explorer; each has a single-column index
+EXPLORER_SORT_COLUMNS = ('views', 'trending_date', 'engagement_rate')
+
+# Primary key, appended to the sort key so every row has a unique position
+EXPLORER_TIEBREAK_COLUMNS = ['video_id', 'trending_date', 'country']
+
+
+def explorer_filters(country=None, category_id=None, channel=None, sort_index=False):
+    """
+    Build the row filters of the videos explorer.
+    
+    Args:
+        country (str, optional): Country code, or "All"
+        category_id (int, optional): Category ID
+        channel (str, optional): Exact channel title
+        sort_index (bool): The query walks a sort key's index. Country and
+            category are then unindexed() so SQLite keeps that index and
+            checks them row by row; a channel has few rows, so its index is
+            still used and just those rows are sorted.
         
-        # Format engagement_rate as percentage
-        if 'engagement_rate' in videos_df.columns:
-            videos_df['engagement_rate'] = videos_df['engagement_rate'].apply(lambda x: f"{x:.2f}%" if pd.notna(x) else "")
+    Returns:
+        QueryFilters: The filters that are set
+    """
+    column = unindexed if sort_index else str
+    filters = QueryFilters()
+    if country and country != "All":
+        filters.add(f"{column('country')} = ?", country)
+    if category_id is not None:
+        filters.add(f"{column('category_id')} = ?", int(category_id))
+    if channel:
+        filters.add("channel_title = ?", channel)
+    return filters
+
+
+@cached_query
+def get_videos_page(sort_by='views', descending=True, after=None, country=None,
+                    category_id=None, channel=None, page_size=100):
+    """Get one page of the videos explorer, using keyset pagination.
+    
+    Rows are ordered by the sort key, then by the primary key to break
+    ties. A page starts right after the last row of the previous page (its
+    cursor) instead of skipping rows with OFFSET, so SQLite seeks straight
+    to it in the sort key's index and every page costs the same however
+    deep it is. Rows with no value for the sort key are left out.
+    
+    Args:
+        sort_by (str): One of EXPLORER_SORT_COLUMNS
+        descending (bool): Largest values first
+        after (tuple, optional): Cursor returned with the previous page;
+            None for the first page
+        country (str, optional): Country code, or "All"
+        category_id (int, optional): Category ID
+        channel (str, optional): Exact channel title
+        page_size (int): Rows per page
         
-        # Format dates
-        for col in ['trending_date', 'publish_time']:
-            if col in videos_df.columns:
-                videos_df[col] = pd.to_datetime(videos_df[col]).dt.strftime('%Y-%m-%d')
+    Returns:
+        tuple: (pd.DataFrame of formatted video data, cursor of the next
+            page or None on the last page)
+    """
+    if sort_by not in EXPLORER_SORT_COLUMNS:
+        raise ValueError(f"sort_by must be one of {', '.join(EXPLORER_SORT_COLUMNS)}")
     
-    return videos_df
+    conn = get_connection()
+    
+    key_columns = [sort_by] + [col for col in EXPLORER_TIEBREAK_COLUMNS if col != sort_by]
+    direction, comparison = ("DESC", "<") if descending else ("ASC", ">")
+    
+    filters = explorer_filters(country, category_id, channel, sort_index=True)
+    filters.add(f"{sort_by} IS NOT NULL")
+    if after is not None:
+        placeholders = ", ".join("?" for _ in key_columns)
+        filters.add(f"({', '.join(key_columns)}) {comparison} ({placeholders})", *after)
+    
+    inner_order = ", ".join(f"{col} {direction}" for col in key_columns)
+    outer_order = ", ".join(f"v.{col} {direction}" for col in key_columns)
+    
+    # One row past the page tells whether another page follows
+    query = f"""
+        SELECT {', '.join(VIDEOS_TABLE_COLUMNS)}
+        FROM (
+            SELECT *
+            FROM videos
+            {filters.where()}
+            ORDER BY {inner_order}
+            LIMIT ?
+        ) v
+        LEFT JOIN video_text t
+            ON t.video_id = v.video_id
+            AND t.trending_date = v.trending_date
+            AND t.country = v.country
+        ORDER BY {outer_order}
+    """
+    
+    videos_df = read_query(query, conn, params=[*filters.params, int(page_size) + 1])
+    conn.close()
+    
+    next_cursor = None
+    if len(videos_df) > page_size:
+        videos_df = videos_df.iloc[:page_size].copy()
+        # Per-column tolist() gives plain Python values; numpy integers would
+        # be bound as BLOBs, which compare greater than every number
+        next_cursor = tuple(videos_df[col].iloc[-1:].tolist()[0] for col in key_columns)
+    
+    return format_videos_table(videos_df), next_cursor
 
 
-@st.cache_data(ttl=3600)
-def get_videos_count(country_filter=None):
-    """Get count of videos with optional country filter.
+@cached_query
+def get_videos_count(country_filter=None, category_id=None, channel=None):
+    """Get count of videos with optional country, category and channel filters.
     
     Args:
         country_filter (str, optional): Country code to filter by
+        category_id (int, optional): Category ID to filter by
+        channel (str, optional): Exact channel title to filter by
         
     Returns:
         int: Number of videos matching filter
     """
-    conn = sqlite3.connect(get_db_path())
+    conn = get_connection()
     
-    query = "SELECT COUNT(*) as count FROM videos"
-    if country_filter and country_filter != "All":
-        query += f" WHERE country = '{country_filter}'"
+    filters = explorer_filters(country_filter, category_id, channel)
     
-    count = pd.read_sql_query(query, conn)['count'].iloc[0]
+    query = f"SELECT COUNT(*) as count FROM videos {filters.where()}"
+    count = read_query(query, conn, params=filters.params)['count'].iloc[0]
     conn.close()
     return count
@@ -0,0 +1,224 @@
+"""
+Query Diagnostics
+
+Records what every cached db_utils query function costs. Each call gets a
+record with:
+
+    wall_ms        Time the caller waited, cache lookups included
+    db_ms          Time spent running statements and fetching their rows
+    convert_ms     Time spent turning fetched rows into DataFrames / arrays
+    rows           Rows fetched from the database
+    result_bytes   Memory size of the returned value (computed calls only)
+    cache          'memory' (st.cache_data), 'disk' (result_cache.py) or 'miss'
+    statements     Each statement's SQL, timings, rows and query plan
+
+The backends report statement timings to the call running on the current
+thread; requests fanned out by db_utils.run_queries carry the caller's
+call with them, so their statements count towards it (their db_ms can then
+exceed wall_ms). A query plan is captured the first time a statement text
+is seen and reused afterwards, so a warm process pays nothing extra.
+
+The most recent calls are kept in memory for the Diagnostics page. Set
+YT_TRENDS_QUERY_LOG to a file path to also append every call to it as one
+JSON object per line.
+
+Environment:
+    YT_TRENDS_QUERY_LOG     JSON Lines file to append call records to (default: off)
+    YT_TRENDS_DIAGNOSTICS   Set to 1 to list the Diagnostics page in the app
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+QUERY_LOG_ENV_VAR = 'YT_TRENDS_QUERY_LOG'
+DIAGNOSTICS_ENV_VAR = 'YT_TRENDS_DIAGNOSTICS'
+
+# Calls kept in memory for the Diagnostics page
+RECENT_CALLS = 2000
+
+# Characters of each argument kept in a record
+ARGUMENT_CHARS = 200
+
+_recent = deque(maxlen=RECENT_CALLS)
+_log_lock = threading.Lock()
+
+# (backend name, SQL) -> plan lines, captured once per statement text
+_plans = {}
+_plans_lock = threading.Lock()
+
+# The call whose statements are being recorded in this context
+_current_call = contextvars.ContextVar('current_call', default=None)
+
+
+class CallRecord:
+    """Timings and sizes of one call to a cached db_utils function."""
+
+    def __init__(self, function, arguments, backend):
+        self.function = function
+        self.arguments = {name: repr(value)[:ARGUMENT_CHARS] for name, value in arguments.items()}
+        self.backend = backend
+        self.started_at = time.time()
+        self.wall_ms = 0.0
+        self.db_ms = 0.0
+        self.convert_ms = 0.0
+        self.rows = 0
+        self.result_bytes = None
+        self.cache = 'memory'
+        self.statements = []
+        self._lock = threading.Lock()
+
+    def add_statement(self, sql, db_seconds, convert_seconds, rows, plan):
+        with self._lock:
+            self.db_ms += db_seconds * 1000
+            self.convert_ms += convert_seconds * 1000
+            self.rows += rows
+            self.statements.append({
+                'sql': ' '.join(sql.split()),
+                'db_ms': db_seconds * 1000,
+                'convert_ms': convert_seconds * 1000,
+                'rows': rows,
+                'plan': plan,
+            })
+
+    def as_dict(self):
+        """Return the record as JSON-serializable values."""
+        return {
+            'function': self.function,
+            'arguments': self.arguments,
+            'backend': self.backend,
+            'started_at': self.started_at,
+            'wall_ms': self.wall_ms,
+            'db_ms': self.db_ms,
+            'convert_ms': self.convert_ms,
+            'rows': self.rows,
+            'result_bytes': self.result_bytes,
+            'cache': self.cache,
+            'statements': list(self.statements),
+        }
+
+
+def start_call(function, arguments, backend):
+    """
+    Start recording a call; statements run in this context count towards it.
+
+    Returns:
+    tuple: (CallRecord, token for finish_call)
+    """
+    record = CallRecord(function, arguments, backend)
+    return record, _current_call.set(record)
+
+
+def current_call():
+    """Return the call being recorded in this context, or None."""
+    return _current_call.get()
+
+
+def finish_call(record, token, wall_seconds):
+    """Stop recording a call, keep it for the Diagnostics page and log it."""
+    _current_call.reset(token)
+    record.wall_ms = wall_seconds * 1000
+    _recent.append(record)
+    log_path = os.environ.get(QUERY_LOG_ENV_VAR)
+    if log_path:
+        line = json.dumps(record.as_dict(), default=str)
+        with _log_lock:
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+def result_nbytes(result):
+    """Estimate the memory held by a query function's return value."""
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        usage = result.memory_usage(index=True, deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(result, np.ndarray):
+        return int(result.nbytes)
+    if isinstance(result, dict):
+        return sum(result_nbytes(value) for value in result.values())
+    if isinstance(result, (list, tuple)):
+        return sum(result_nbytes(value) for value in result)
+    return 0
+
+
+def record_statement(backend, conn, sql, params, db_seconds, convert_seconds, rows):
+    """
+    Add one statement to the call being recorded, if any.
+
+    Called by the backends after a statement's rows are converted, while
+    the connection is still checked out, so the plan can be captured on it.
+    """
+    record = _current_call.get()
+    if record is None:
+        return
+    key = (backend.name, sql)
+    with _plans_lock:
+        plan = _plans.get(key)
+    if plan is None:
+        try:
+            plan = backend.explain(conn, sql, params)
+        except Exception as e:
+            plan = [f"(plan unavailable: {e})"]
+        with _plans_lock:
+            _plans[key] = plan
+    record.add_statement(sql, db_seconds, convert_seconds, rows, plan)
+
+
+def clear_plans():
+    """Forget captured plans; a rebuilt database may plan statements differently."""
+    with _plans_lock:
+        _plans.clear()
+
+
+def get_recent_calls():
+    """Return the recorded calls kept in memory, oldest first, as dicts."""
+    return [record.as_dict() for record in list(_recent)]
+
+
+def clear_recent_calls():
+    """Drop the recorded calls kept in memory."""
+    _recent.clear()
+
+
+def summarize_calls(calls):
+    """
+    Summarize recorded calls per function.
+
+    Parameters:
+    calls (list): Records from get_recent_calls()
+
+    Returns:
+    pd.DataFrame: One row per function with its call count, cache hit
+        rate, mean and max wall time, mean database and conversion time of
+        its computed calls, rows and result size, sorted by total wall time
+    """
+    columns = ['function', 'calls', 'hit_rate', 'total_wall_ms', 'mean_wall_ms', 'max_wall_ms',
+               'mean_db_ms', 'mean_convert_ms', 'mean_rows', 'mean_result_kb']
+    if not calls:
+        return pd.DataFrame(columns=columns)
+
+    df = pd.DataFrame(calls)
+    df['hit'] = df['cache'] != 'miss'
+    computed = df[~df['hit']]
+    summary = df.groupby('function').agg(
+        calls=('function', 'size'),
+        hit_rate=('hit', 'mean'),
+        total_wall_ms=('wall_ms', 'sum'),
+        mean_wall_ms=('wall_ms', 'mean'),
+        max_wall_ms=('wall_ms', 'max'),
+    )
+    computed_summary = computed.groupby('function').agg(
+        mean_db_ms=('db_ms', 'mean'),
+        mean_convert_ms=('convert_ms', 'mean'),
+        mean_rows=('rows', 'mean'),
+        mean_result_kb=('result_bytes', lambda b: b.astype(float).mean() / 1024),
+    )
+    summary = summary.join(computed_summary).reset_index()
+    return summary.sort_values('total_wall_ms', ascending=False)[columns]
+
@@ -0,0 +1,222 @@
+"""
+Parquet Snapshot of the Database
+
+Writes the videos fact table as a columnar Parquet dataset, hive-partitioned
+by country and trending month, and reads it back column by column. Batch
+notebooks and full-column reads (correlation inputs, histograms) can load
+just the columns they need from memory-mapped files instead of converting
+SQLite rows through pd.read_sql_query. The other base tables are written
+as one file each, so the snapshot can also back the DuckDB query backend
+in backends.py.
+
+Layout:
+    database/parquet/videos/country=US/trending_month=2018-01/part-0.parquet
+    database/parquet/categories.parquet, tags.parquet, ...
+
+Usage:
+    python database/create_database.py --parquet   # build, then export
+"""
+
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SNAPSHOT_DIR = BASE_DIR / 'database' / 'parquet'
+
+EXPORT_CHUNK_SIZE = 100000
+
+# Tables written as a single file next to the videos dataset. The agg_*
+# summary tables are left out; a columnar engine aggregates videos directly.
+SNAPSHOT_TABLES = ('categories', 'channel_stats', 'video_text', 'tags', 'video_tags', 'unique_videos',
+                   'build_info')
+
+# Arrow types for the declared SQLite column types of SNAPSHOT_TABLES
+SQLITE_ARROW_TYPES = {
+    'INTEGER': pa.int64(),
+    'REAL': pa.float64(),
+    'TEXT': pa.string(),
+}
+
+# Partition columns, stored in the directory names rather than the files
+PARTITION_SCHEMA = pa.schema([
+    ('country', pa.string()),
+    ('trending_month', pa.string()),
+])
+
+# Compact types for the videos columns. Low-cardinality strings are
+# dictionary encoded and small integers narrowed; floats stay float64 so
+# results match the SQLite path exactly.
+VIDEO_SCHEMA = pa.schema([
+    ('video_id', pa.string()),
+    ('trending_date', pa.date32()),
+    ('channel_title', pa.dictionary(pa.int32(), pa.string())),
+    ('category_id', pa.int16()),
+    ('publish_time', pa.timestamp('s', tz='UTC')),
+    ('views', pa.int64()),
+    ('likes', pa.int64()),
+    ('dislikes', pa.int64()),
+    ('comment_count', pa.int64()),
+    ('comments_disabled', pa.bool_()),
+    ('ratings_disabled', pa.bool_()),
+    ('video_error_or_removed', pa.bool_()),
+    ('engagement_rate', pa.float64()),
+    ('like_ratio', pa.float64()),
+    ('comment_rate', pa.float64()),
+    ('dislike_ratio', pa.float64()),
+    ('days_to_trending', pa.float64()),
+    ('publish_hour', pa.int8()),
+    ('publish_day_of_week', pa.int8()),
+    ('publish_month', pa.int8()),
+    ('title_length', pa.int16()),
+    ('description_length', pa.int32()),
+    ('tag_count', pa.int16()),
+    ('performance_class', pa.dictionary(pa.int8(), pa.string())),
+    ('sample_key', pa.int64()),
+])
+
+EXPORT_SCHEMA = pa.schema(list(VIDEO_SCHEMA) + list(PARTITION_SCHEMA))
+
+
+def iter_video_batches(db_path, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the videos table as Arrow record batches in EXPORT_SCHEMA."""
+    conn = sqlite3.connect(Path(db_path).resolve().as_uri() + '?mode=ro', uri=True)
+    query = f"""
+        SELECT {', '.join(EXPORT_SCHEMA.names[:-1])}, substr(trending_date, 1, 7) as trending_month
+        FROM videos
+    """
+    try:
+        for chunk in pd.read_sql_query(query, conn, chunksize=chunk_size):
+            chunk['trending_date'] = pd.to_datetime(chunk['trending_date']).dt.date
+            chunk['publish_time'] = pd.to_datetime(chunk['publish_time'], utc=True, format='ISO8601')
+            yield pa.RecordBatch.from_pandas(chunk, schema=EXPORT_SCHEMA, preserve_index=False)
+    finally:
+        conn.close()
+
+
+def replace_directory(staging_dir, target_dir):
+    """Swap a fully written staging directory in place of the target directory."""
+    old_dir = target_dir.with_name(target_dir.name + '.old')
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if target_dir.exists():
+        os.replace(target_dir, old_dir)
+    os.replace(staging_dir, target_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def write_videos_dataset(db_path, out_dir):
+    """
+    Write the videos table to a new partitioned Parquet dataset.
+
+    Returns:
+    int: Number of rows written
+    """
+    total_rows = 0
+
+    def counted_batches():
+        nonlocal total_rows
+        for batch in iter_video_batches(db_path):
+            total_rows += batch.num_rows
+            print(f"   Exported {total_rows:,} videos...", end='\r')
+            yield batch
+
+    ds.write_dataset(
+        counted_batches(),
+        out_dir,
+        schema=EXPORT_SCHEMA,
+        format='parquet',
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+        basename_template='part-{i}.parquet',
+        existing_data_behavior='error',
+    )
+    print(f"\n   {'videos':20s}: {total_rows:,} rows")
+    return total_rows
+
+
+def write_table_file(db_path, table, out_path, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Write one SQLite table to a single Parquet file.
+
+    The Arrow schema follows the declared column types, so a chunk that
+    happens to be all NULL in some column still matches the file schema.
+    """
+    conn = sqlite3.connect(Path(db_path).resolve().as_uri() + '?mode=ro', uri=True)
+    try:
+        columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+        schema = pa.schema([(col[1], SQLITE_ARROW_TYPES.get(col[2].upper(), pa.string())) for col in columns])
+        total_rows = 0
+        with pq.ParquetWriter(out_path, schema) as writer:
+            for chunk in pd.read_sql_query(f"SELECT * FROM {table}", conn, chunksize=chunk_size):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                total_rows += len(chunk)
+    finally:
+        conn.close()
+    print(f"   {table:20s}: {total_rows:,} rows")
+    return total_rows
+
+
+def export_snapshot(db_path, out_dir=None):
+    """
+    Export a database to a Parquet snapshot directory.
+
+    The snapshot is written next to the target and swapped in only once
+    every table is complete, so readers never see a half-written or mixed
+    snapshot.
+
+    Parameters:
+    db_path (Path): SQLite database to export
+    out_dir (Path): Snapshot directory, replaced as a whole (default: SNAPSHOT_DIR)
+
+    Returns:
+    int: Number of videos rows written
+    """
+    out_dir = Path(out_dir or SNAPSHOT_DIR)
+    staging_dir = out_dir.with_name(out_dir.name + '.staging')
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    staging_dir.mkdir(parents=True)
+
+    start = time.perf_counter()
+    total_rows = write_videos_dataset(db_path, staging_dir / 'videos')
+    for table in SNAPSHOT_TABLES:
+        write_table_file(db_path, table, staging_dir / f'{table}.parquet')
+    replace_directory(staging_dir, out_dir)
+
+    size = sum(f.stat().st_size for f in out_dir.rglob('*.parquet'))
+    print(f"\n   Wrote snapshot to {out_dir} ({size / 1024 / 1024:.2f} MB) "
+          f"in {time.perf_counter() - start:.1f}s")
+    return total_rows
+
+
+def open_videos_snapshot(path=None):
+    """Open the videos dataset of a snapshot as a memory-mapped pyarrow dataset."""
+    return ds.dataset(
+        path or SNAPSHOT_DIR / 'videos',
+        format='parquet',
+        partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+        filesystem=pafs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def read_videos_snapshot(columns=None, countries=None, path=None):
+    """
+    Read columns of the videos snapshot into a DataFrame.
+
+    Parameters:
+    columns (list): Columns to read; all columns when None
+    countries (list): Only read these country partitions
+    path (Path): Videos dataset directory (default: SNAPSHOT_DIR / 'videos')
+
+    Returns:
+    DataFrame: The requested columns
+    """
+    dataset = open_videos_snapshot(path)
+    row_filter = ds.field('country').isin(countries) if countries else None
+    return dataset.to_table(columns=columns, filter=row_filter).to_pandas()
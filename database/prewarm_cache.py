@@ -0,0 +1,138 @@
+"""
+Result Cache Prewarming
+
+Runs every query the dashboard pages can issue, for every filter value
+their widgets offer, so the on-disk result cache (result_cache.py) already
+holds each result when the first user opens a page after a rebuild. The
+queries run concurrently through db_utils.run_queries, and each one's time
+is printed as it finishes.
+
+create_database.py runs this after every build unless --no-prewarm is given.
+
+Usage:
+    python database/prewarm_cache.py
+    python database/prewarm_cache.py --db path/to/youtube_trends.db
+"""
+
+import argparse
+import functools
+import sys
+import time
+from pathlib import Path
+
+from streamlit.logger import set_log_level
+
+# st.cache_data warns when used outside a running Streamlit app; set before
+# db_utils is imported, so its decorators do not flood the build output
+set_log_level('error')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from database import db_utils as db
+
+# Analysis section 1 country control, as db_utils filters
+ANALYSIS_COUNTRY_FILTERS = [None, ['US'], ['CA'], ['GB']]
+
+# Database Tables page country selectbox
+TABLE_COUNTRY_FILTERS = ['All', 'US', 'CA', 'GB']
+
+
+def describe_call(func, *args, **kwargs):
+    """Format a call for the timing report."""
+    arguments = [repr(arg) for arg in args] + [f"{name}={value!r}" for name, value in kwargs.items()]
+    return f"{func.__name__}({', '.join(arguments)})"
+
+
+def page_requests():
+    """
+    List the calls the Analysis and Database Tables pages make, with the
+    exact arguments each of their filter settings passes.
+
+    Returns:
+    dict: Call description -> zero-argument callable, for run_queries
+    """
+    calls = []
+
+    # Analysis page: section 1, section 3 (all categories, then each one
+    # in its selectbox) and the bundle behind sections 4-11
+    calls += [(db.get_country_stats, (countries,), {}) for countries in ANALYSIS_COUNTRY_FILTERS]
+    calls.append((db.get_all_categories, (), {}))
+    category_names = sorted(db.get_all_categories()['category_name'].tolist())
+    calls += [(db.get_category_stats, (None, categories), {})
+              for categories in [None] + [[name] for name in category_names]]
+    calls.append((db.get_analysis_bundle, (None,),
+                  {'sample_size': 4000, 'top_categories': 10, 'top_channels': 20}))
+
+    # Database Tables page
+    calls.append((db.get_categories_table, (), {}))
+    calls.append((db.get_channel_stats_table, (), {'limit': 50}))
+    calls.append((db.get_channel_stats_count, (), {}))
+    calls.append((db.get_videos_count, (), {}))
+    for country in TABLE_COUNTRY_FILTERS:
+        # First explorer page in the default sort order
+        calls.append((db.get_videos_page, (), {'country': country, 'page_size': 100}))
+        calls.append((db.get_videos_count, (), {'country_filter': country}))
+
+    return {
+        describe_call(func, *args, **kwargs): functools.partial(func, *args, **kwargs)
+        for func, args, kwargs in calls
+    }
+
+
+def timed(request):
+    """Wrap a request so it returns its run time in seconds."""
+    def run():
+        start = time.perf_counter()
+        request()
+        return time.perf_counter() - start
+    return run
+
+
+def prewarm_cache(db_path=None):
+    """
+    Fill the result cache with every page query.
+
+    Parameters:
+    db_path (Path): Database to warm (default: the dashboard database)
+
+    Returns:
+    dict: Call description -> seconds, or None when the disk cache is off
+    """
+    if db_path is not None:
+        db.get_db_path = lambda: str(db_path)
+
+    if db.get_result_cache_stats() is None:
+        print("   Result cache is turned off (YT_TRENDS_CACHE_MB=0), nothing to prewarm")
+        return None
+
+    print(f"   Data version {db.get_data_version()} on the {db.get_backend().name} backend")
+    requests = page_requests()
+    print(f"   Running {len(requests)} queries on {db.QUERY_WORKERS} workers...\n")
+
+    start = time.perf_counter()
+    timings = {}
+    for name, seconds in db.run_queries({name: timed(request) for name, request in requests.items()}):
+        timings[name] = seconds
+        print(f"   {seconds * 1000:9.1f} ms  {name}")
+    elapsed = time.perf_counter() - start
+
+    stats = db.get_result_cache_stats()
+    print(f"\n   Prewarmed {len(timings)} queries in {elapsed:.2f}s "
+          f"(sum of query times {sum(timings.values()):.2f}s)")
+    print(f"   Cache: {stats['entries']} entries, {stats['bytes'] / 1024 / 1024:.2f} MB "
+          f"in {stats['directory']}")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the dashboard's result cache with every page query.")
+    parser.add_argument('--db', type=Path, help="database to warm (default: the dashboard database)")
+    args = parser.parse_args()
+
+    print("="*80)
+    print("PREWARMING RESULT CACHE")
+    print("="*80)
+    prewarm_cache(args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+On-Disk Query Result Cache
+
+Results of the cached db_utils query functions are pickled to one file per
+call, so a restarted dashboard or a new replica pointed at the same
+directory starts with the results earlier processes computed instead of
+an empty cache. Entries live under a directory named after the data
+version that create_database.py stamps into the database on every build,
+so a rebuild invalidates the whole cache at once; nothing expires on a
+timer. The cache is capped in size and evicts the least recently used
+entries first.
+
+Layout:
+    database/result_cache/<data version>/<function>-<argument digest>.pkl
+
+Environment:
+    YT_TRENDS_CACHE_DIR   Cache directory (default: database/result_cache)
+    YT_TRENDS_CACHE_MB    Size cap in MB; 0 turns the disk cache off (default: 512)
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = BASE_DIR / 'database' / 'result_cache'
+DEFAULT_CACHE_MB = 512
+
+CACHE_DIR_ENV_VAR = 'YT_TRENDS_CACHE_DIR'
+CACHE_SIZE_ENV_VAR = 'YT_TRENDS_CACHE_MB'
+
+ENTRY_SUFFIX = '.pkl'
+
+
+class ResultCache:
+    """
+    Pickled query results in a size-capped directory.
+
+    Reads and writes are safe across threads and processes: an entry is
+    written to a temporary file and renamed into place, so readers only
+    ever see complete files. A hit refreshes the entry's modification
+    time, which eviction uses as its last-used time.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evicted = 0
+
+    def entry_path(self, version, name, key):
+        """Return the file of one cached call."""
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return self.directory / str(version) / f"{name}-{digest}{ENTRY_SUFFIX}"
+
+    def _entries(self):
+        """List (path, stat) for every entry, oldest use first."""
+        entries = []
+        for path in self.directory.glob(f'*/*{ENTRY_SUFFIX}'):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                pass
+        entries.sort(key=lambda entry: entry[1].st_mtime_ns)
+        return entries
+
+    def _current_size(self):
+        """Total bytes on disk, counted once and then tracked."""
+        if self._size is None:
+            self._size = sum(stat.st_size for _, stat in self._entries())
+        return self._size
+
+    def get(self, version, name, key):
+        """
+        Look up a cached result.
+
+        Returns:
+        tuple: (True, result) on a hit, (False, None) on a miss
+        """
+        path = self.entry_path(version, name, key)
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False, None
+        except (OSError, pickle.UnpicklingError, EOFError):
+            # A damaged entry is a miss; the next put() replaces it
+            with self._lock:
+                self.misses += 1
+            return False, None
+        with self._lock:
+            self.hits += 1
+        return True, result
+
+    def put(self, version, name, key, result):
+        """Store a result, then evict old entries if over the size cap."""
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        path = self.entry_path(version, name, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            # An overwritten entry's bytes leave the cache with it
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        with self._lock:
+            self.writes += 1
+            if self._size is not None:
+                self._size += len(data) - replaced
+            over_cap = self._current_size() > self.max_bytes
+        if over_cap:
+            self.evict()
+
+    def get_or_compute(self, version, name, key, compute):
+        """Return the cached result of a call, computing and storing it on a miss."""
+        hit, result = self.get(version, name, key)
+        if not hit:
+            result = compute()
+            self.put(version, name, key, result)
+        return result
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits its cap."""
+        with self._lock:
+            # Recount from disk; other processes write to the same directory
+            entries = self._entries()
+            size = sum(stat.st_size for _, stat in entries)
+            for path, stat in entries:
+                if size <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                size -= stat.st_size
+                self.evicted += 1
+            self._size = size
+
+    def purge_versions(self, keep):
+        """Delete the entries of every data version except keep."""
+        if not self.directory.is_dir():
+            return
+        with self._lock:
+            for version_dir in self.directory.iterdir():
+                if version_dir.is_dir() and version_dir.name != str(keep):
+                    shutil.rmtree(version_dir, ignore_errors=True)
+            self._size = None
+
+    def clear(self, name=None):
+        """Delete the entries of one function, or every entry when name is None."""
+        pattern = f'*/{name}-*{ENTRY_SUFFIX}' if name else f'*/*{ENTRY_SUFFIX}'
+        with self._lock:
+            for path in self.directory.glob(pattern):
+                path.unlink(missing_ok=True)
+            self._size = None
+
+    def stats(self):
+        """Return hit, miss, write and eviction counts and the bytes on disk."""
+        with self._lock:
+            return {
+                'directory': str(self.directory),
+                'entries': len(self._entries()),
+                'bytes': self._current_size(),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evicted': self.evicted,
+            }
+
+
+# One cache per (directory, cap) for the life of the process
+_result_caches = {}
+_result_caches_lock = threading.Lock()
+
+
+def get_result_cache():
+    """
+    Get the disk cache configured by the environment.
+
+    Returns:
+    ResultCache: The shared cache, or None when YT_TRENDS_CACHE_MB is 0
+    """
+    max_mb = float(os.environ.get(CACHE_SIZE_ENV_VAR, DEFAULT_CACHE_MB))
+    if max_mb <= 0:
+        return None
+    directory = Path(os.environ.get(CACHE_DIR_ENV_VAR, DEFAULT_CACHE_DIR)).resolve()
+    key = (str(directory), int(max_mb * 1024 * 1024))
+    with _result_caches_lock:
+        if key not in _result_caches:
+            _result_caches[key] = ResultCache(*key)
+        return _result_caches[key]
@@ -0,0 +1,228 @@
+"""
+Read-Only SQL Console
+
+Runs ad-hoc SELECT queries typed into the SQL Console page against the
+SQLite database, with guards so a bad query cannot hurt the dashboard:
+
+    - Each query gets its own read-only connection (mode=ro, query_only) and
+      an authorizer that only allows reading, so it cannot write, ATTACH
+      other files or change pragmas. The db_utils connection pool is never
+      handed a connection that a console query has touched.
+    - A progress handler aborts the query once its time budget is spent,
+      while it is planning, sorting or being fetched. Only time inside
+      SQLite counts: the clock stops while the page shows a fetched batch.
+    - Rows are fetched in batches and fetching stops at a hard row cap, so a
+      query over every videos row never materializes the whole table.
+    - Only a few console queries run at once; further ones are turned away
+      instead of queueing behind them.
+
+SQLite releases the GIL while it steps a statement, so a long console query
+only occupies the script thread of the session that ran it.
+
+The console always reads the SQLite file, whichever backend YT_TRENDS_BACKEND
+selects for the dashboard queries.
+
+Usage:
+    query = ConsoleQuery("SELECT country, COUNT(*) FROM videos GROUP BY country")
+    plan_df = query.plan()
+    with contextlib.closing(query.batches()) as batches:
+        for batch_df in batches:
+            ...
+    query.rows, query.truncated, query.elapsed
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from database.backends import READ_PRAGMAS
+
+# Limits the page offers, and the hard caps it cannot go past
+DEFAULT_TIMEOUT_SECONDS = 5
+MAX_TIMEOUT_SECONDS = 30
+DEFAULT_MAX_ROWS = 10_000
+MAX_ROWS = 100_000
+
+# Rows fetched per batch
+BATCH_ROWS = 1_000
+
+# SQLite virtual machine instructions between two time limit checks
+PROGRESS_INSTRUCTIONS = 10_000
+
+# Console queries allowed to run at the same time in one process
+MAX_CONCURRENT_QUERIES = 2
+
+# Authorizer actions a read-only query needs; everything else is denied
+ALLOWED_ACTIONS = {
+    sqlite3.SQLITE_SELECT,
+    sqlite3.SQLITE_READ,
+    sqlite3.SQLITE_FUNCTION,
+    sqlite3.SQLITE_RECURSIVE,
+}
+
+_running = threading.BoundedSemaphore(MAX_CONCURRENT_QUERIES)
+
+
+def authorize(action, arg1, arg2, db_name, trigger):
+    """SQLite authorizer that allows reads and denies everything else."""
+    return sqlite3.SQLITE_OK if action in ALLOWED_ACTIONS else sqlite3.SQLITE_DENY
+
+
+def open_console_connection(db_path):
+    """
+    Open a dedicated read-only connection for console queries.
+
+    Not taken from the db_utils pool: the console installs its own
+    authorizer and progress handler, and closing the connection after every
+    query guarantees none of them is left behind.
+    """
+    conn = sqlite3.connect(Path(db_path).resolve().as_uri() + '?mode=ro', uri=True)
+    for pragma, value in READ_PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    conn.set_authorizer(authorize)
+    return conn
+
+
+def check_sql(sql):
+    """
+    Reject SQL that is empty or incomplete. sqlite3 itself refuses a second
+    statement after the first.
+
+    Returns:
+    str: The statement without surrounding whitespace and trailing semicolons
+
+    Raises:
+    ValueError: If the SQL is not a single complete statement
+    """
+    statement = sql.strip().rstrip(';').strip()
+    if not statement:
+        raise ValueError("Enter a query to run")
+    if not sqlite3.complete_statement(statement + ';'):
+        raise ValueError("The query is incomplete (check quotes and parentheses)")
+    return statement
+
+
+class ConsoleQuery:
+    """
+    One ad-hoc query, run with a time budget and a row cap.
+
+    plan() and batches() each take one of the MAX_CONCURRENT_QUERIES slots
+    and open their own connection for as long as they run. batches() holds
+    them until it is exhausted or closed, so callers that may stop early
+    iterate it inside contextlib.closing().
+    """
+
+    def __init__(self, sql, db_path, timeout=DEFAULT_TIMEOUT_SECONDS,
+                 max_rows=DEFAULT_MAX_ROWS, batch_rows=BATCH_ROWS):
+        self.sql = check_sql(sql)
+        self.db_path = db_path
+        self.timeout = min(float(timeout), MAX_TIMEOUT_SECONDS)
+        self.max_rows = min(int(max_rows), MAX_ROWS)
+        self.batch_rows = batch_rows
+        self.rows = 0
+        self.truncated = False
+        # Seconds spent executing and fetching, excluding time between batches
+        self.elapsed = 0.0
+        self._resumed_at = None
+
+    def _resume(self):
+        """Start counting time towards the budget."""
+        self._resumed_at = time.perf_counter()
+
+    def _pause(self):
+        """Stop counting time towards the budget."""
+        if self._resumed_at is not None:
+            self.elapsed += time.perf_counter() - self._resumed_at
+            self._resumed_at = None
+
+    def _over_budget(self):
+        running = time.perf_counter() - self._resumed_at if self._resumed_at is not None else 0.0
+        return self.elapsed + running > self.timeout
+
+    def _connect(self):
+        """Take a console slot and open a connection that aborts over budget."""
+        if not _running.acquire(blocking=False):
+            raise RuntimeError(
+                f"{MAX_CONCURRENT_QUERIES} console queries are already running; try again shortly"
+            )
+        try:
+            conn = open_console_connection(self.db_path)
+        except Exception:
+            _running.release()
+            raise
+        # A non-zero return value makes SQLite interrupt the statement
+        conn.set_progress_handler(self._over_budget, PROGRESS_INSTRUCTIONS)
+        return conn
+
+    def _release(self, conn):
+        conn.close()
+        _running.release()
+
+    def _timed_out(self, error):
+        return TimeoutError(
+            f"Query stopped after the {self.timeout:g} s time limit"
+        ) if 'interrupted' in str(error) else error
+
+    def plan(self):
+        """
+        Return the EXPLAIN QUERY PLAN of the query.
+
+        Returns:
+        pd.DataFrame: id, parent and detail of each plan step
+        """
+        self.elapsed = 0.0
+        conn = self._connect()
+        try:
+            self._resume()
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {self.sql}").fetchall()
+        except sqlite3.OperationalError as e:
+            raise self._timed_out(e) from e
+        finally:
+            self._pause()
+            self._release(conn)
+        return pd.DataFrame([row[:2] + row[-1:] for row in rows], columns=['id', 'parent', 'detail'])
+
+    def batches(self):
+        """
+        Run the query and yield its rows as DataFrames of up to batch_rows,
+        indexed by row number in the result.
+
+        Stops at max_rows and sets truncated when more rows were left.
+        rows and elapsed are updated after every batch. The time limit
+        applies to elapsed, so the time the caller takes to handle a batch
+        is not charged to the query.
+
+        Raises:
+        TimeoutError: If the query runs past its time limit
+        sqlite3.Error: If SQLite rejects the query (including the authorizer)
+        """
+        self.rows = 0
+        self.truncated = False
+        self.elapsed = 0.0
+        conn = self._connect()
+        try:
+            self._resume()
+            cursor = conn.execute(self.sql)
+            columns = [col[0] for col in cursor.description or []]
+            while self.rows < self.max_rows:
+                batch = cursor.fetchmany(min(self.batch_rows, self.max_rows - self.rows))
+                if not batch:
+                    break
+                batch_df = pd.DataFrame.from_records(batch, columns=columns)
+                batch_df.index = pd.RangeIndex(self.rows, self.rows + len(batch))
+                self.rows += len(batch)
+                self._pause()
+                yield batch_df
+                self._resume()
+            else:
+                # One more row tells whether the cap cut the result short
+                self.truncated = cursor.fetchone() is not None
+            cursor.close()
+        except sqlite3.OperationalError as e:
+            raise self._timed_out(e) from e
+        finally:
+            self._pause()
+            self._release(conn)
@@ -3,6 +3,7 @@ This script sets up the Streamlit application for YouTube Trending Videos Analys
 """
 # Link to Kaggle Dataset for download: https://www.kaggle.com/datasets/datasnaek/youtube-new
 
+import os
 import streamlit as st
 
 # Page configuration
@@ -140,11 +141,18 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Sidebar Navigation
-pg = st.navigation([
+pages = [
     st.Page("pages/home.py", title="Home", default=True),
     st.Page("pages/analysis.py", title=" Analysis"),
-    st.Page("pages/database_tables.py", title="Database Tables")
-])
+    st.Page("pages/database_tables.py", title="Database Tables"),
+    st.Page("pages/sql_console.py", title="SQL Console")
+]
+
+# Query diagnostics page, only listed when YT_TRENDS_DIAGNOSTICS is set
+if os.environ.get("YT_TRENDS_DIAGNOSTICS", "") not in ("", "0"):
+    pages.append(st.Page("pages/diagnostics.py", title="Diagnostics"))
+
+pg = st.navigation(pages)
 
 # Run the selected page
 pg.run()
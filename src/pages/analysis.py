@@ -272,15 +272,18 @@ def show():
     countries_filter = None
     categories_filter = None
 
+    # Sections 4-11 read their slice of one bundle, whose queries run
+    # concurrently, each on the narrowest index or summary table that answers it
+    bundle = db.get_analysis_bundle(countries_filter, sample_size=4000, top_categories=10, top_channels=20)
+
     # ============================================================================
     # SECTION 4: CORRELATION ANALYSIS
     # ============================================================================
     st.markdown('<div class="section-header"><svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#f0f0f0" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-link-icon lucide-link"><path d="M10 13a5 5 0 0 0 7.54.54l3-3a5 5 0 0 0-7.07-7.07l-1.72 1.71"/><path d="M14 11a5 5 0 0 0-7.54-.54l-3 3a5 5 0 0 0 7.07 7.07l1.71-1.71"/></svg> Correlation of Video Metrics</div>', unsafe_allow_html=True)
 
-    corr_data = db.get_correlation_data(countries_filter)
+    correlation_matrix = bundle['correlation_matrix']
 
-    if not corr_data.empty:
-        correlation_matrix = corr_data.corr()
+    if correlation_matrix.notna().any().any():
         
         chart_col, insight_col = st.columns([2, 1])
         
@@ -331,7 +334,7 @@ def show():
     # ============================================================================
     st.markdown('<div class="section-header"><svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#f0f0f0" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-alarm-clock-check" style="display: inline-block; vertical-align: middle; margin-right: 8px;"><circle cx="12" cy="13" r="8"/><path d="M5 3 2 6"/><path d="m22 6-3-3"/><path d="M6.38 18.7 4 21"/><path d="M17.64 18.67 20 21"/><path d="m9 13 2 2 4-4"/></svg> Optimal Publishing Time </div>', unsafe_allow_html=True)
 
-    time_data = db.get_publishing_time_heatmap(countries_filter)
+    time_data = bundle['publishing_heatmap']
 
     if not time_data.empty:
         # Create pivot table for heatmap
@@ -388,7 +391,13 @@ def show():
     # ============================================================================
     st.markdown('<div class="section-header"><svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#f0f0f0" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-eye" style="display: inline-block; vertical-align: middle; margin-right: 8px;"><path d="M2.062 12.348a1 1 0 0 1 0-.696 10.75 10.75 0 0 1 19.876 0 1 1 0 0 1 0 .696 10.75 10.75 0 0 1-19.876 0"/><circle cx="12" cy="12" r="3"/></svg> Views vs Engagement: Performance Classification</div>', unsafe_allow_html=True)
 
-    scatter_data = db.get_views_engagement_scatter(countries_filter, sample_size=4000)
+    stratified_sample = st.checkbox(
+        "Equal sample per performance class",
+        key="scatter_stratified",
+        help="Sample the same number of videos from each class so the rare Explosive videos stand out"
+    )
+
+    scatter_data = bundle['views_engagement_stratified'] if stratified_sample else bundle['views_engagement']
 
     if not scatter_data.empty:
         chart_col, insight_col = st.columns([2, 1])
@@ -457,40 +466,60 @@ def show():
     # ============================================================================
     st.markdown('<div class="section-header"><svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#f0f0f0" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-smile-plus" style="display: inline-block; vertical-align: middle; margin-right: 8px;"><path d="M22 11v1a10 10 0 1 1-9-10"/><path d="M8 14s1.5 2 4 2 4-2 4-2"/><line x1="9" x2="9.01" y1="9" y2="9"/><line x1="15" x2="15.01" y1="9" y2="9"/><path d="M16 5h6"/><path d="M19 2v6"/></svg> Engagement Distribution by Category</div>', unsafe_allow_html=True)
 
-    engagement_data = db.get_engagement_by_category(countries_filter, top_n=10)
+    engagement_data = bundle['engagement_by_category']
+    engagement_boxes = engagement_data['boxes']
 
-    if not engagement_data.empty:
+    if not engagement_boxes.empty:
         chart_col, insight_col = st.columns([2, 1])
         
         with chart_col:
-            # Get top categories by count for ordering
-            category_order = engagement_data.groupby('category_name').size().sort_values(ascending=False).index.tolist()
-            
-            fig = px.box(
-                engagement_data,
-                y='category_name',
-                x='engagement_rate',
-                category_orders={'category_name': category_order},
-                title='Engagement Rate Distribution by Category (Top 10)',
-                labels={
-                    'engagement_rate': 'Engagement Rate (%)',
-                    'category_name': 'Category'
-                },
-                color='category_name',
-                color_discrete_sequence=px.colors.qualitative.Set2
-            )
+            # Boxes come precomputed, most rows first; draw one trace per
+            # category so each keeps its own color, as px.box did
+            fig = go.Figure()
+            colors = px.colors.qualitative.Set2
+            for i, box in enumerate(engagement_boxes.itertuples()):
+                color = colors[i % len(colors)]
+                fig.add_trace(go.Box(
+                    y=[box.category_name],
+                    q1=[box.q1],
+                    median=[box.median],
+                    q3=[box.q3],
+                    lowerfence=[box.lowerfence],
+                    upperfence=[box.upperfence],
+                    name=box.category_name,
+                    orientation='h',
+                    marker_color=color
+                ))
+                outliers = engagement_data['outliers']
+                outliers = outliers[outliers['category_name'] == box.category_name]
+                fig.add_trace(go.Scatter(
+                    x=outliers['engagement_rate'],
+                    y=outliers['category_name'],
+                    name=box.category_name,
+                    mode='markers',
+                    marker_color=color,
+                    hovertemplate='Category=%{y}<br>Engagement Rate (%)=%{x}<extra></extra>'
+                ))
             
             fig.update_layout(
+                title='Engagement Rate Distribution by Category (Top 10)',
                 height=600,
                 showlegend=False,
                 xaxis_title="Engagement Rate (%)",
                 yaxis_title="Category"
             )
+            # Largest category at the top
+            fig.update_yaxes(categoryorder='array', categoryarray=engagement_boxes['category_name'].tolist()[::-1])
             
             # Limit x-axis to remove extreme outliers
-            fig.update_xaxes(range=[0, engagement_data['engagement_rate'].quantile(0.95)])
+            fig.update_xaxes(range=[0, engagement_data['p95']])
             
             st.plotly_chart(fig, use_container_width=True)
+            
+            outlier_total = engagement_boxes['outlier_count'].sum()
+            if outlier_total > len(engagement_data['outliers']):
+                st.caption(f"Showing an evenly spaced sample of {len(engagement_data['outliers']):,} "
+                           f"of {outlier_total:,} outliers")
         
         with insight_col:
             st.markdown("""
@@ -522,7 +551,7 @@ def show():
     # ============================================================================
     st.markdown('<div class="section-header"><svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#f0f0f0" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-trophy" style="display: inline-block; vertical-align: middle; margin-right: 8px;"><path d="M10 14.66v1.626a2 2 0 0 1-.976 1.696A5 5 0 0 0 7 21.978"/><path d="M14 14.66v1.626a2 2 0 0 0 .976 1.696A5 5 0 0 1 17 21.978"/><path d="M18 9h1.5a1 1 0 0 0 0-5H18"/><path d="M4 22h16"/><path d="M6 9a6 6 0 0 0 12 0V3a1 1 0 0 0-1-1H7a1 1 0 0 0-1 1z"/><path d="M6 9H4.5a1 1 0 0 1 0-5H6"/></svg> Top Performing Channels</div>', unsafe_allow_html=True)
 
-    channel_data = db.get_top_channels(countries_filter, top_n=20)
+    channel_data = bundle['top_channels']
 
     if not channel_data.empty:
         chart_col, insight_col = st.columns([2, 1])
@@ -582,21 +611,25 @@ def show():
     # ============================================================================
     st.markdown('<div class="section-header"><svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#f0f0f0" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-fast-forward" style="display: inline-block; vertical-align: middle; margin-right: 8px;"><path d="M12 6a2 2 0 0 1 3.414-1.414l6 6a2 2 0 0 1 0 2.828l-6 6A2 2 0 0 1 12 18z"/><path d="M2 6a2 2 0 0 1 3.414-1.414l6 6a2 2 0 0 1 0 2.828l-6 6A2 2 0 0 1 2 18z"/></svg> How Long Does it Take to Go Viral?</div>', unsafe_allow_html=True)
 
-    days_data = db.get_days_to_trending(countries_filter)
+    days_data = bundle['days_to_trending']
 
-    if not days_data.empty:
+    if days_data['count']:
         chart_col, insight_col = st.columns([2, 1])
         
         with chart_col:
-            median_days = days_data['days_to_trending'].median()
-            mean_days = days_data['days_to_trending'].mean()
+            median_days = days_data['median']
+            mean_days = days_data['mean']
             
             fig = go.Figure()
             
-            # Histogram
-            fig.add_trace(go.Histogram(
-                x=days_data['days_to_trending'],
-                nbinsx=50,
+            # Histogram, binned in the database
+            edges = days_data['edges']
+            fig.add_trace(go.Bar(
+                x=(edges[:-1] + edges[1:]) / 2,
+                y=days_data['counts'],
+                width=edges[1:] - edges[:-1],
+                customdata=list(zip(edges[:-1], edges[1:])),
+                hovertemplate='Days %{customdata[0]:.1f}-%{customdata[1]:.1f}<br>Frequency=%{y}<extra></extra>',
                 name='Frequency',
                 marker_color='skyblue',
                 marker_line_color='black',
@@ -629,7 +662,8 @@ def show():
                 xaxis_title='Days from Publish to Trending',
                 yaxis_title='Frequency',
                 height=500,
-                showlegend=False
+                showlegend=False,
+                bargap=0
             )
             
             st.plotly_chart(fig, use_container_width=True)
@@ -661,7 +695,7 @@ def show():
     # ============================================================================
     st.markdown('<div class="section-header"><svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#f0f0f0" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-notebook-pen" style="display: inline-block; vertical-align: middle; margin-right: 8px;"><path d="M13.4 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2v-7.4"/><path d="M2 6h4"/><path d="M2 10h4"/><path d="M2 14h4"/><path d="M2 18h4"/><path d="M21.378 5.626a1 1 0 1 0-3.004-3.004l-5.01 5.012a2 2 0 0 0-.506.854l-.837 2.87a.5.5 0 0 0 .62.62l2.87-.837a2 2 0 0 0 .854-.506z"/></svg> Does Title Length Affect Success?</div>', unsafe_allow_html=True)
 
-    title_data = db.get_title_length_analysis(countries_filter)
+    title_data = bundle['title_length']
 
     if not title_data.empty:
         chart_col, insight_col = st.columns([2, 1])
@@ -722,7 +756,7 @@ def show():
     # ============================================================================
     st.markdown('<div class="section-header"><svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="#f0f0f0" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-tags" style="display: inline-block; vertical-align: middle; margin-right: 8px;"><path d="M13.172 2a2 2 0 0 1 1.414.586l6.71 6.71a2.4 2.4 0 0 1 0 3.408l-4.592 4.592a2.4 2.4 0 0 1-3.408 0l-6.71-6.71A2 2 0 0 1 6 9.172V3a1 1 0 0 1 1-1z"/><path d="M2 7v6.172a2 2 0 0 0 .586 1.414l6.71 6.71a2.4 2.4 0 0 0 3.191.193"/><circle cx="10.5" cy="6.5" r=".5" fill="currentColor"/></svg> Impact of Tag Count on Performance</div>', unsafe_allow_html=True)
 
-    tag_data = db.get_tag_analysis(countries_filter)
+    tag_data = bundle['tag_analysis']
 
     if not tag_data.empty:
         chart_col, insight_col = st.columns([2, 1])
@@ -86,23 +86,93 @@ def show():
     # VIDEOS TABLE
     # ============================================================================
     st.markdown("### <svg xmlns='http://www.w3.org/2000/svg' width='24' height='24' viewBox='0 0 24 24' fill='none' stroke='#f0f0f0' stroke-width='2' stroke-linecap='round' stroke-linejoin='round' class='lucide lucide-clapperboard' style='display: inline-block; vertical-align: -3px; margin-right: 8px;'><path d='M20.2 6 3 11l-.9-2.4c-.3-1.1.3-2.2 1.3-2.5l13.5-4c1.1-.3 2.2.3 2.5 1.3Z'/><path d='m6.2 5.3 3.1 3.9'/><path d='m12.4 3.4 3.1 4'/><path d='M3 11h18v8a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2Z'/></svg> Videos Table", unsafe_allow_html=True)
-    st.markdown("*Detailed information about trending videos*")
+    st.markdown("*Detailed information about trending videos, browsable page by page*")
     
-    # Add filter options for videos table
-    country_filter_table = st.selectbox(
-        "Filter by Country:",
-        ["All", "US", "CA", "GB"],
-        key="table_country_filter"
-    )
+    # Explorer filters and sort order
+    filter_cols = st.columns(3)
+    with filter_cols[0]:
+        country_filter_table = st.selectbox(
+            "Filter by Country:",
+            ["All", "US", "CA", "GB"],
+            key="table_country_filter"
+        )
+    with filter_cols[1]:
+        try:
+            categories = db.get_all_categories()
+            category_names = dict(zip(categories['category_id'], categories['category_name']))
+        except Exception:
+            category_names = {}
+        category_filter = st.selectbox(
+            "Filter by Category:",
+            [None] + list(category_names),
+            format_func=lambda category_id: "All" if category_id is None else category_names[category_id],
+            key="table_category_filter"
+        )
+    with filter_cols[2]:
+        channel_filter = st.text_input(
+            "Filter by Channel (exact title):",
+            key="table_channel_filter"
+        ).strip() or None
+    
+    sort_cols = st.columns(2)
+    with sort_cols[0]:
+        sort_by = st.selectbox(
+            "Sort by:",
+            list(db.EXPLORER_SORT_COLUMNS),
+            format_func=lambda col: col.replace('_', ' ').title(),
+            key="table_sort_by"
+        )
+    with sort_cols[1]:
+        descending = st.radio(
+            "Order:",
+            ["Descending", "Ascending"],
+            horizontal=True,
+            key="table_sort_order"
+        ) == "Descending"
+    
+    # Cursors of the pages visited so far; page N starts after cursors[N-1].
+    # Any change of filters or sort order starts again from the first page.
+    explorer_state = (country_filter_table, category_filter, channel_filter, sort_by, descending)
+    if st.session_state.get("table_explorer_state") != explorer_state:
+        st.session_state.table_explorer_state = explorer_state
+        st.session_state.table_cursors = [None]
+    cursors = st.session_state.table_cursors
+    page_size = 100
     
     try:
-        videos_df = db.get_videos_table(country_filter=country_filter_table, limit=100)
+        videos_df, next_cursor = db.get_videos_page(
+            sort_by=sort_by,
+            descending=descending,
+            after=cursors[-1],
+            country=country_filter_table,
+            category_id=category_filter,
+            channel=channel_filter,
+            page_size=page_size
+        )
         st.dataframe(videos_df, use_container_width=True, height=600)
         
         total_videos = db.get_videos_count()
-        filtered_count = db.get_videos_count(country_filter=country_filter_table)
+        filtered_count = db.get_videos_count(
+            country_filter=country_filter_table,
+            category_id=category_filter,
+            channel=channel_filter
+        )
+        
+        first_row = (len(cursors) - 1) * page_size + 1 if len(videos_df) else 0
+        last_row = (len(cursors) - 1) * page_size + len(videos_df)
+        st.caption(f"**Showing videos {first_row:,}-{last_row:,} of {filtered_count:,}** | Total videos in database: {total_videos:,}")
         
-        st.caption(f"**Showing top 100 of {filtered_count:,} videos** | Total videos in database: {total_videos:,}")
+        nav_cols = st.columns([1, 1, 6])
+        with nav_cols[0]:
+            if st.button("← Previous", disabled=len(cursors) == 1, key="table_prev_page"):
+                cursors.pop()
+                st.rerun()
+        with nav_cols[1]:
+            if st.button("Next →", disabled=next_cursor is None, key="table_next_page"):
+                cursors.append(next_cursor)
+                st.rerun()
+        with nav_cols[2]:
+            st.markdown(f"Page {len(cursors)}")
     except Exception as e:
         st.error(f"Error loading videos table: {e}")
     
@@ -136,20 +206,16 @@ def show():
         CREATE TABLE videos (
             video_id TEXT,
             trending_date DATE,
-            title TEXT,
             channel_title TEXT,
             category_id INTEGER,
             publish_time TIMESTAMP,
-            tags TEXT,
             views INTEGER,
             likes INTEGER,
             dislikes INTEGER,
             comment_count INTEGER,
-            thumbnail_link TEXT,
             comments_disabled BOOLEAN,
             ratings_disabled BOOLEAN,
             video_error_or_removed BOOLEAN,
-            description TEXT,
             country TEXT,
             engagement_rate DOUBLE,
             days_to_trending INTEGER,
@@ -161,6 +227,21 @@ def show():
             FOREIGN KEY (category_id) REFERENCES categories(category_id)
         )
         """, language="sql")
+        
+        st.markdown("### Video Text Table Schema")
+        st.code("""
+        CREATE TABLE video_text (
+            video_id TEXT,
+            trending_date DATE,
+            country TEXT,
+            title TEXT,
+            tags TEXT,
+            thumbnail_link TEXT,
+            description TEXT,
+            PRIMARY KEY (video_id, trending_date, country),
+            FOREIGN KEY (video_id, trending_date, country) REFERENCES videos
+        )
+        """, language="sql")
 
 
 # Calling the show function to display the page
@@ -0,0 +1,87 @@
+import streamlit as st
+import pandas as pd
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from database import db_utils as db
+from database import diagnostics
+
+# Columns of the recent calls table, most useful first
+CALL_COLUMNS = ['started', 'function', 'cache', 'wall_ms', 'db_ms', 'convert_ms', 'rows', 'result_kb', 'arguments']
+
+
+def show():
+    """Display the Diagnostics page with query timings, cache hits and plans."""
+
+    st.markdown("# Query Diagnostics")
+    st.markdown("""
+    ##### Timings, cache hits and query plans of the db_utils query functions called by this process.
+    ##### Only the most recent calls are kept; set YT_TRENDS_QUERY_LOG to log every call to a file.
+    """
+    )
+
+    calls = diagnostics.get_recent_calls()
+
+    # ============================================================================
+    # PER-FUNCTION SUMMARY
+    # ============================================================================
+    st.markdown("### Functions by Total Wall Time")
+    st.markdown("*Database, conversion, row and size columns average the calls that missed every cache*")
+    st.dataframe(diagnostics.summarize_calls(calls), use_container_width=True, hide_index=True)
+
+    cache_cols = st.columns(2)
+    with cache_cols[0]:
+        st.markdown("**Result cache (disk)**")
+        st.json(db.get_result_cache_stats() or {'disabled': True})
+    with cache_cols[1]:
+        st.markdown("**Connection pool**")
+        st.json(db.get_connection_stats() or {'backend': db.get_backend().name, 'pooled': False})
+
+    st.markdown("---")
+
+    # ============================================================================
+    # RECENT CALLS
+    # ============================================================================
+    st.markdown("### Recent Calls")
+
+    if not calls:
+        st.info("No query functions have been called yet. Open the Analysis or Database Tables page first.")
+        return
+
+    calls_df = pd.DataFrame(calls).iloc[::-1].reset_index(drop=True)
+    calls_df['started'] = pd.to_datetime(calls_df['started_at'], unit='s').dt.strftime('%H:%M:%S')
+    calls_df['result_kb'] = calls_df['result_bytes'].astype(float) / 1024
+    calls_df['arguments'] = calls_df['arguments'].apply(
+        lambda args: ', '.join(f"{name}={value}" for name, value in args.items())
+    )
+    st.dataframe(calls_df[CALL_COLUMNS], use_container_width=True, height=400)
+
+    selected = st.selectbox(
+        "Show statements of call:",
+        calls_df.index,
+        format_func=lambda i: f"#{i} {calls_df.at[i, 'function']} ({calls_df.at[i, 'cache']}, {calls_df.at[i, 'wall_ms']:.1f} ms)",
+        key="diagnostics_call"
+    )
+    statements = calls_df.at[selected, 'statements']
+    if not statements:
+        st.caption("This call ran no statements (it was answered from a cache).")
+    for statement in statements:
+        st.markdown(f"**{statement['db_ms']:.1f} ms in the database, {statement['convert_ms']:.1f} ms converting, "
+                    f"{statement['rows']:,} rows**")
+        st.code(statement['sql'], language="sql")
+        st.code('\n'.join(statement['plan']), language="text")
+
+    log_lines = '\n'.join(json.dumps(call, default=str) for call in calls) + '\n'
+    action_cols = st.columns([1, 1, 4])
+    with action_cols[0]:
+        st.download_button("Download JSON Lines", log_lines, file_name="query_log.jsonl", mime="application/x-ndjson")
+    with action_cols[1]:
+        if st.button("Clear", key="diagnostics_clear"):
+            diagnostics.clear_recent_calls()
+            st.rerun()
+
+
+# Calling the show function to display the page
+show()
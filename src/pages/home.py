@@ -78,7 +78,17 @@ def show():
     - **Videos Table** - detailed information on all trending videos
     - **Table Schemas** showing database structure
     
-    **Best for:** Exploring raw data and performing custom analysis
+    **Best for:** Exploring raw data
+    """)
+    
+    st.markdown("###  3. SQL Console Page")
+    st.info("""
+    **What you'll find:**
+    - **Read-only SQL editor** for your own SELECT queries on every table
+    - **Query Plan** showing which indexes SQLite uses
+    - **Results streamed in batches** with a time limit and a row limit
+    
+    **Best for:** Performing custom analysis
     """)
     
     st.markdown("---")
@@ -107,6 +117,7 @@ def show():
     **Use the sidebar navigation** to switch between pages:
     - Start with **Analysis** to explore insights and visualizations
     - Visit **Database Tables** to examine the raw data
+    - Open **SQL Console** to query the data yourself
     - Use filters on each page to customize your view
     """)
     
@@ -0,0 +1,92 @@
+import streamlit as st
+import pandas as pd
+import contextlib
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from database import db_utils as db
+from database import sql_console as console
+
+EXAMPLE_QUERY = """SELECT c.category_name, COUNT(*) AS trending_days, AVG(v.engagement_rate) AS avg_engagement
+FROM videos v
+JOIN categories c ON c.category_id = v.category_id
+WHERE v.country = 'US'
+GROUP BY c.category_name
+ORDER BY trending_days DESC"""
+
+
+def show():
+    """Display the SQL Console page for read-only ad-hoc queries."""
+
+    st.markdown("""# <svg xmlns="http://www.w3.org/2000/svg" width="45" height="45" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-square-terminal"><path d="m7 11 2-2-2-2"/><path d="M11 13h4"/><rect width="18" height="18" x="3" y="3" rx="2" ry="2"/></svg> SQL Console
+    """, unsafe_allow_html=True)
+
+    st.markdown("""
+    ##### Run your own read-only SELECT queries against the YouTube Trends Database.
+    ##### Queries cannot modify data, are stopped when they run past the time limit and return at most the row limit.
+    """
+    )
+
+    sql = st.text_area("SQL query:", value=EXAMPLE_QUERY, height=200, key="console_sql")
+
+    limit_cols = st.columns(2)
+    with limit_cols[0]:
+        timeout = st.number_input(
+            "Time limit (seconds):",
+            min_value=1,
+            max_value=console.MAX_TIMEOUT_SECONDS,
+            value=console.DEFAULT_TIMEOUT_SECONDS,
+            key="console_timeout"
+        )
+    with limit_cols[1]:
+        max_rows = st.number_input(
+            "Row limit:",
+            min_value=1,
+            max_value=console.MAX_ROWS,
+            value=console.DEFAULT_MAX_ROWS,
+            step=1000,
+            key="console_max_rows"
+        )
+
+    if not st.button("Run Query", key="console_run"):
+        with st.expander("Tables you can query"):
+            st.markdown(
+                "`videos`, `video_text`, `unique_videos`, `categories`, `channel_stats`, "
+                "`tags`, `video_tags`, `build_info` and the `agg_*` summary tables. "
+                "The Database Tables page shows their schemas."
+            )
+        return
+
+    try:
+        query = console.ConsoleQuery(sql, db.get_db_path(), timeout=timeout, max_rows=max_rows)
+
+        with st.expander("Query Plan"):
+            st.dataframe(query.plan(), use_container_width=True, hide_index=True)
+
+        # Report progress per batch and draw the table once at the end;
+        # redrawing everything fetched so far after each batch is quadratic.
+        # (st.dataframe().add_rows() is gone from current Streamlit releases.)
+        status = st.empty()
+        fetched = []
+        # A rerun raises inside this loop; closing the generator right away
+        # gives back its console slot and connection
+        with contextlib.closing(query.batches()) as batches:
+            for batch_df in batches:
+                fetched.append(batch_df)
+                status.caption(f"Fetching... {query.rows:,} rows in {query.elapsed:.2f} s")
+
+        if fetched:
+            st.dataframe(pd.concat(fetched), use_container_width=True, height=500)
+        else:
+            st.info("The query returned no rows.")
+        note = f" (stopped at the {query.max_rows:,} row limit)" if query.truncated else ""
+        status.caption(f"**{query.rows:,} rows{note}** | Elapsed: {query.elapsed:.3f} s")
+    except TimeoutError as e:
+        st.error(f"{e}. Narrow the query with a WHERE clause or aggregate it.")
+    except Exception as e:
+        st.error(f"Error running query: {e}")
+
+
+# Calling the show function to display the page
+show()
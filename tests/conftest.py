@@ -0,0 +1,49 @@
+"""
+Shared fixtures: a small synthetic database built once per test session.
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+import pytest
+from streamlit.logger import set_log_level
+
+# st.cache_data warns when used outside a running Streamlit app; set before
+# db_utils is imported
+set_log_level('error')
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from benchmarks.synthetic_data import generate_dataset
+from database import create_database as cdb
+from database import db_utils as db
+from database.backends import BACKEND_ENV_VAR
+from database.result_cache import CACHE_DIR_ENV_VAR, CACHE_SIZE_ENV_VAR
+
+# Rows in the synthetic dataset; enough for every country, category and class
+TEST_ROWS = 20_000
+
+
+@pytest.fixture(scope='session')
+def database_path(tmp_path_factory):
+    """Build a database from a synthetic dataset and point db_utils at it."""
+    data_dir = tmp_path_factory.mktemp('data')
+    db_dir = tmp_path_factory.mktemp('db')
+    generate_dataset(data_dir, TEST_ROWS, seed=42)
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(cdb, 'CLEANED_DATA_DIR', data_dir)
+        mp.setattr(cdb, 'DB_PATH', db_dir / 'youtube_trends.db')
+        mp.setattr(cdb, 'STAGING_DB_PATH', db_dir / 'youtube_trends.staging.db')
+        with contextlib.redirect_stdout(io.StringIO()):
+            cdb.create_database(workers=1, prewarm=False)
+
+    db_path = db_dir / 'youtube_trends.db'
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(db, 'get_db_path', lambda: str(db_path))
+        mp.setenv(BACKEND_ENV_VAR, 'sqlite')
+        # Run the queries themselves, not the on-disk result cache
+        mp.setenv(CACHE_SIZE_ENV_VAR, '0')
+        mp.setenv(CACHE_DIR_ENV_VAR, str(tmp_path_factory.mktemp('result_cache')))
+        yield db_path
@@ -0,0 +1,50 @@
+"""
+Fail when a db_utils query function reads videos or video_tags with a full
+table scan. Each case of check_query_plans.QUERY_CASES is a test.
+"""
+
+import sqlite3
+
+import pytest
+
+from database import db_utils as db
+from database.check_query_plans import QUERY_CASES, capture_statements, explain, full_scans
+
+
+def case_id(case):
+    func_name, kwargs = case
+    return f"{func_name}({', '.join(f'{k}={v}' for k, v in kwargs.items())})"
+
+
+def find_full_scans(db_path, func_name, kwargs):
+    """Return (sql, plan) of every statement of a case that full-scans a fact table."""
+    statements = capture_statements(func_name, kwargs)
+    assert statements, f"{func_name} ran no statements"
+    conn = sqlite3.connect(db_path.as_uri() + '?mode=ro', uri=True)
+    try:
+        plans = [(sql, explain(conn, sql)) for sql in statements]
+    finally:
+        conn.close()
+    return [(' '.join(sql.split()), plan) for sql, plan in plans if full_scans(sql, plan)]
+
+
+@pytest.mark.parametrize('func_name, kwargs', QUERY_CASES, ids=[case_id(case) for case in QUERY_CASES])
+def test_query_uses_indexes(database_path, func_name, kwargs):
+    assert find_full_scans(database_path, func_name, kwargs) == []
+
+
+def test_missing_index_is_detected(database_path, tmp_path, monkeypatch):
+    """Without idx_videos_country_metrics the correlation matrix scans videos."""
+    copy_path = tmp_path / 'youtube_trends.db'
+    source = sqlite3.connect(database_path)
+    target = sqlite3.connect(copy_path)
+    source.backup(target)
+    source.close()
+    target.execute("DROP INDEX idx_videos_country_metrics")
+    target.commit()
+    target.close()
+    monkeypatch.setattr(db, 'get_db_path', lambda: str(copy_path))
+
+    regressed = find_full_scans(copy_path, 'get_correlation_matrix', {})
+    assert regressed
+    assert any('SCAN videos' in plan for _, plan in regressed)